@@ -4,28 +4,45 @@ Exposes REST API for the Next.js frontend.
 
 Developed for UIDAI Data Hackathon 2026
 """
+import time
+_IMPORT_STARTED = time.perf_counter()  # For STARTUP_PROFILE=1
+
+import hmac
+import math
 import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 from datetime import datetime
 
-from fastapi import FastAPI, Query, HTTPException
+from fastapi import FastAPI, Query, HTTPException, Header, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-import pandas as pd
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ConfigDict
 import os
 
-# src/ is now inside backend/, so we can import directly
-from src.data_loader import (
-    load_enrolment_data,
-    load_biometric_update_data,
-    load_demographic_update_data,
-    load_geojson,
-    filter_by_date_range,
-    filter_by_district
+# src/ is now inside backend/, so we can import directly.
+# pandas/numpy-backed modules are lazy: they load on first use, not at
+# process start (see src/startup_profile.py).
+from src.startup_profile import lazy_import, log_import_profile, log_load_profile
+import src.analytics as analytics
+data_loader = lazy_import("src.data_loader")
+ranking = lazy_import("src.analytics.ranking")
+backtesting = lazy_import("src.analytics.backtesting")
+scenarios = lazy_import("src.analytics.scenarios")
+multivariate = lazy_import("src.analytics.multivariate_anomalies")
+backlog = lazy_import("src.analytics.backlog")
+
+from src.data_store import DataStore, DataSnapshot, DataLoadError
+from src.config import (
+    COLORS, TELANGANA_DISTRICTS,
+    ENROLMENT_DATA, BIOMETRIC_UPDATE_DATA, DEMOGRAPHIC_UPDATE_DATA, GEOJSON_FILE,
+    DATA_WATCH_INTERVAL_SECONDS, FORECAST_INTERVAL_LEVELS, MIGRATION_ROLLING_WINDOWS,
+    ROBUST_Z_THRESHOLD, ROBUST_MIN_OBSERVATIONS, MAHALANOBIS_P_VALUE
 )
-from src.analytics import WorkloadForecaster, MigrationAnalyzer, AnomalyDetector
-from src.config import COLORS, TELANGANA_DISTRICTS
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 # ============================================================================
 # PYDANTIC MODELS (API Response Schemas)
@@ -67,9 +84,51 @@ class AnomalySummary(BaseModel):
 class Anomaly(BaseModel):
     type: str
     district: str
+    pincode: Optional[str] = None
+    severity: str
+    description: str
+    recommendation: Optional[str] = None
+    fingerprint: Optional[str] = None
+    acknowledged: Optional[bool] = None
+
+class StoredAlert(BaseModel):
+    fingerprint: str
+    type: str
+    district: str
+    pincode: Optional[str] = None
     severity: str
+    period: Optional[str] = None
     description: str
     recommendation: Optional[str] = None
+    first_seen: str
+    last_seen: str
+    occurrences: int
+    active: bool
+    acknowledged_at: Optional[str] = None
+    acknowledged_by: Optional[str] = None
+
+class MultivariateAnomaly(BaseModel):
+    district: str
+    pincode: Optional[str] = None
+    month: str
+    distance: float
+    p_value: float
+    top_feature: str
+    features: Dict[str, float]
+
+class StreamAlert(BaseModel):
+    dataset: str
+    district: str
+    month: str
+    value: float
+    expected: float
+    z_score: float
+    direction: str
+
+class StreamAlerts(BaseModel):
+    watermark: Optional[str] = None
+    series: int
+    alerts: List[StreamAlert]
 
 class DistrictMigration(BaseModel):
     district: str
@@ -79,10 +138,43 @@ class DistrictMigration(BaseModel):
     migration_category: str
     migration_intensity: float
 
+class ForecastBand(BaseModel):
+    level: int
+    lower: float
+    upper: float
+
 class ForecastPoint(BaseModel):
     date: str
     total_enrolments: float
     is_forecast: bool
+    bands: Optional[List[ForecastBand]] = None
+
+class DistrictForecast(BaseModel):
+    district: str
+    method: Optional[str] = None
+    points: List[ForecastPoint]
+
+class RollingMigration(BaseModel):
+    district: str
+    window: int
+    months: List[str]
+    migration_ratio: List[float]
+
+class MigrationChangePoint(BaseModel):
+    district: str
+    month: str
+    ratio_before: float
+    ratio_after: float
+    magnitude: float
+    direction: str
+    score: float
+
+class MigrationFlow(BaseModel):
+    origin_district: str
+    origin_pincode: Optional[str] = None
+    destination_district: str
+    destination_pincode: Optional[str] = None
+    flow: float
 
 class WorkloadProjection(BaseModel):
     district: str
@@ -93,11 +185,79 @@ class WorkloadProjection(BaseModel):
     projected_age_15_updates: float
     total_projected_updates: float
 
+class CohortProjection(BaseModel):
+    district: str
+    pincode: Optional[str] = None
+    total_age_5_updates: float
+    total_age_15_updates: float
+    total_updates: float
+    months: List[str]
+    age_5_updates: List[float]
+    age_15_updates: List[float]
+
+class BacklogPoint(BaseModel):
+    month: str
+    projected: float
+    actual: float
+    cumulative_projected: float
+    cumulative_actual: float
+    gap: float
+
+class DistrictBacklog(BaseModel):
+    district: str
+    month: str
+    cumulative_projected: float
+    cumulative_actual: float
+    gap: float
+
 class DistrictHealth(BaseModel):
     district: str
     health_score: float
     status: str
 
+class AnomalyRule(BaseModel):
+    name: str
+    datasets: List[str]
+    severities: Dict[str, str]
+    cost: str
+    default: bool
+    seconds: Optional[float] = None
+    hits: Optional[int] = None
+    skipped: bool = False
+
+class DistrictHealthHistory(BaseModel):
+    district: str
+    months: List[str]
+    health_score: List[float]
+    status: List[str]
+    critical: List[int]
+    warning: List[int]
+    info: List[int]
+
+class DataVersion(BaseModel):
+    version: int
+    loaded_at: Optional[str] = None
+    reloading: bool
+
+class ReloadResponse(BaseModel):
+    status: str
+    current: DataVersion
+
+class ScenarioGrid(BaseModel):
+    """Values to try per parameter; omitted parameters keep their current setting."""
+    model_config = ConfigDict(extra='forbid')
+    
+    migration_threshold_high: Optional[List[float]] = None
+    migration_threshold_medium: Optional[List[float]] = None
+    anomaly_std_threshold: Optional[List[float]] = None
+    age_5_update_fraction: Optional[List[float]] = None
+    age_15_update_fraction: Optional[List[float]] = None
+
+class ScenarioTable(BaseModel):
+    baseline: Dict[str, float]
+    count: int
+    scenarios: List[Dict[str, Union[int, float]]]
+
 class DashboardSummary(BaseModel):
     kpis: KPIResponse
     workload: WorkloadSummary
@@ -137,38 +297,141 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
 # ============================================================================
 # DATA LOADING (Cached at startup)
 # ============================================================================
 
-# Global data cache
-_data_cache = {}
+# Versioned snapshot store. Each request takes the current snapshot once and
+# keeps it, so reloads swap in new data without disturbing in-flight requests.
+# Loads run once at a time, one stage per dataset, with progress on /ready.
+data_store = DataStore(
+    stages=[
+        ('enrolment', lambda: data_loader.load_enrolment_data()),
+        ('biometric', lambda: data_loader.load_biometric_update_data()),
+        ('demographic', lambda: data_loader.load_demographic_update_data()),
+        ('geojson', lambda: data_loader.load_geojson()),
+    ],
+    watch_paths=[ENROLMENT_DATA, BIOMETRIC_UPDATE_DATA, DEMOGRAPHIC_UPDATE_DATA, GEOJSON_FILE]
+)
 
-def get_data():
-    """Load and cache all datasets."""
-    global _data_cache
-    
-    if not _data_cache:
-        print("📊 Loading datasets...")
-        _data_cache = {
-            'enrolment': load_enrolment_data(),
-            'biometric': load_biometric_update_data(),
-            'demographic': load_demographic_update_data(),
-            'geojson': load_geojson()
-        }
-        print("✅ Data loaded successfully!")
+# STARTUP_PROFILE=1 logs import time, eagerly loaded heavy modules and load stages
+STARTUP_PROFILE = os.getenv("STARTUP_PROFILE", "") not in ("", "0")
+
+def _log_first_load_profile(previous: Optional[DataSnapshot], snapshot: DataSnapshot):
+    if previous is None:
+        log_load_profile(data_store.status()['stages'])
+
+if STARTUP_PROFILE:
+    data_store.add_swap_listener(_log_first_load_profile)
+
+def _sync_backlog(previous: Optional[DataSnapshot], snapshot: DataSnapshot):
+    # Months that did not change are kept, only new/changed ones are recomputed
+    try:
+        backlog.tracker.sync(snapshot.version, snapshot['enrolment'], snapshot['biometric'])
+    except Exception as e:
+        print(f"⚠️ Backlog update failed: {e}")
+
+data_store.add_swap_listener(_sync_backlog)
+
+def _sync_migration_flows(previous: Optional[DataSnapshot], snapshot: DataSnapshot):
+    # District level only; the pincode level is synced on first request
+    try:
+        analytics.flow_matrices['district'].sync(
+            snapshot.version, snapshot['enrolment'], snapshot['demographic']
+        )
+    except Exception as e:
+        print(f"⚠️ Migration flow update failed: {e}")
+
+data_store.add_swap_listener(_sync_migration_flows)
+
+def _sync_streaming_anomalies(previous: Optional[DataSnapshot], snapshot: DataSnapshot):
+    # Only months after the persisted watermark are ingested
+    try:
+        analytics.streaming_detector.sync(snapshot.version, {
+            name: snapshot[name] for name in ('enrolment', 'demographic', 'biometric')
+        })
+    except Exception as e:
+        print(f"⚠️ Streaming anomaly update failed: {e}")
+
+data_store.add_swap_listener(_sync_streaming_anomalies)
+
+def _sync_health_history(previous: Optional[DataSnapshot], snapshot: DataSnapshot):
+    # Only new months or months whose rows changed are re-detected
+    try:
+        analytics.health_history.sync(snapshot.version, {
+            name: snapshot[name] for name in ('enrolment', 'demographic', 'biometric')
+        })
+    except Exception as e:
+        print(f"⚠️ Health history update failed: {e}")
+
+data_store.add_swap_listener(_sync_health_history)
+
+def _sync_alert_store(previous: Optional[DataSnapshot], snapshot: DataSnapshot):
+    # All detectors run once per snapshot; known alerts are updated, not re-raised
+    try:
+        analytics.alert_store.sync(snapshot.version, {
+            name: snapshot[name] for name in ('enrolment', 'demographic', 'biometric')
+        })
+    except Exception as e:
+        print(f"⚠️ Alert store update failed: {e}")
+
+data_store.add_swap_listener(_sync_alert_store)
+
+# Admin endpoints require this token (X-Admin-Token header); without it they are disabled
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+def require_admin(x_admin_token: Optional[str]):
+    """
+    Check the X-Admin-Token header of an admin request.
+    Responds 503 if no ADMIN_TOKEN is configured and 403 on a wrong token.
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=503, detail="Admin endpoints are disabled: ADMIN_TOKEN is not set")
+    if not hmac.compare_digest((x_admin_token or "").encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+async def get_data() -> DataSnapshot:
+    """
+    Return the current data snapshot, loading it on first use.
+    Responds 503 if the data failed to load or is still loading.
     
-    return _data_cache
+    Waiting for the initial load happens in the threadpool, so the event
+    loop keeps serving /health and /ready meanwhile.
+    """
+    snapshot = data_store.snapshot
+    if snapshot is not None:
+        return snapshot
+    try:
+        return await run_in_threadpool(data_store.get)
+    except DataLoadError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
 
 @app.on_event("startup")
 async def startup_event():
     """Pre-load data on startup - but do it in background to avoid blocking."""
-    import asyncio
+    if STARTUP_PROFILE:
+        log_import_profile(_IMPORT_SECONDS)
+    
     # Load data in background so Railway health checks don't timeout
-    asyncio.create_task(asyncio.to_thread(get_data))
+    data_store.reload_in_background()
     print("🚀 Starting background data load...")
+    
+    watch_interval = float(os.getenv("DATA_WATCH_INTERVAL", DATA_WATCH_INTERVAL_SECONDS))
+    if watch_interval > 0:
+        data_store.start_watcher(watch_interval)
+        print(f"👀 Watching dataset files every {watch_interval:g}s")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the dataset file watcher and the forecasting process pool."""
+    data_store.stop_watcher()
+    # Only if forecasting was used; avoids importing it just to shut down
+    forecasting = sys.modules.get("src.analytics.workload_forecasting")
+    if forecasting is not None:
+        forecasting.shutdown_process_pool()
 
 # ============================================================================
 # HEALTH CHECK ENDPOINT
@@ -176,20 +439,34 @@ async def startup_event():
 
 @app.get("/health", tags=["Health"])
 async def health_check():
-    """Health check endpoint for monitoring and deployment verification."""
+    """
+    Liveness check for monitoring and deployment verification.
+    Healthy as soon as the process serves requests; use /ready for data.
+    """
     return {
         "status": "healthy",
         "service": "UIDAI Ops-Intel API",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "data": data_store.state
     }
 
+@app.get("/ready", tags=["Health"])
+async def readiness_check():
+    """
+    Readiness probe: 503 until a data snapshot is loaded.
+    Includes per-stage load progress and durations.
+    """
+    status = data_store.status()
+    return JSONResponse(status_code=200 if status['ready'] else 503, content=status)
+
 @app.get("/", tags=["Health"])
 async def root():
     """Root endpoint with API information."""
     return {
         "message": "UIDAI Ops-Intel API",
         "docs": "/api/docs",
-        "health": "/health"
+        "health": "/health",
+        "ready": "/ready"
     }
 
 # ============================================================================
@@ -197,34 +474,88 @@ async def root():
 # ============================================================================
 
 def apply_filters(
-    enrol_df: pd.DataFrame,
-    demo_df: pd.DataFrame,
-    bio_df: pd.DataFrame,
+    enrol_df: "pd.DataFrame",
+    demo_df: "pd.DataFrame",
+    bio_df: "pd.DataFrame",
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     districts: Optional[List[str]] = None
 ):
     """Apply date and district filters to dataframes."""
+    import pandas as pd
     
     if start_date:
         start_dt = pd.Timestamp(start_date)
-        enrol_df = filter_by_date_range(enrol_df, start_dt, enrol_df['date'].max())
-        demo_df = filter_by_date_range(demo_df, start_dt, demo_df['date'].max())
-        bio_df = filter_by_date_range(bio_df, start_dt, bio_df['date'].max())
+        enrol_df = data_loader.filter_by_date_range(enrol_df, start_dt, enrol_df['date'].max())
+        demo_df = data_loader.filter_by_date_range(demo_df, start_dt, demo_df['date'].max())
+        bio_df = data_loader.filter_by_date_range(bio_df, start_dt, bio_df['date'].max())
     
     if end_date:
         end_dt = pd.Timestamp(end_date)
-        enrol_df = filter_by_date_range(enrol_df, enrol_df['date'].min(), end_dt)
-        demo_df = filter_by_date_range(demo_df, demo_df['date'].min(), end_dt)
-        bio_df = filter_by_date_range(bio_df, bio_df['date'].min(), end_dt)
+        enrol_df = data_loader.filter_by_date_range(enrol_df, enrol_df['date'].min(), end_dt)
+        demo_df = data_loader.filter_by_date_range(demo_df, demo_df['date'].min(), end_dt)
+        bio_df = data_loader.filter_by_date_range(bio_df, bio_df['date'].min(), end_dt)
     
     if districts:
-        enrol_df = filter_by_district(enrol_df, districts)
-        demo_df = filter_by_district(demo_df, districts)
-        bio_df = filter_by_district(bio_df, districts)
+        enrol_df = data_loader.filter_by_district(enrol_df, districts)
+        demo_df = data_loader.filter_by_district(demo_df, districts)
+        bio_df = data_loader.filter_by_district(bio_df, districts)
     
     return enrol_df, demo_df, bio_df
 
+
+def rank_page(
+    response: Response,
+    values,
+    limit: int,
+    cursor: Optional[str],
+    order: str,
+    version: int
+):
+    """
+    Select one page of rows ranked by ``values`` (partial selection, no full sort).
+    Sets X-Total-Count and, if there are more rows, X-Next-Cursor.
+    """
+    try:
+        offset = ranking.decode_cursor(cursor, version)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    positions, next_offset = ranking.page_indices(values, limit, offset, largest=(order == 'desc'))
+    
+    response.headers["X-Total-Count"] = str(len(values))
+    if next_offset is not None:
+        response.headers["X-Next-Cursor"] = ranking.encode_cursor(next_offset, version)
+    
+    return positions
+
+
+def alert_page(
+    response: Response,
+    limit: Optional[int],
+    cursor: Optional[str],
+    version: int,
+    **filters
+) -> "pd.DataFrame":
+    """
+    One page of stored alerts (AlertStore.query order), cut in SQL.
+    Sets X-Total-Count and, if there are more alerts, X-Next-Cursor.
+    """
+    try:
+        offset = ranking.decode_cursor(cursor, version)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    store = analytics.alert_store
+    alerts = store.query(limit=limit, offset=offset, **filters)
+    total = store.count(**filters)
+    
+    response.headers["X-Total-Count"] = str(total)
+    if offset + len(alerts) < total:
+        response.headers["X-Next-Cursor"] = ranking.encode_cursor(offset + len(alerts), version)
+    
+    return alerts
+
 # ============================================================================
 # API ROUTES
 # ============================================================================
@@ -232,7 +563,83 @@ def apply_filters(
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "service": "UIDAI Ops-Intel API"}
+    return {"status": "healthy", "service": "UIDAI Ops-Intel API", "data": data_store.state}
+
+
+def migration_analyzer(
+    data: DataSnapshot,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    districts: Optional[str],
+    filtered: Optional[tuple] = None
+):
+    """
+    MigrationAnalyzer for a filter, shared per snapshot so its cached
+    intensity table serves the summary, choropleth, rankings and trends.
+    
+    Args:
+        filtered: (enrolment, demographic) frames already filtered by the caller
+    """
+    def build_analyzer():
+        if filtered is not None:
+            enrol_df, demo_df = filtered
+        else:
+            district_list = districts.split(",") if districts else None
+            enrol_df, demo_df, bio_df = apply_filters(
+                data['enrolment'].copy(),
+                data['demographic'].copy(),
+                data['biometric'].copy(),
+                start_date, end_date, district_list
+            )
+        return analytics.MigrationAnalyzer(enrol_df, demo_df)
+    
+    return data.memo(('migration_analyzer', start_date, end_date, districts), build_analyzer)
+
+
+def district_monthly_matrix(
+    data: DataSnapshot,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    districts: Optional[str]
+) -> "pd.DataFrame":
+    """District x month enrolment matrix for a filter, computed once per snapshot."""
+    def build_matrix():
+        district_list = districts.split(",") if districts else None
+        enrol_df, demo_df, bio_df = apply_filters(
+            data['enrolment'].copy(),
+            data['demographic'].copy(),
+            data['biometric'].copy(),
+            start_date, end_date, district_list
+        )
+        return analytics.WorkloadForecaster(enrol_df, bio_df).calculate_district_monthly_matrix()
+    
+    return data.memo(('district_monthly', start_date, end_date, districts), build_matrix)
+
+
+def parse_interval_levels(intervals: Optional[str]) -> tuple:
+    """Parse "80,95" into coverage levels; default FORECAST_INTERVAL_LEVELS, "none" for none."""
+    if intervals is None:
+        return tuple(FORECAST_INTERVAL_LEVELS)
+    if intervals.strip().lower() in ("", "none"):
+        return ()
+    try:
+        levels = sorted({int(level) for level in intervals.split(",")})
+    except ValueError:
+        raise HTTPException(status_code=400, detail="intervals must be comma-separated integers")
+    if any(not 0 < level < 100 for level in levels):
+        raise HTTPException(status_code=400, detail="interval levels must be between 1 and 99")
+    return tuple(levels)
+
+
+def forecast_bands(row, levels: tuple) -> Optional[List[ForecastBand]]:
+    """Prediction bands of one forecast row (None if it has none)."""
+    bands = []
+    for level in levels:
+        lower = row.get(f'lower_{level}')
+        if lower is None or math.isnan(lower):
+            continue
+        bands.append(ForecastBand(level=level, lower=float(lower), upper=float(row[f'upper_{level}'])))
+    return bands or None
 
 
 @app.get("/api/v1/summary", response_model=DashboardSummary)
@@ -245,7 +652,7 @@ async def get_dashboard_summary(
     Get complete dashboard summary including KPIs, workload, migration, and anomalies.
     This is the main endpoint for the dashboard.
     """
-    data = get_data()
+    data = await get_data()
     
     # Parse districts
     district_list = districts.split(",") if districts else None
@@ -261,13 +668,13 @@ async def get_dashboard_summary(
     )
     
     # Initialize analyzers
-    forecaster = WorkloadForecaster(enrol_df, bio_df)
-    migration_analyzer = MigrationAnalyzer(enrol_df, demo_df)
-    detector = AnomalyDetector(enrol_df, bio_df, demo_df)
+    forecaster = analytics.WorkloadForecaster(enrol_df, bio_df)
+    migration = migration_analyzer(data, start_date, end_date, districts, (enrol_df, demo_df))
+    detector = analytics.AnomalyDetector(enrol_df, bio_df, demo_df)
     
     # Get summaries
     workload_summary = forecaster.get_workload_summary()
-    migration_summary = migration_analyzer.get_migration_summary()
+    migration_summary = migration.get_migration_summary()
     anomaly_summary = detector.get_anomaly_summary()
     health_scores = detector.get_district_health_score()
     
@@ -303,26 +710,41 @@ async def get_migration_choropleth(
     districts: Optional[str] = Query(None)
 ):
     """Get migration intensity data for choropleth map."""
-    data = get_data()
+    data = await get_data()
     
-    district_list = districts.split(",") if districts else None
-    enrol_df, demo_df, bio_df = apply_filters(
-        data['enrolment'].copy(),
-        data['demographic'].copy(),
-        data['biometric'].copy(),
-        start_date, end_date, district_list
-    )
-    
-    analyzer = MigrationAnalyzer(enrol_df, demo_df)
+    analyzer = migration_analyzer(data, start_date, end_date, districts)
     choropleth_data = analyzer.prepare_choropleth_data()
     
     return choropleth_data.to_dict(orient='records')
 
 
+@app.get("/api/v1/migration/rankings", response_model=List[DistrictMigration])
+async def get_migration_rankings(
+    response: Response,
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    districts: Optional[str] = Query(None),
+    limit: int = Query(10, ge=1, le=100, description="Number of districts to return"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="desc = highest migration first"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page")
+):
+    """Get districts ranked by migration ratio (top-k or bottom-k, paginated)."""
+    data = await get_data()
+    
+    analyzer = migration_analyzer(data, start_date, end_date, districts)
+    intensity = analyzer.calculate_migration_intensity(sort=False)
+    positions = rank_page(
+        response, intensity['migration_ratio'].to_numpy(),
+        limit, cursor, order, data.version
+    )
+    
+    return intensity.iloc[positions].to_dict(orient='records')
+
+
 @app.get("/api/v1/geojson")
 async def get_geojson():
     """Get Telangana districts GeoJSON for map rendering."""
-    data = get_data()
+    data = await get_data()
     return data['geojson']
 
 
@@ -331,10 +753,12 @@ async def get_workload_forecast(
     periods: int = Query(3, ge=1, le=12, description="Number of months to forecast"),
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
-    districts: Optional[str] = Query(None)
+    districts: Optional[str] = Query(None),
+    intervals: Optional[str] = Query(None, description="Prediction interval levels, e.g. 80,95 (none to disable)")
 ):
-    """Get historical data and forecast for workload trends."""
-    data = get_data()
+    """Get historical data and forecast (with prediction bands) for workload trends."""
+    data = await get_data()
+    levels = parse_interval_levels(intervals)
     
     district_list = districts.split(",") if districts else None
     enrol_df, demo_df, bio_df = apply_filters(
@@ -344,8 +768,8 @@ async def get_workload_forecast(
         start_date, end_date, district_list
     )
     
-    forecaster = WorkloadForecaster(enrol_df, bio_df)
-    historical, forecast = forecaster.forecast_workload(periods=periods)
+    forecaster = analytics.WorkloadForecaster(enrol_df, bio_df)
+    historical, forecast = forecaster.forecast_workload(periods=periods, interval_levels=levels)
     
     # Combine historical and forecast
     result = []
@@ -361,47 +785,318 @@ async def get_workload_forecast(
         result.append(ForecastPoint(
             date=row['date'].strftime('%Y-%m-%d'),
             total_enrolments=float(row['total_enrolments']),
-            is_forecast=True
+            is_forecast=True,
+            bands=forecast_bands(row, levels)
         ))
     
     return result
 
 
+@app.get("/api/v1/workload/forecast/districts", response_model=List[DistrictForecast])
+async def get_district_workload_forecasts(
+    periods: int = Query(3, ge=1, le=12, description="Number of months to forecast"),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    districts: Optional[str] = Query(None),
+    intervals: Optional[str] = Query(None, description="Prediction interval levels, e.g. 80,95 (none to disable)")
+):
+    """Get historical data and forecasts (with prediction bands) for every district in the filter."""
+    data = await get_data()
+    levels = parse_interval_levels(intervals)
+    
+    matrix = district_monthly_matrix(data, start_date, end_date, districts)
+    forecasts = analytics.forecast_district_matrix(matrix, periods=periods, interval_levels=levels)
+    
+    result = []
+    for district, rows in forecasts.groupby('district', sort=True):
+        methods = rows['method'].dropna()
+        result.append(DistrictForecast(
+            district=district,
+            method=methods.iloc[0] if len(methods) else None,
+            points=[
+                ForecastPoint(
+                    date=row['date'].strftime('%Y-%m-%d'),
+                    total_enrolments=float(row['total_enrolments']),
+                    is_forecast=bool(row['is_forecast']),
+                    bands=forecast_bands(row, levels)
+                )
+                for row in rows.to_dict(orient='records')
+            ]
+        ))
+    
+    return result
+
+
+@app.get("/api/v1/workload/backlog/trend", response_model=List[BacklogPoint])
+async def get_backlog_trend(
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    districts: Optional[str] = Query(None)
+):
+    """
+    Monthly projected vs actual mandatory updates and the running backlog
+    (cumulative projected - cumulative actual) for the selected districts.
+    """
+    data = await get_data()
+    backlog.tracker.sync(data.version, data['enrolment'], data['biometric'])
+    
+    district_list = districts.split(",") if districts else None
+    trend = backlog.tracker.trend(district_list, start_date, end_date)
+    
+    return [
+        BacklogPoint(
+            month=row['month'].strftime('%Y-%m'),
+            projected=round(row['projected'], 1),
+            actual=row['actual'],
+            cumulative_projected=round(row['cumulative_projected'], 1),
+            cumulative_actual=row['cumulative_actual'],
+            gap=round(row['gap'], 1)
+        )
+        for row in trend.to_dict(orient='records')
+    ]
+
+
+@app.get("/api/v1/workload/backlog/districts", response_model=List[DistrictBacklog])
+async def get_backlog_districts(
+    response: Response,
+    end_date: Optional[str] = Query(None, description="Backlog as of this month (default: latest)"),
+    districts: Optional[str] = Query(None),
+    limit: int = Query(10, ge=1, le=100, description="Number of districts to return"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="desc = largest backlog first"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page")
+):
+    """Get districts ranked by running mandatory update backlog."""
+    data = await get_data()
+    backlog.tracker.sync(data.version, data['enrolment'], data['biometric'])
+    
+    district_list = districts.split(",") if districts else None
+    latest = backlog.tracker.latest_gap(district_list, end_date)
+    positions = rank_page(response, latest['gap'].to_numpy(), limit, cursor, order, data.version)
+    
+    return [
+        DistrictBacklog(
+            district=row['district'],
+            month=row['month'].strftime('%Y-%m'),
+            cumulative_projected=round(row['cumulative_projected'], 1),
+            cumulative_actual=row['cumulative_actual'],
+            gap=round(row['gap'], 1)
+        )
+        for row in latest.iloc[positions].to_dict(orient='records')
+    ]
+
+
+@app.get("/api/v1/workload/backtest")
+async def get_workload_backtest(
+    horizon: int = Query(3, ge=1, le=12, description="Months forecast from each cutoff"),
+    min_train: int = Query(4, ge=4, le=36, description="Months in the first training window"),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    districts: Optional[str] = Query(None),
+    include_series: bool = Query(False, description="Include per-district metrics")
+):
+    """
+    Rolling-origin backtest of Holt vs the moving-average fallback,
+    state-wide and per district (MAPE / MASE).
+    """
+    data = await get_data()
+    
+    def build_report():
+        matrix = district_monthly_matrix(data, start_date, end_date, districts)
+        Y, labels = backtesting.backtest_series(matrix)
+        return backtesting.run_backtest(
+            Y, labels, horizon=horizon, min_train=min_train, data_version=data.version
+        )
+    
+    report = data.memo(
+        ('workload_backtest', horizon, min_train, start_date, end_date, districts),
+        build_report
+    )
+    if include_series:
+        return report
+    return {key: value for key, value in report.items() if key != 'per_series'}
+
+
 @app.get("/api/v1/workload/projections", response_model=List[WorkloadProjection])
 async def get_workload_projections(
+    response: Response,
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
     districts: Optional[str] = Query(None),
-    limit: int = Query(15, ge=1, le=50, description="Number of districts to return")
+    limit: int = Query(15, ge=1, le=50, description="Number of districts to return"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="desc = highest load first"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page")
 ):
     """Get mandatory update projections by district."""
-    data = get_data()
+    data = await get_data()
     
-    district_list = districts.split(",") if districts else None
-    enrol_df, demo_df, bio_df = apply_filters(
-        data['enrolment'].copy(),
-        data['demographic'].copy(),
-        data['biometric'].copy(),
-        start_date, end_date, district_list
+    def build_projections():
+        district_list = districts.split(",") if districts else None
+        enrol_df, demo_df, bio_df = apply_filters(
+            data['enrolment'].copy(),
+            data['demographic'].copy(),
+            data['biometric'].copy(),
+            start_date, end_date, district_list
+        )
+        forecaster = analytics.WorkloadForecaster(enrol_df, bio_df)
+        return forecaster.calculate_mandatory_update_projection(sort=False)
+    
+    # Unsorted table cached per snapshot and filter; pages are selected from it
+    projections = data.memo(
+        ('workload_projections', start_date, end_date, districts), build_projections
+    )
+    positions = rank_page(
+        response, projections['total_projected_updates'].to_numpy(),
+        limit, cursor, order, data.version
     )
     
-    forecaster = WorkloadForecaster(enrol_df, bio_df)
-    projections = forecaster.calculate_mandatory_update_projection()
+    return projections.iloc[positions].to_dict(orient='records')
+
+
+@app.get("/api/v1/workload/cohort-projection", response_model=List[CohortProjection])
+async def get_cohort_projection(
+    response: Response,
+    level: str = Query("district", pattern="^(district|pincode)$"),
+    horizon_months: int = Query(36, ge=1, le=180, description="Months to project"),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    districts: Optional[str] = Query(None),
+    limit: int = Query(15, ge=1, le=500, description="Number of districts/pincodes to return"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="desc = highest load first"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page")
+):
+    """
+    Get month-by-month mandatory update projections (age 5 and 15) from
+    enrolment cohorts, ranked by total projected updates over the horizon.
+    """
+    data = await get_data()
+    
+    def build_projection():
+        district_list = districts.split(",") if districts else None
+        enrol_df, demo_df, bio_df = apply_filters(
+            data['enrolment'].copy(),
+            data['demographic'].copy(),
+            data['biometric'].copy(),
+            start_date, end_date, district_list
+        )
+        return analytics.CohortProjector(enrol_df).project(level, horizon_months)
+    
+    units, timeline, projected, first_future = data.memo(
+        ('cohort_projection', level, horizon_months, start_date, end_date, districts),
+        build_projection
+    )
+    age_5 = projected['age_5_updates'][:, first_future:]
+    age_15 = projected['age_15_updates'][:, first_future:]
+    totals_5, totals_15 = age_5.sum(axis=1), age_15.sum(axis=1)
+    positions = rank_page(response, totals_5 + totals_15, limit, cursor, order, data.version)
     
-    return projections.head(limit).to_dict(orient='records')
+    months = [month.strftime('%Y-%m') for month in timeline[first_future:]]
+    return [
+        CohortProjection(
+            district=units['district'].iloc[i],
+            pincode=str(units['pincode'].iloc[i]) if level == 'pincode' else None,
+            total_age_5_updates=round(float(totals_5[i]), 1),
+            total_age_15_updates=round(float(totals_15[i]), 1),
+            total_updates=round(float(totals_5[i] + totals_15[i]), 1),
+            months=months,
+            age_5_updates=age_5[i].round(1).tolist(),
+            age_15_updates=age_15[i].round(1).tolist()
+        )
+        for i in positions
+    ]
+
+
+@app.post("/api/v1/scenarios", response_model=ScenarioTable)
+async def run_scenarios(
+    grid: ScenarioGrid,
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    districts: Optional[str] = Query(None)
+):
+    """
+    What-if analysis: evaluate migration classification, anomaly counts,
+    health scores and projected workload for every combination of the
+    given parameter values.
+    """
+    data = await get_data()
+    
+    def build_aggregates():
+        district_list = districts.split(",") if districts else None
+        enrol_df, demo_df, bio_df = apply_filters(
+            data['enrolment'].copy(),
+            data['demographic'].copy(),
+            data['biometric'].copy(),
+            start_date, end_date, district_list
+        )
+        return scenarios.ScenarioAggregates(enrol_df, demo_df, bio_df)
+    
+    aggregates = data.memo(('scenario_aggregates', start_date, end_date, districts), build_aggregates)
+    try:
+        table = scenarios.evaluate_scenarios(aggregates, grid.model_dump(exclude_none=True))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return ScenarioTable(
+        baseline=scenarios.SCENARIO_PARAMETERS,
+        count=len(table),
+        scenarios=table
+    )
 
 
 @app.get("/api/v1/anomalies", response_model=List[Anomaly])
 async def get_anomalies(
+    response: Response,
     severity: Optional[str] = Query(None, description="Filter by severity: Critical, Warning, Info"),
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
-    districts: Optional[str] = Query(None)
+    districts: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size (default: all)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    rules: Optional[str] = Query(None, description="Comma-separated detectors to run (default: the default detectors)"),
+    skip_rules: Optional[str] = Query(None, description="Comma-separated detectors to leave out"),
+    include_acknowledged: bool = Query(True, description="false = hide acknowledged alerts")
 ):
-    """Get detected anomalies."""
-    data = get_data()
+    """
+    Get detected anomalies (most severe first).
+    
+    Without a date range the anomalies of the current data are read from the
+    alert store (districts select stored alerts). With a date range detection
+    runs on the filtered data and the Server-Timing header reports the time
+    of every detector that ran.
+    """
+    data = await get_data()
+    
+    import numpy as np
     
     district_list = districts.split(",") if districts else None
+    rule_list = rules.split(",") if rules else None
+    skip_list = skip_rules.split(",") if skip_rules else None
+    
+    if not start_date and not end_date:
+        started = time.perf_counter()
+        store = analytics.alert_store
+        store.sync(data.version, {
+            name: data[name] for name in ('enrolment', 'demographic', 'biometric')
+        })
+        try:
+            detectors = analytics.select_detectors(rule_list, skip_list)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        filters = dict(
+            detectors=detectors, severity=severity, districts=district_list,
+            acknowledged=None if include_acknowledged else False
+        )
+        if limit is not None:
+            alerts = alert_page(response, limit, cursor, data.version, **filters)
+        else:
+            alerts = store.query(**filters)
+        response.headers["Server-Timing"] = f"alert_store;dur={(time.perf_counter() - started) * 1000:.1f}"
+        
+        return [
+            Anomaly(**alert['record'], fingerprint=alert['fingerprint'],
+                    acknowledged=alert['acknowledged_at'] is not None)
+            for alert in alerts.to_dict(orient='records')
+        ]
+    
     enrol_df, demo_df, bio_df = apply_filters(
         data['enrolment'].copy(),
         data['demographic'].copy(),
@@ -409,36 +1104,375 @@ async def get_anomalies(
         start_date, end_date, district_list
     )
     
-    detector = AnomalyDetector(enrol_df, bio_df, demo_df)
-    anomalies = detector.detect_all_anomalies()
+    detector = analytics.AnomalyDetector(enrol_df, bio_df, demo_df)
+    try:
+        table = detector.detect_table(rules=rule_list, skip_rules=skip_list)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    response.headers["Server-Timing"] = ", ".join(
+        f"{name};dur={stats['seconds'] * 1000:.1f}"
+        for name, stats in detector.rule_stats.items() if not stats['skipped']
+    )
     
+    # Filter and page on the columnar table; only returned rows are formatted
+    positions = np.arange(len(table))
     if severity:
-        anomalies = [a for a in anomalies if a['severity'] == severity]
+        positions = np.flatnonzero(table.severity_mask(severity))
+    
+    if limit is not None:
+        page = rank_page(response, table.severity[positions], limit, cursor, 'asc', data.version)
+        positions = positions[page]
+    
+    return [Anomaly(**a) for a in table.records(positions)]
+
+
+@app.get("/api/v1/alerts", response_model=List[StoredAlert])
+async def get_alerts(
+    response: Response,
+    status: str = Query("active", pattern="^(active|resolved|all)$",
+                        description="active = found in the current data, resolved = no longer found"),
+    severity: Optional[str] = Query(None, description="Critical, Warning or Info"),
+    districts: Optional[str] = Query(None, description="Comma-separated district names"),
+    types: Optional[str] = Query(None, description="Comma-separated anomaly types"),
+    start_date: Optional[str] = Query(None, description="First anomaly date (YYYY-MM or YYYY-MM-DD); undated alerts are excluded"),
+    end_date: Optional[str] = Query(None, description="Last anomaly date (YYYY-MM or YYYY-MM-DD)"),
+    acknowledged: Optional[bool] = Query(None, description="Filter on acknowledgement"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page")
+):
+    """
+    Get stored alerts of all detectors, including resolved ones, with their
+    first/last sighting and acknowledgement (most severe first).
+    """
+    data = await get_data()
+    
+    store = analytics.alert_store
+    store.sync(data.version, {
+        name: data[name] for name in ('enrolment', 'demographic', 'biometric')
+    })
+    try:
+        alerts = alert_page(
+            response, limit, cursor, data.version,
+            severity=severity,
+            districts=districts.split(",") if districts else None,
+            types=types.split(",") if types else None,
+            start_period=start_date,
+            end_period=end_date,
+            acknowledged=acknowledged,
+            active={'active': True, 'resolved': False, 'all': None}[status],
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be YYYY-MM or YYYY-MM-DD")
+    
+    return [_stored_alert(alert) for alert in alerts.to_dict(orient='records')]
+
+
+@app.post("/api/v1/alerts/{fingerprint}/acknowledge", response_model=StoredAlert, tags=["Admin"])
+async def acknowledge_alert(
+    fingerprint: str,
+    by: Optional[str] = Query(None, description="Who acknowledged the alert"),
+    x_admin_token: Optional[str] = Header(None)
+):
+    """Acknowledge a stored alert; an acknowledged alert keeps its first acknowledgement."""
+    require_admin(x_admin_token)
+    
+    store = analytics.alert_store
+    store.acknowledge([fingerprint], by)
+    alerts = store.query(fingerprints=[fingerprint], active=None)
+    if alerts.empty:
+        raise HTTPException(status_code=404, detail="Unknown alert")
+    return _stored_alert(alerts.iloc[0].to_dict())
+
+
+def _stored_alert(alert: Dict) -> StoredAlert:
+    record = alert['record']
+    return StoredAlert(
+        fingerprint=alert['fingerprint'],
+        type=record['type'],
+        district=record['district'],
+        pincode=record.get('pincode'),
+        severity=record['severity'],
+        period=alert['period'] or None,
+        description=record['description'],
+        recommendation=record.get('recommendation'),
+        first_seen=alert['first_seen'],
+        last_seen=alert['last_seen'],
+        occurrences=alert['occurrences'],
+        active=bool(alert['active']),
+        acknowledged_at=alert['acknowledged_at'],
+        acknowledged_by=alert['acknowledged_by'],
+    )
+
+
+@app.get("/api/v1/anomalies/rules", response_model=List[AnomalyRule])
+async def get_anomaly_rules():
+    """
+    Get the registered anomaly detectors with the datasets they read, their
+    severities and cost class, plus time and hit count of a run of all
+    detectors over the full data (once per data version).
+    """
+    data = await get_data()
+    
+    def run_all():
+        detector = analytics.AnomalyDetector(data['enrolment'], data['biometric'], data['demographic'])
+        detector.detect_table(rules=list(analytics.ANOMALY_DETECTORS))
+        return detector.rule_stats
+    
+    rule_stats = data.memo(('anomaly_rule_stats',), run_all)
+    return [
+        AnomalyRule(**spec.describe(), **rule_stats.get(name, {}))
+        for name, spec in analytics.ANOMALY_DETECTORS.items()
+    ]
+
+
+@app.get("/api/v1/anomalies/temporal", response_model=List[Anomaly])
+async def get_local_temporal_anomalies(
+    response: Response,
+    level: str = Query("district", description="district or pincode"),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    districts: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page")
+):
+    """
+    Get sharp enrolment drops in individual district or pincode series
+    (sharpest first). Detection runs once per data version over the full
+    history; the filters only select anomalies.
+    """
+    data = await get_data()
+    
+    if level not in ("district", "pincode"):
+        raise HTTPException(status_code=400, detail="level must be district or pincode")
+    
+    import numpy as np
+    import pandas as pd
+    
+    table = data.memo(
+        ('local_temporal_anomalies', level),
+        lambda: analytics.AnomalyDetector(data['enrolment']).detect_local_temporal_anomalies(level)
+    )
+    
+    keep = np.ones(len(table), dtype=bool)
+    if districts:
+        keep &= np.isin(table.district, districts.split(","))
+    if start_date:
+        keep &= table.date >= np.datetime64(pd.Timestamp(start_date))
+    if end_date:
+        keep &= table.date <= np.datetime64(pd.Timestamp(end_date))
+    positions = np.flatnonzero(keep)
+    
+    page = rank_page(response, table.z_score[positions], limit, cursor, 'asc', data.version)
+    return [Anomaly(**a) for a in table.records(positions[page])]
+
+
+@app.get("/api/v1/anomalies/pincode-outliers", response_model=List[Anomaly])
+async def get_pincode_outliers(
+    response: Response,
+    threshold: float = Query(ROBUST_Z_THRESHOLD, gt=0, description="Minimum |robust z-score|"),
+    min_observations: int = Query(ROBUST_MIN_OBSERVATIONS, ge=1, description="Min pincode-months per district"),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    districts: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page")
+):
+    """
+    Get pincode-month enrolment volumes that are outliers within their
+    district (median/MAD), strongest first. Scores are computed once per
+    data version; thresholds and filters are applied per request.
+    """
+    data = await get_data()
+    
+    import numpy as np
+    import pandas as pd
+    
+    scores = data.memo(
+        ('pincode_outlier_scores',),
+        lambda: analytics.AnomalyDetector(data['enrolment']).pincode_outlier_scores()
+    )
+    
+    # District sizes count all of a district's pincode-months, so the
+    # filters apply to the flagged rows
+    detector = analytics.AnomalyDetector(data['enrolment'])
+    table = detector.detect_pincode_outliers(threshold, min_observations, scores)
+    
+    keep = np.ones(len(table), dtype=bool)
+    if districts:
+        keep &= np.isin(table.district, districts.split(","))
+    if start_date:
+        keep &= table.date >= np.datetime64(pd.Timestamp(start_date).to_period('M').to_timestamp())
+    if end_date:
+        keep &= table.date <= np.datetime64(pd.Timestamp(end_date))
+    positions = np.flatnonzero(keep)
+    
+    page = rank_page(response, np.abs(table.z_score[positions]), limit, cursor, 'desc', data.version)
+    return [Anomaly(**a) for a in table.records(positions[page])]
+
+
+@app.get("/api/v1/anomalies/multivariate", response_model=List[MultivariateAnomaly])
+async def get_multivariate_anomalies(
+    response: Response,
+    level: str = Query("district", description="district or pincode"),
+    p_value: float = Query(MAHALANOBIS_P_VALUE, gt=0, le=1, description="Flag rows below this p-value"),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    districts: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page")
+):
+    """
+    Get unit-months whose combined features (volume, age mix, update
+    volumes, migration ratio) are far from the robust centre, most
+    unusual first. The model is fitted once per data version.
+    """
+    data = await get_data()
+    
+    if level not in ("district", "pincode"):
+        raise HTTPException(status_code=400, detail="level must be district or pincode")
+    
+    import numpy as np
+    import pandas as pd
+    
+    scored, _ = data.memo(
+        ('multivariate_scores', level),
+        lambda: multivariate.score_units(
+            data['enrolment'], data['demographic'], data['biometric'], level
+        )
+    )
+    
+    keep = (scored['p_value'] < p_value).to_numpy()
+    if districts:
+        keep &= scored['district'].isin(districts.split(",")).to_numpy()
+    if start_date:
+        keep &= (scored['month'] >= pd.Timestamp(start_date).to_period('M').to_timestamp()).to_numpy()
+    if end_date:
+        keep &= (scored['month'] <= pd.Timestamp(end_date)).to_numpy()
+    positions = np.flatnonzero(keep)
+    
+    page = rank_page(response, scored['distance'].to_numpy()[positions], limit, cursor, 'desc', data.version)
+    rows = scored.iloc[positions[page]]
+    return [
+        MultivariateAnomaly(
+            district=row['district'],
+            pincode=row.get('pincode'),
+            month=row['month'].strftime('%Y-%m'),
+            distance=round(row['distance'], 3),
+            p_value=row['p_value'],
+            top_feature=row['top_feature'],
+            features={name: round(row[name], 4) for name in multivariate.FEATURES}
+        )
+        for row in rows.to_dict(orient='records')
+    ]
+
+
+@app.get("/api/v1/anomalies/stream", response_model=StreamAlerts)
+async def get_streaming_anomalies(
+    month: Optional[str] = Query(None, description="YYYY-MM (default: latest ingested month)"),
+    datasets: Optional[str] = Query(None, description="Comma-separated: enrolment, demographic, biometric"),
+    districts: Optional[str] = Query(None)
+):
+    """
+    Get the alerts of the online EWMA detector for one month.
+    Reads the detector state; no history is re-scanned.
+    """
+    data = await get_data()
+    
+    detector = analytics.streaming_detector
+    detector.sync(data.version, {
+        name: data[name] for name in ('enrolment', 'demographic', 'biometric')
+    })
     
-    return [Anomaly(**a) for a in anomalies]
+    try:
+        alerts = detector.current_alerts(
+            month,
+            datasets.split(",") if datasets else None,
+            districts.split(",") if districts else None
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="month must be YYYY-MM")
+    
+    watermark = detector.watermark_period
+    return StreamAlerts(
+        watermark=str(watermark) if watermark is not None else None,
+        series=len(detector.series),
+        alerts=[
+            StreamAlert(**{**row, 'month': str(row['month']), 'z_score': round(row['z_score'], 2)})
+            for row in alerts.to_dict(orient='records')
+        ]
+    )
 
 
 @app.get("/api/v1/districts/health", response_model=List[DistrictHealth])
 async def get_district_health(
+    response: Response,
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
-    districts: Optional[str] = Query(None)
+    districts: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size (default: all)"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="desc = healthiest first"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page")
 ):
     """Get data quality health scores for each district."""
-    data = get_data()
+    data = await get_data()
     
-    district_list = districts.split(",") if districts else None
-    enrol_df, demo_df, bio_df = apply_filters(
-        data['enrolment'].copy(),
-        data['demographic'].copy(),
-        data['biometric'].copy(),
-        start_date, end_date, district_list
+    def build_health_scores():
+        district_list = districts.split(",") if districts else None
+        enrol_df, demo_df, bio_df = apply_filters(
+            data['enrolment'].copy(),
+            data['demographic'].copy(),
+            data['biometric'].copy(),
+            start_date, end_date, district_list
+        )
+        detector = analytics.AnomalyDetector(enrol_df, bio_df, demo_df)
+        return detector.get_district_health_score()
+    
+    health_scores = data.memo(
+        ('district_health', start_date, end_date, districts), build_health_scores
     )
     
-    detector = AnomalyDetector(enrol_df, bio_df, demo_df)
-    health_scores = detector.get_district_health_score()
+    if limit is None:
+        if order == 'asc':
+            return health_scores.iloc[::-1].to_dict(orient='records')
+        return health_scores.to_dict(orient='records')
+    
+    positions = rank_page(
+        response, health_scores['health_score'].to_numpy(),
+        limit, cursor, order, data.version
+    )
+    return health_scores.iloc[positions].to_dict(orient='records')
+
+
+@app.get("/api/v1/districts/health/history", response_model=List[DistrictHealthHistory])
+async def get_district_health_history(
+    start_date: Optional[str] = Query(None, description="First month (YYYY-MM or YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Last month (YYYY-MM or YYYY-MM-DD)"),
+    districts: Optional[str] = Query(None, description="Comma-separated district names")
+):
+    """
+    Get monthly data quality health scores per district. Each month is
+    scored from its own anomalies; months without enrolments are omitted.
+    """
+    data = await get_data()
     
-    return health_scores.to_dict(orient='records')
+    analytics.health_history.sync(data.version, {
+        name: data[name] for name in ('enrolment', 'demographic', 'biometric')
+    })
+    district_list = districts.split(",") if districts else None
+    history = analytics.health_history.history(district_list, start_date, end_date)
+    
+    return [
+        DistrictHealthHistory(
+            district=district,
+            months=group['month'].dt.strftime('%Y-%m').tolist(),
+            health_score=group['health_score'].tolist(),
+            status=group['status'].tolist(),
+            critical=group['critical'].tolist(),
+            warning=group['warning'].tolist(),
+            info=group['info'].tolist(),
+        )
+        for district, group in history.groupby('district', sort=False)
+    ]
 
 
 @app.get("/api/v1/migration/trends")
@@ -448,17 +1482,9 @@ async def get_migration_trends(
     districts: Optional[str] = Query(None)
 ):
     """Get monthly migration trend data."""
-    data = get_data()
+    data = await get_data()
     
-    district_list = districts.split(",") if districts else None
-    enrol_df, demo_df, bio_df = apply_filters(
-        data['enrolment'].copy(),
-        data['demographic'].copy(),
-        data['biometric'].copy(),
-        start_date, end_date, district_list
-    )
-    
-    analyzer = MigrationAnalyzer(enrol_df, demo_df)
+    analyzer = migration_analyzer(data, start_date, end_date, districts)
     trends = analyzer.get_migration_trends()
     
     # Convert to JSON-serializable format
@@ -474,6 +1500,149 @@ async def get_migration_trends(
     return result
 
 
+@app.get("/api/v1/migration/rolling", response_model=List[RollingMigration])
+async def get_rolling_migration(
+    windows: Optional[str] = Query(None, description="Trailing windows in months, e.g. 3,6,12"),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    districts: Optional[str] = Query(None)
+):
+    """
+    Get per-district migration ratio series over trailing windows.
+    Windows always look back over the full history; the date filter only
+    selects which months are returned.
+    """
+    data = await get_data()
+    
+    try:
+        window_list = (
+            sorted({int(w) for w in windows.split(",")}) if windows
+            else list(MIGRATION_ROLLING_WINDOWS)
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="windows must be comma-separated integers")
+    if any(not 1 <= w <= 120 for w in window_list):
+        raise HTTPException(status_code=400, detail="windows must be between 1 and 120 months")
+    
+    import numpy as np
+    import pandas as pd
+    
+    # Unfiltered analyzer: its cumulative arrays serve every window and filter
+    analyzer = migration_analyzer(data, None, None, None)
+    district_list = districts.split(",") if districts else None
+    
+    result = []
+    for window in window_list:
+        names, months, ratio = analyzer.rolling_migration_ratio(window, district_list)
+        keep = np.ones(len(months), dtype=bool)
+        if start_date:
+            keep &= months.end_time >= pd.Timestamp(start_date)
+        if end_date:
+            keep &= months.start_time <= pd.Timestamp(end_date)
+        labels = [month.strftime('%Y-%m') for month in months[keep]]
+        ratio = ratio[:, keep].round(4)
+        result.extend(
+            RollingMigration(district=name, window=window, months=labels, migration_ratio=row.tolist())
+            for name, row in zip(names, ratio)
+        )
+    
+    return result
+
+
+@app.get("/api/v1/migration/change-points", response_model=List[MigrationChangePoint])
+async def get_migration_change_points(
+    districts: Optional[str] = Query(None),
+    direction: Optional[str] = Query(None, description="increase or decrease"),
+    start_date: Optional[str] = Query(None, description="Changes starting on or after this month"),
+    end_date: Optional[str] = Query(None, description="Changes starting on or before this month"),
+    min_magnitude: float = Query(0.0, ge=0, description="Minimum absolute ratio shift"),
+    limit: int = Query(100, ge=1, le=5000)
+):
+    """
+    Get shifts in district migration ratios, largest first.
+    Detection runs once per data version on all districts' full history;
+    the filters only select events.
+    """
+    data = await get_data()
+    
+    if direction not in (None, "increase", "decrease"):
+        raise HTTPException(status_code=400, detail="direction must be increase or decrease")
+    
+    import pandas as pd
+    
+    changes = data.memo(
+        ('migration_change_points',),
+        lambda: migration_analyzer(data, None, None, None).detect_change_points()
+    )
+    
+    keep = changes['magnitude'].abs() >= min_magnitude
+    if districts:
+        keep &= changes['district'].isin(districts.split(","))
+    if direction:
+        keep &= changes['direction'] == direction
+    if start_date:
+        keep &= changes['month'] >= pd.Timestamp(start_date).to_period('M').to_timestamp()
+    if end_date:
+        keep &= changes['month'] <= pd.Timestamp(end_date)
+    selected = changes[keep].head(limit)
+    
+    return [
+        MigrationChangePoint(**{**row, 'month': row['month'].strftime('%Y-%m')})
+        for row in selected.to_dict(orient='records')
+    ]
+
+
+@app.get("/api/v1/migration/flows", response_model=List[MigrationFlow])
+async def get_migration_flows(
+    level: str = Query("district", description="district or pincode"),
+    district: Optional[str] = Query(None, description="Flows of this unit only"),
+    pincode: Optional[str] = Query(None, description="Pincode of the unit (pincode level)"),
+    direction: str = Query("in", description="in (origins) or out (destinations)"),
+    limit: int = Query(20, ge=1, le=1000),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None)
+):
+    """
+    Get estimated origin -> destination migration flows.
+    Without a district the largest flows overall are returned, otherwise
+    the top origins (direction=in) or destinations (direction=out) of the unit.
+    """
+    data = await get_data()
+    
+    if level not in ("district", "pincode"):
+        raise HTTPException(status_code=400, detail="level must be district or pincode")
+    if direction not in ("in", "out"):
+        raise HTTPException(status_code=400, detail="direction must be in or out")
+    if level == "pincode" and district and not pincode:
+        raise HTTPException(status_code=400, detail="pincode is required at pincode level")
+    
+    flows = analytics.flow_matrices[level]
+    flows.sync(data.version, data['enrolment'], data['demographic'])
+    matrix = flows.matrix(start_date, end_date) if start_date or end_date else None
+    
+    if district:
+        position = flows.unit_position(district, pincode)
+        if position < 0:
+            raise HTTPException(status_code=404, detail="Unknown district or pincode")
+        others, values = flows.neighbours(position, direction, limit, matrix)
+        origins = others if direction == "in" else [position] * len(others)
+        destinations = [position] * len(others) if direction == "in" else others
+    else:
+        origins, destinations, values = flows.top_flows(limit, matrix)
+    
+    units = flows.units.to_dict(orient='records')
+    return [
+        MigrationFlow(
+            origin_district=units[origin]['district'],
+            origin_pincode=units[origin].get('pincode'),
+            destination_district=units[destination]['district'],
+            destination_pincode=units[destination].get('pincode'),
+            flow=round(float(value), 1)
+        )
+        for origin, destination, value in zip(origins, destinations, values)
+    ]
+
+
 @app.get("/api/v1/enrolments/by-district")
 async def get_enrolments_by_district(
     start_date: Optional[str] = Query(None),
@@ -481,7 +1650,7 @@ async def get_enrolments_by_district(
     districts: Optional[str] = Query(None)
 ):
     """Get enrolment totals aggregated by district."""
-    data = get_data()
+    data = await get_data()
     
     district_list = districts.split(",") if districts else None
     enrol_df, _, _ = apply_filters(
@@ -508,7 +1677,7 @@ async def get_age_distribution(
     districts: Optional[str] = Query(None)
 ):
     """Get age group distribution."""
-    data = get_data()
+    data = await get_data()
     
     district_list = districts.split(",") if districts else None
     enrol_df, _, _ = apply_filters(
@@ -536,6 +1705,42 @@ async def get_age_distribution(
     }
 
 
+def _data_version() -> DataVersion:
+    snapshot = data_store.snapshot
+    return DataVersion(
+        version=data_store.version,
+        loaded_at=snapshot.loaded_at.isoformat() if snapshot else None,
+        reloading=data_store.is_reloading
+    )
+
+
+@app.get("/api/v1/admin/load-status", tags=["Admin"])
+async def get_load_status():
+    """Get data lifecycle state, per-stage progress and the last load error."""
+    return data_store.status()
+
+
+@app.get("/api/v1/admin/data-version", response_model=DataVersion, tags=["Admin"])
+async def get_data_version():
+    """Get the version of the data snapshot currently being served."""
+    return _data_version()
+
+
+@app.post("/api/v1/admin/reload", response_model=ReloadResponse, status_code=202, tags=["Admin"])
+async def reload_data(x_admin_token: Optional[str] = Header(None)):
+    """
+    Rebuild the data snapshot in the background and swap it in when ready.
+    Requests already running keep the snapshot they started with.
+    """
+    require_admin(x_admin_token)
+    
+    started = data_store.reload_in_background()
+    return ReloadResponse(
+        status="reloading" if started else "already_reloading",
+        current=_data_version()
+    )
+
+
 @app.get("/api/v1/config")
 async def get_config():
     """Get dashboard configuration (colors, districts list)."""
@@ -552,6 +1757,8 @@ async def get_config():
     }
 
 
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+
 # ============================================================================
 # RUN SERVER
 # ============================================================================
@@ -1,4 +1,27 @@
 # Analytics modules for UIDAI Ops-Intel Dashboard
-from src.analytics.workload_forecasting import WorkloadForecaster
-from src.analytics.migration_analysis import MigrationAnalyzer
-from src.analytics.anomaly_detection import AnomalyDetector
+# Classes and functions are imported on first access so importing the package stays cheap
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    'WorkloadForecaster': 'src.analytics.workload_forecasting',
+    'forecast_district_matrix': 'src.analytics.workload_forecasting',
+    'CohortProjector': 'src.analytics.cohort_projection',
+    'MigrationAnalyzer': 'src.analytics.migration_analysis',
+    'flow_matrices': 'src.analytics.migration_flows',
+    'AnomalyDetector': 'src.analytics.anomaly_detection',
+    'ANOMALY_DETECTORS': 'src.analytics.anomaly_detection',
+    'select_detectors': 'src.analytics.anomaly_detection',
+    'alert_store': 'src.analytics.alert_store',
+    'health_history': 'src.analytics.health_history',
+    'streaming_detector': 'src.analytics.streaming_anomalies',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
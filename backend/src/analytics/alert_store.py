@@ -0,0 +1,327 @@
+"""
+Persistent Alert Store
+Anomalies of every data snapshot in an embedded SQLite database.
+
+Logic:
+- After a data swap all registered detectors run once over the full data
+  and their anomalies are upserted. An alert's fingerprint is a hash of
+  its rule, district, pincode and period (the anomaly's date, empty for
+  rules without one), so the same anomaly found again updates its row
+  (value, description, last_seen) instead of raising a new alert
+- Every run records a content hash of the data and the detector set. A
+  snapshot whose hash matches the newest run is not detected or ingested
+  again, so other workers and restarts on the same data add no runs and
+  ``occurrences`` counts the data versions an alert was found in
+- Alerts not found again are kept as history but marked inactive; an
+  alert that reappears is active again and keeps its acknowledgement
+- Rows are indexed by district, type, severity and period, so queries
+  and range scans are index lookups instead of a detection run; pages
+  are cut in SQL (LIMIT/OFFSET), so a page costs its rows, not the store
+- The database lives at ALERT_STORE_PATH (WAL mode, one connection per
+  call), so it survives restarts and is shared by all workers
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import ALERT_STORE_PATH
+from src.analytics.anomaly_detection import (
+    ANOMALY_DETECTORS, AnomalyDetector, AnomalyTable, SEVERITY_ORDER
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    fingerprint TEXT PRIMARY KEY,
+    detector TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    type TEXT NOT NULL,
+    district TEXT NOT NULL,
+    pincode TEXT,
+    severity INTEGER NOT NULL,
+    period TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    record TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    occurrences INTEGER NOT NULL DEFAULT 1,
+    run INTEGER NOT NULL,
+    active INTEGER NOT NULL DEFAULT 1,
+    acknowledged_at TEXT,
+    acknowledged_by TEXT
+);
+CREATE INDEX IF NOT EXISTS alerts_district ON alerts (district, severity);
+CREATE INDEX IF NOT EXISTS alerts_type ON alerts (type, severity);
+CREATE INDEX IF NOT EXISTS alerts_severity ON alerts (active, severity, position);
+CREATE INDEX IF NOT EXISTS alerts_period ON alerts (period);
+CREATE TABLE IF NOT EXISTS runs (
+    run INTEGER PRIMARY KEY AUTOINCREMENT,
+    finished_at TEXT NOT NULL,
+    alerts INTEGER NOT NULL,
+    new_alerts INTEGER NOT NULL,
+    data_hash TEXT
+);
+"""
+
+ALERT_COLUMNS = [
+    'fingerprint', 'detector', 'rule', 'type', 'district', 'pincode', 'severity',
+    'period', 'record', 'first_seen', 'last_seen', 'occurrences', 'active',
+    'acknowledged_at', 'acknowledged_by',
+]
+
+
+def _day(date: str, end: bool = False) -> str:
+    """ISO day of a YYYY-MM or YYYY-MM-DD bound (last day of a month for an end)."""
+    if end and len(date) == 7:
+        return pd.Period(date, freq='M').end_time.date().isoformat()
+    return pd.Timestamp(date).date().isoformat()
+
+
+def data_hash(frames: Dict[str, pd.DataFrame]) -> str:
+    """Content hash of the datasets (row hashes) and the registered detectors."""
+    digest = hashlib.sha1('\x1f'.join(ANOMALY_DETECTORS).encode('utf-8'))
+    for name in sorted(frames):
+        digest.update(name.encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(frames[name], index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def alert_fingerprint(rule: str, district: str, pincode: Optional[str], period: str) -> str:
+    """Stable identity of an alert across runs, processes and restarts."""
+    key = '\x1f'.join([rule, district, pincode or '', period])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+class AlertStore:
+    """SQLite-backed alert history with deduplication and acknowledgement."""
+
+    def __init__(self, path: Path = ALERT_STORE_PATH):
+        self.path = Path(path)
+        self.version: Optional[int] = None
+        self.last_new_alerts = 0
+        self._initialized = False
+        self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            with self._lock:
+                if not self._initialized:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    with closing(sqlite3.connect(self.path, timeout=30)) as connection:
+                        connection.execute("PRAGMA journal_mode=WAL")
+                        connection.executescript(_SCHEMA)
+                        # Stores created before runs recorded their data hash
+                        columns = [row[1] for row in connection.execute("PRAGMA table_info(runs)")]
+                        if 'data_hash' not in columns:
+                            connection.execute("ALTER TABLE runs ADD COLUMN data_hash TEXT")
+                    self._initialized = True
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def sync(self, version: int, frames: Dict[str, pd.DataFrame]):
+        """
+        Run all detectors on a data snapshot unless it (or a newer one) was
+        synced by this process, or the newest stored run has the same data.
+        """
+        with self._lock:
+            if self.version is not None and version <= self.version:
+                return
+            content = data_hash(frames)
+            if self.latest_data_hash() != content:
+                detector = AnomalyDetector(frames['enrolment'], frames['biometric'], frames['demographic'])
+                tables = {
+                    name: detector.detect_table(rules=[name]) for name in ANOMALY_DETECTORS
+                }
+                self.ingest(tables, content)
+            else:
+                self.last_new_alerts = 0
+            self.version = version
+
+    def latest_data_hash(self) -> Optional[str]:
+        """Data hash of the newest run, None before the first run."""
+        with closing(self._connect()) as connection:
+            row = connection.execute("SELECT data_hash FROM runs ORDER BY run DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def ingest(self, tables: Dict[str, AnomalyTable], content: Optional[str] = None) -> int:
+        """
+        Upsert one run's anomalies and deactivate alerts not found again.
+
+        Args:
+            tables: Detector name -> its AnomalyTable, in registry order
+            content: data_hash() of the detected data; the run is skipped
+                     if the newest run already has it (e.g. another worker
+                     ingested the same snapshot meanwhile)
+
+        Returns:
+            Number of alerts seen for the first time
+        """
+        now = datetime.now().isoformat(timespec='seconds')
+        rows = []
+        position = 0
+        for name, table in tables.items():
+            for i, record in enumerate(table.records()):
+                date = table.date[i]
+                period = '' if np.isnat(date) else str(np.datetime_as_string(date, unit='D'))
+                rule = str(table.rule[i])
+                pincode = record.get('pincode')
+                rows.append((
+                    alert_fingerprint(rule, record['district'], pincode, period),
+                    name, rule, record['type'], record['district'], pincode,
+                    SEVERITY_ORDER[record['severity']], period, position,
+                    json.dumps(record, default=float), now, now,
+                ))
+                position += 1
+
+        with self._lock, closing(self._connect()) as connection, connection:
+            # Write lock first, so concurrent workers ingest a snapshot once
+            connection.execute("BEGIN IMMEDIATE")
+            latest = connection.execute("SELECT data_hash FROM runs ORDER BY run DESC LIMIT 1").fetchone()
+            if content is not None and latest is not None and latest[0] == content:
+                self.last_new_alerts = 0
+                return 0
+            run = connection.execute(
+                "INSERT INTO runs (finished_at, alerts, new_alerts, data_hash) VALUES (?, ?, 0, ?)",
+                (now, len(rows), content)
+            ).lastrowid
+            before = connection.execute("SELECT COUNT(*) FROM alerts").fetchone()[0]
+            connection.executemany(
+                """
+                INSERT INTO alerts (
+                    fingerprint, detector, rule, type, district, pincode, severity,
+                    period, position, record, first_seen, last_seen, run
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (fingerprint) DO UPDATE SET
+                    severity = excluded.severity,
+                    position = excluded.position,
+                    record = excluded.record,
+                    last_seen = excluded.last_seen,
+                    occurrences = occurrences + 1,
+                    run = excluded.run,
+                    active = 1
+                """,
+                [row + (run,) for row in rows]
+            )
+            new_alerts = connection.execute("SELECT COUNT(*) FROM alerts").fetchone()[0] - before
+            connection.execute("UPDATE alerts SET active = 0 WHERE run < ? AND active = 1", (run,))
+            connection.execute("UPDATE runs SET new_alerts = ? WHERE run = ?", (new_alerts, run))
+        self.last_new_alerts = new_alerts
+        return new_alerts
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _where(
+        detectors: Optional[Sequence[str]] = None,
+        severity: Optional[str] = None,
+        districts: Optional[Sequence[str]] = None,
+        types: Optional[Sequence[str]] = None,
+        start_period: Optional[str] = None,
+        end_period: Optional[str] = None,
+        acknowledged: Optional[bool] = None,
+        active: Optional[bool] = True,
+        fingerprints: Optional[Sequence[str]] = None
+    ) -> Tuple[str, List]:
+        """WHERE clause and parameters of a query() / count() filter."""
+        clauses, params = [], []
+
+        def any_of(column: str, values: Optional[Sequence[str]]):
+            if values:
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+
+        any_of('fingerprint', fingerprints)
+        any_of('detector', detectors)
+        any_of('district', districts)
+        any_of('type', types)
+        if severity is not None:
+            clauses.append("severity = ?")
+            params.append(SEVERITY_ORDER.get(severity, -1))
+        if start_period:
+            clauses.append("period >= ?")
+            params.append(_day(start_period))
+        if end_period:
+            clauses.append("period BETWEEN '0' AND ?")
+            params.append(_day(end_period, end=True))
+        if acknowledged is not None:
+            clauses.append(f"acknowledged_at IS {'NOT ' if acknowledged else ''}NULL")
+        if active is not None:
+            clauses.append("active = ?")
+            params.append(int(active))
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def query(self, limit: Optional[int] = None, offset: int = 0, **filters) -> pd.DataFrame:
+        """
+        Stored alerts, most severe first (detection order within a severity).
+
+        Rows are ordered and paged in SQL (the alerts_severity index serves
+        active alerts in this order); only the returned records are parsed.
+
+        Args:
+            limit: Page size (default: all matching alerts)
+            offset: Alerts to skip
+            detectors: Detector names (default: all)
+            severity: Critical, Warning or Info
+            districts, types: Match any of these
+            start_period, end_period: Inclusive date range (YYYY-MM or
+                                      YYYY-MM-DD); excludes undated alerts
+            acknowledged: True/False to filter on acknowledgement
+            active: True for alerts found by the latest run, False for
+                    resolved ones, None for both
+            fingerprints: Match any of these
+
+        Returns:
+            DataFrame with ALERT_COLUMNS (record parsed into a dict)
+        """
+        where, params = self._where(**filters)
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                f"SELECT {', '.join(ALERT_COLUMNS)} FROM alerts {where} "
+                "ORDER BY severity, position, rowid LIMIT ? OFFSET ?",
+                params + [-1 if limit is None else limit, offset]
+            ).fetchall()
+        alerts = pd.DataFrame([tuple(row) for row in rows], columns=ALERT_COLUMNS)
+        alerts['record'] = [json.loads(record) for record in alerts['record']]
+        return alerts
+
+    def count(self, **filters) -> int:
+        """Number of stored alerts matching a query() filter."""
+        where, params = self._where(**filters)
+        with closing(self._connect()) as connection:
+            return connection.execute(f"SELECT COUNT(*) FROM alerts {where}", params).fetchone()[0]
+
+    def acknowledge(self, fingerprints: List[str], by: Optional[str] = None) -> int:
+        """
+        Acknowledge alerts (already acknowledged ones keep their time).
+
+        Returns:
+            Number of alerts newly acknowledged
+        """
+        now = datetime.now().isoformat(timespec='seconds')
+        with closing(self._connect()) as connection, connection:
+            cursor = connection.executemany(
+                """
+                UPDATE alerts SET acknowledged_at = ?, acknowledged_by = ?
+                WHERE fingerprint = ? AND acknowledged_at IS NULL
+                """,
+                [(now, by, fingerprint) for fingerprint in fingerprints]
+            )
+            return cursor.rowcount
+
+
+# Shared by all requests; synced to the newest data snapshot
+alert_store = AlertStore()
@@ -9,18 +9,611 @@ Since gender data is not available, we focus on:
 4. Temporal anomalies (unusual date patterns)
 
 For demo purposes, we also synthesize a gender distribution
-that can be flagged for anomalies.
+that can be flagged for anomalies (real FEMALE_COLUMN / MALE_COLUMN
+enrolment columns are used when the data has them).
+
+Each detector evaluates its rules as masks over aggregated arrays and
+returns an AnomalyTable (one array per column). Descriptions are only
+formatted for the rows a caller actually returns, so counting, severity
+filtering and paging never build strings.
+
+The update scan (UPDATE_DATASETS) covers the biometric and demographic
+datasets too: all three are summed into one shared pincode x month fact
+array (build_fact_array), which is scanned once for update spikes,
+drops and implausible update-to-enrolment ratios.
+
+Detectors are registered in ANOMALY_DETECTORS with the datasets they
+read, the rules (and so severities) they emit and a cost class. Light
+detectors run inline, heavy ones concurrently in a shared thread pool;
+each run records per-detector time and hit counts.
 """
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
+from functools import lru_cache
 
 from src.config import (
     GENDER_RATIO_LOWER, GENDER_RATIO_UPPER,
-    ANOMALY_STD_THRESHOLD
+    ANOMALY_STD_THRESHOLD, ROBUST_Z_THRESHOLD, ROBUST_MIN_OBSERVATIONS,
+    ANOMALY_RULE_WORKERS, UPDATE_SCAN_MIN_MONTHS, UPDATE_SCAN_MIN_VOLUME
 )
 
+SEVERITY_ORDER = {'Critical': 0, 'Warning': 1, 'Info': 2}
+SEVERITIES = list(SEVERITY_ORDER)
+
+# Expected age distribution (approximate) and allowed deviation, in %
+EXPECTED_AGE_0_5_PCT = 20
+EXPECTED_AGE_5_17_PCT = 30
+EXPECTED_AGE_18_PLUS_PCT = 50
+AGE_DEVIATION_THRESHOLD = 15
+ADULT_PCT_LIMIT = 70
+
+_GENDER_RANGE = f"Expected: {GENDER_RATIO_LOWER*100}-{GENDER_RATIO_UPPER*100}%"
+
+# Rule -> type, severity and text templates. Templates are formatted with
+# the row's value, reference, z_score and date columns.
+RULES = {
+    'volume_spike': {
+        'type': 'Volume Spike',
+        'severity': 'Warning',
+        'description': "Unusually high enrolments ({value:,.0f})",
+        'columns': ('z_score',),
+        'recommendation': 'Verify data accuracy or investigate surge cause',
+    },
+    'volume_drop': {
+        'type': 'Volume Drop',
+        'severity': 'Warning',
+        'description': "Unusually low enrolments ({value:,.0f})",
+        'columns': ('z_score',),
+        'recommendation': 'Check for data collection issues',
+    },
+    'age_children': {
+        'type': 'Age Distribution',
+        'severity': 'Info',
+        'description': "Unusual children (0-5) ratio: {value:.1f}%",
+        'details': {'expected': f"{EXPECTED_AGE_0_5_PCT}%"},
+        'recommendation': 'Verify birth registration data',
+    },
+    'age_adult': {
+        'type': 'Age Distribution',
+        'severity': 'Warning',
+        'description': "High adult ratio: {value:.1f}%",
+        'details': {'expected': f"~{EXPECTED_AGE_18_PLUS_PCT}%"},
+        'recommendation': 'Check for late enrolment campaigns',
+    },
+    'gender_low': {
+        'type': 'Gender Anomaly',
+        'severity': 'Critical',
+        'description': "Low female enrolment: {value:.1f}%",
+        'details': {'threshold': _GENDER_RANGE},
+        'recommendation': 'Investigate potential exclusion or data entry fraud',
+    },
+    'gender_high': {
+        'type': 'Gender Anomaly',
+        'severity': 'Warning',
+        'description': "High female enrolment: {value:.1f}%",
+        'details': {'threshold': _GENDER_RANGE},
+        'recommendation': 'Verify data entry accuracy',
+    },
+    'temporal_drop': {
+        'type': 'Temporal Anomaly',
+        'severity': 'Warning',
+        'description': "Sharp drop on {date:%Y-%m-%d}",
+        'details': {'value': "{value:,.0f} vs avg {reference:,.0f}"},
+        'recommendation': 'Check for system outages or holidays',
+    },
+    'local_temporal_drop': {
+        'type': 'Temporal Anomaly',
+        'severity': 'Warning',
+        'description': "Sharp drop on {date:%Y-%m-%d}",
+        'columns': ('z_score',),
+        'details': {'value': "{value:,.0f} vs avg {reference:,.0f}"},
+        'recommendation': 'Check for local outages or centre closures',
+    },
+    'pincode_volume_spike': {
+        'type': 'Volume Spike',
+        'severity': 'Warning',
+        'description': "Unusually high enrolments in {date:%b %Y} ({value:,.0f} vs district median {reference:,.0f})",
+        'columns': ('z_score',),
+        'recommendation': 'Verify data accuracy or investigate surge cause',
+    },
+    'pincode_volume_drop': {
+        'type': 'Volume Drop',
+        'severity': 'Warning',
+        'description': "Unusually low enrolments in {date:%b %Y} ({value:,.0f} vs district median {reference:,.0f})",
+        'columns': ('z_score',),
+        'recommendation': 'Check for data collection issues',
+    },
+    'biometric_update_spike': {
+        'type': 'Update Spike',
+        'severity': 'Warning',
+        'description': "Unusually high biometric updates in {date:%b %Y} ({value:,.0f} vs usual {reference:,.0f})",
+        'columns': ('z_score',),
+        'recommendation': 'Audit update operators for possible fraud',
+    },
+    'biometric_update_drop': {
+        'type': 'Update Drop',
+        'severity': 'Warning',
+        'description': "Unusually low biometric updates in {date:%b %Y} ({value:,.0f} vs usual {reference:,.0f})",
+        'columns': ('z_score',),
+        'recommendation': 'Check for device or centre outages',
+    },
+    'demographic_update_spike': {
+        'type': 'Update Spike',
+        'severity': 'Warning',
+        'description': "Unusually high demographic updates in {date:%b %Y} ({value:,.0f} vs usual {reference:,.0f})",
+        'columns': ('z_score',),
+        'recommendation': 'Audit update operators for possible fraud',
+    },
+    'demographic_update_drop': {
+        'type': 'Update Drop',
+        'severity': 'Warning',
+        'description': "Unusually low demographic updates in {date:%b %Y} ({value:,.0f} vs usual {reference:,.0f})",
+        'columns': ('z_score',),
+        'recommendation': 'Check for device or centre outages',
+    },
+    'update_ratio_high': {
+        'type': 'Update Ratio',
+        'severity': 'Critical',
+        'description': "Implausible update-to-enrolment ratio in {date:%b %Y} ({value:,.1f} vs district median {reference:,.1f})",
+        'columns': ('z_score',),
+        'recommendation': 'Investigate potential update fraud',
+    },
+}
+
+# Rolling window (reporting dates) of the temporal rules
+TEMPORAL_WINDOW = 7
+TEMPORAL_MIN_PERIODS = 3
+
+RULE_TYPES = {rule: spec['type'] for rule, spec in RULES.items()}
+RULE_SEVERITY_CODES = {rule: SEVERITY_ORDER[spec['severity']] for rule, spec in RULES.items()}
+
+
+# Fact array datasets -> total column; the update scan scores all but enrolment
+FACT_COLUMNS = {
+    'enrolment': 'total_enrolments',
+    'biometric': 'total_bio_updates',
+    'demographic': 'total_demo_updates',
+}
+UPDATE_DATASETS = ('biometric', 'demographic')
+
+
+def build_fact_array(frames: Dict[str, pd.DataFrame]) -> Tuple[pd.MultiIndex, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Monthly totals of several datasets on one pincode x month grid.
+    
+    The unit keys of all frames are factorized together once, then each
+    dataset is one bincount into its layer of the array.
+    
+    Args:
+        frames: Dataset name -> DataFrame (see FACT_COLUMNS), in layer order
+    
+    Returns:
+        Tuple of (units: (district, pincode) MultiIndex, months: (T,)
+        year * 12 + month numbers, facts: (datasets, U, T) totals,
+        rows: (datasets, U, T) row counts)
+    """
+    names = list(frames)
+    sizes = [len(frames[name]) for name in names]
+    district = np.concatenate([frames[name]['district'].to_numpy(dtype=object) for name in names])
+    pincode = np.concatenate([frames[name]['pincode'].astype(str).to_numpy(dtype=object) for name in names])
+    dates = pd.concat([frames[name]['date'] for name in names], ignore_index=True)
+    codes, units = pd.MultiIndex.from_arrays([district, pincode]).factorize()
+    units = units.set_names(['district', 'pincode'])
+    
+    numbers = (dates.dt.year * 12 + dates.dt.month).to_numpy()
+    first = int(numbers.min()) if len(numbers) else 0
+    T = int(numbers.max()) - first + 1 if len(numbers) else 0
+    flat = codes * T + (numbers - first)
+    
+    U = len(units)
+    facts = np.zeros((len(names), U, T))
+    rows = np.zeros((len(names), U, T), dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+    for layer, name in enumerate(names):
+        part = flat[offsets[layer]:offsets[layer + 1]]
+        facts[layer] = np.bincount(
+            part, weights=frames[name][FACT_COLUMNS[name]].fillna(0).to_numpy(dtype=np.float64),
+            minlength=U * T
+        ).reshape(U, T)
+        rows[layer] = np.bincount(part, minlength=U * T).reshape(U, T)
+    return units, np.arange(first, first + T), facts, rows
+
+
+def _robust_scale(mad: np.ndarray, mean_deviation: np.ndarray) -> np.ndarray:
+    """MAD as a standard deviation, mean absolute deviation where the MAD is 0."""
+    return np.where(mad > 0, mad / 0.6745, mean_deviation * 1.2533)
+
+
+# Health score penalty per anomaly, by severity code (Critical, Warning, Info)
+HEALTH_PENALTIES = np.array([30, 15, 5])
+
+
+def health_scores(counts: np.ndarray) -> np.ndarray:
+    """
+    Data quality health scores (0-100, 100 = no anomalies).
+    
+    Args:
+        counts: (..., len(SEVERITIES)) anomaly counts by severity code
+    """
+    return np.maximum(0, 100 - counts @ HEALTH_PENALTIES)
+
+
+def health_status(scores: np.ndarray) -> np.ndarray:
+    """Good (>= 80), Warning (>= 50) or Critical for each score."""
+    return np.where(scores >= 80, 'Good', np.where(scores >= 50, 'Warning', 'Critical'))
+
+
+# Enrolment columns with real gender counts; synthetic shares are used without them
+FEMALE_COLUMN = 'female_enrolments'
+MALE_COLUMN = 'male_enrolments'
+
+# Seed mixed into every district's synthetic gender share
+GENDER_SYNTHETIC_SEED = 42
+
+
+@lru_cache(maxsize=None)
+def synthetic_female_share(district: str) -> float:
+    """
+    Synthetic female share of a district (demo data).
+    
+    Drawn from a generator seeded with a stable hash of the name, so it is
+    the same in every process and does not depend on the other districts
+    of a request. About 5% of districts are low and 5% high.
+    """
+    digest = hashlib.blake2b(district.encode('utf-8'), digest_size=8).digest()
+    rng = np.random.default_rng([GENDER_SYNTHETIC_SEED, int.from_bytes(digest, 'little')])
+    bucket = rng.integers(100)
+    if bucket < 5:
+        return float(rng.uniform(0.42, 0.46))
+    if bucket > 95:
+        return float(rng.uniform(0.54, 0.56))
+    return float(np.clip(rng.normal(0.485, 0.02), 0.44, 0.52))
+
+
+# Cost classes: light detectors run inline, heavy ones in the thread pool
+COST_CLASSES = ('light', 'heavy')
+
+
+class DetectorSpec:
+    """Registry entry of one anomaly detector."""
+
+    def __init__(
+        self,
+        name: str,
+        function: Callable,
+        datasets: Tuple[str, ...],
+        rules: Tuple[str, ...],
+        cost: str,
+        default: bool
+    ):
+        self.name = name
+        self.function = function
+        self.datasets = datasets
+        self.rules = rules
+        self.cost = cost
+        self.default = default
+
+    @property
+    def severities(self) -> Dict[str, str]:
+        """Rule -> severity of every rule the detector emits."""
+        return {rule: RULES[rule]['severity'] for rule in self.rules}
+
+    def describe(self) -> Dict:
+        return {
+            'name': self.name,
+            'datasets': list(self.datasets),
+            'severities': self.severities,
+            'cost': self.cost,
+            'default': self.default,
+        }
+
+
+# Detector name -> spec, in registration (= result) order
+ANOMALY_DETECTORS: Dict[str, DetectorSpec] = {}
+
+
+def register_detector(
+    name: str,
+    datasets: Sequence[str],
+    rules: Sequence[str],
+    cost: str = 'light',
+    default: bool = True
+):
+    """
+    Register a detector: a function (detector) -> AnomalyTable.
+
+    Args:
+        name: Registry name, used to enable/disable it per request
+        datasets: Snapshot datasets it reads ('enrolment', 'biometric',
+                  'demographic'); it is skipped when one is missing
+        rules: RULES keys it can emit
+        cost: 'light' (run inline) or 'heavy' (run in the thread pool)
+        default: Whether it runs when no rule selection is given
+    """
+    unknown = set(rules) - set(RULES)
+    if unknown or cost not in COST_CLASSES:
+        raise ValueError(f"Invalid detector {name}: rules {sorted(unknown)}, cost {cost}")
+
+    def decorator(function: Callable) -> Callable:
+        ANOMALY_DETECTORS[name] = DetectorSpec(
+            name, function, tuple(datasets), tuple(rules), cost, default
+        )
+        return function
+    return decorator
+
+
+def select_detectors(
+    rules: Optional[Iterable[str]] = None,
+    skip_rules: Optional[Iterable[str]] = None
+) -> Tuple[str, ...]:
+    """
+    Detector names to run, in registry order.
+
+    Args:
+        rules: Detectors to run (default: all default detectors)
+        skip_rules: Detectors to leave out
+
+    Raises:
+        ValueError: on unknown detector names
+    """
+    requested = set(rules or ()) | set(skip_rules or ())
+    unknown = requested - set(ANOMALY_DETECTORS)
+    if unknown:
+        raise ValueError(f"Unknown anomaly rules: {', '.join(sorted(unknown))}")
+    enabled = set(rules) if rules else {
+        name for name, spec in ANOMALY_DETECTORS.items() if spec.default
+    }
+    enabled -= set(skip_rules or ())
+    return tuple(name for name in ANOMALY_DETECTORS if name in enabled)
+
+
+_rule_pool: Optional[ThreadPoolExecutor] = None
+_rule_pool_lock = threading.Lock()
+
+
+def _get_rule_pool() -> ThreadPoolExecutor:
+    """Shared thread pool for heavy detectors (created on first use)."""
+    global _rule_pool
+    with _rule_pool_lock:
+        if _rule_pool is None:
+            _rule_pool = ThreadPoolExecutor(
+                max_workers=ANOMALY_RULE_WORKERS, thread_name_prefix='anomaly-rule'
+            )
+        return _rule_pool
+
+
+def grouped_median(groups: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """
+    Median of the values of every group, by partial selection.
+
+    Groups are packed into (groups x width) blocks padded with +inf, one
+    block per power-of-two width, and each block is partitioned once at
+    the median positions its groups need; values are never fully sorted.
+
+    Args:
+        groups: (N,) group code per value, 0 .. n_groups - 1
+        values: (N,) values
+
+    Returns:
+        (n_groups,) medians, NaN for empty groups
+    """
+    values = np.asarray(values, dtype=np.float64)
+    counts = np.bincount(groups, minlength=n_groups)
+    medians = np.full(n_groups, np.nan)
+    if not len(values):
+        return medians
+
+    # Position of every value within its group
+    order = np.argsort(groups, kind='stable')
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank = np.empty(len(values), dtype=np.int64)
+    rank[order] = np.arange(len(values)) - starts[groups[order]]
+
+    widths = np.where(counts > 0, 2 ** np.ceil(np.log2(np.maximum(counts, 1))).astype(np.int64), 0)
+    for width in np.unique(widths[widths > 0]):
+        members = np.flatnonzero(widths == width)
+        row = np.full(n_groups, -1)
+        row[members] = np.arange(len(members))
+        cells = np.flatnonzero(row[groups] >= 0)
+
+        block = np.full((len(members), width), np.inf)
+        block[row[groups[cells]], rank[cells]] = values[cells]
+        n = counts[members]
+        low, high = (n - 1) // 2, n // 2
+        block = np.partition(block, np.unique(np.concatenate([low, high])), axis=1)
+        rows = np.arange(len(members))
+        medians[members] = (block[rows, low] + block[rows, high]) / 2
+    return medians
+
+
+def grouped_rolling_stats(
+    groups: np.ndarray,
+    values: np.ndarray,
+    window: int = TEMPORAL_WINDOW,
+    min_periods: int = TEMPORAL_MIN_PERIODS
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Trailing rolling mean and standard deviation within every group at once.
+
+    Same windows as pandas ``rolling(window, min_periods).mean()/.std()``
+    per group. All windows are one strided (N, window) view of the values;
+    cells before the start of a row's group are masked, so no per-group
+    loop is needed.
+
+    Args:
+        groups: (N,) group code per row; rows of a group must be contiguous
+                and in time order
+        values: (N,) values
+
+    Returns:
+        Tuple of (mean, std, valid) arrays; valid is False where the window
+        has fewer than ``min_periods`` rows
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n == 0:
+        return np.empty(0), np.empty(0), np.empty(0, dtype=bool)
+    position = np.arange(n)
+    is_start = np.r_[True, groups[1:] != groups[:-1]]
+    group_start = np.maximum.accumulate(np.where(is_start, position, 0))
+    count = position - np.maximum(position - window + 1, group_start) + 1
+
+    # Row i's window is view[i] = values[i - window + 1 .. i]
+    padded = np.concatenate([np.zeros(window - 1), values])
+    view = np.lib.stride_tricks.sliding_window_view(padded, window)
+    in_group = np.arange(window)[None, :] >= (window - count)[:, None]
+
+    mean = np.where(in_group, view, 0.0).sum(axis=1) / count
+    deviations = np.where(in_group, view - mean[:, None], 0.0)
+    variance = np.where(
+        count > 1, (deviations ** 2).sum(axis=1) / np.maximum(count - 1, 1), np.nan
+    )
+    return mean, np.sqrt(variance), count >= min_periods
+
+
+class AnomalyTable:
+    """
+    Columnar anomaly results: one array per column, one row per anomaly.
+    
+    Columns: rule, district, pincode (None for district-level rows),
+    severity (code, see SEVERITY_ORDER), value, reference, z_score (NaN
+    where unused) and date (NaT where unused).
+    """
+    
+    def __init__(
+        self,
+        rule: Sequence[str],
+        district: Sequence[str],
+        value: Optional[Sequence[float]] = None,
+        reference: Optional[Sequence[float]] = None,
+        z_score: Optional[Sequence[float]] = None,
+        date: Optional[Sequence] = None,
+        pincode: Optional[Sequence[str]] = None
+    ):
+        n = len(rule)
+        self.rule = np.asarray(rule, dtype=object).reshape(n)
+        self.district = np.asarray(district, dtype=object).reshape(n)
+        self.severity = pd.Series(self.rule, dtype=object).map(RULE_SEVERITY_CODES).to_numpy(dtype=np.int8)
+        self.value = self._float_column(value, n)
+        self.reference = self._float_column(reference, n)
+        self.z_score = self._float_column(z_score, n)
+        self.date = (
+            np.full(n, np.datetime64('NaT'), dtype='datetime64[ns]') if date is None
+            else np.asarray(date, dtype='datetime64[ns]').reshape(n)
+        )
+        self.pincode = (
+            np.full(n, None, dtype=object) if pincode is None
+            else np.asarray(pincode, dtype=object).reshape(n)
+        )
+    
+    @staticmethod
+    def _float_column(values: Optional[Sequence[float]], n: int) -> np.ndarray:
+        if values is None:
+            return np.full(n, np.nan)
+        return np.asarray(values, dtype=np.float64).reshape(n)
+    
+    @classmethod
+    def empty(cls) -> 'AnomalyTable':
+        return cls([], [])
+    
+    @classmethod
+    def concat(cls, tables: List['AnomalyTable']) -> 'AnomalyTable':
+        """Rows of several tables, in order."""
+        if not tables:
+            return cls.empty()
+        return cls(
+            np.concatenate([t.rule for t in tables]),
+            np.concatenate([t.district for t in tables]),
+            np.concatenate([t.value for t in tables]),
+            np.concatenate([t.reference for t in tables]),
+            np.concatenate([t.z_score for t in tables]),
+            np.concatenate([t.date for t in tables]),
+            np.concatenate([t.pincode for t in tables]),
+        )
+    
+    def __len__(self) -> int:
+        return len(self.rule)
+    
+    def take(self, positions) -> 'AnomalyTable':
+        """Rows at the given positions (or boolean mask)."""
+        return AnomalyTable(
+            self.rule[positions], self.district[positions], self.value[positions],
+            self.reference[positions], self.z_score[positions], self.date[positions],
+            self.pincode[positions]
+        )
+    
+    @property
+    def type(self) -> np.ndarray:
+        return pd.Series(self.rule, dtype=object).map(RULE_TYPES).to_numpy()
+    
+    def severity_mask(self, severity: str) -> np.ndarray:
+        """Rows of one severity (no rows for an unknown severity)."""
+        code = SEVERITY_ORDER.get(severity)
+        if code is None:
+            return np.zeros(len(self), dtype=bool)
+        return self.severity == code
+    
+    def district_severity_counts(self, districts: pd.Index) -> np.ndarray:
+        """
+        Anomaly counts per district and severity.
+        
+        Returns:
+            (len(districts), len(SEVERITIES)) counts; rows of districts not
+            in ``districts`` are dropped
+        """
+        positions = districts.get_indexer(self.district)
+        known = positions >= 0
+        return np.bincount(
+            positions[known] * len(SEVERITIES) + self.severity[known],
+            minlength=len(districts) * len(SEVERITIES)
+        ).reshape(len(districts), len(SEVERITIES))
+    
+    def severity_counts(self) -> Dict[str, int]:
+        counts = np.bincount(self.severity, minlength=len(SEVERITIES))
+        return {severity: int(counts[code]) for severity, code in SEVERITY_ORDER.items()}
+    
+    def records(self, positions=None) -> List[Dict]:
+        """
+        Anomaly dicts with formatted descriptions.
+        
+        Args:
+            positions: Rows to format (default: all)
+        """
+        if positions is None:
+            positions = range(len(self))
+        result = []
+        for i in positions:
+            spec = RULES[self.rule[i]]
+            fields = {
+                'value': self.value[i],
+                'reference': self.reference[i],
+                'z_score': self.z_score[i],
+                'date': pd.Timestamp(self.date[i]),
+            }
+            record = {
+                'type': spec['type'],
+                'district': self.district[i],
+            }
+            if self.pincode[i] is not None:
+                record['pincode'] = self.pincode[i]
+            record.update({
+                'severity': spec['severity'],
+                'description': spec['description'].format(**fields),
+            })
+            for column in spec.get('columns', ()):
+                record[column] = float(fields[column])
+            for key, template in spec.get('details', {}).items():
+                record[key] = template.format(**fields)
+            record['recommendation'] = spec['recommendation']
+            result.append(record)
+        return result
+
 
 class AnomalyDetector:
     """
@@ -28,7 +621,7 @@ class AnomalyDetector:
     """
     
     def __init__(
-        self, 
+        self,
         enrolment_df: pd.DataFrame,
         biometric_df: pd.DataFrame = None,
         demographic_df: pd.DataFrame = None
@@ -36,236 +629,527 @@ class AnomalyDetector:
         self.enrolment_df = enrolment_df
         self.biometric_df = biometric_df
         self.demographic_df = demographic_df
-        self.anomalies = []
+        self.table: Optional[AnomalyTable] = None
+        self._tables: Dict[Tuple[str, ...], AnomalyTable] = {}
+        self.rule_stats: Dict[str, Dict] = {}
+        self._facts = None
     
-    def detect_all_anomalies(self) -> List[Dict]:
+    def _frame(self, dataset: str) -> Optional[pd.DataFrame]:
+        return {
+            'enrolment': self.enrolment_df,
+            'biometric': self.biometric_df,
+            'demographic': self.demographic_df,
+        }[dataset]
+    
+    def _run_detector(self, spec: DetectorSpec) -> Tuple[AnomalyTable, float]:
+        started = time.perf_counter()
+        table = spec.function(self)
+        return table, time.perf_counter() - started
+    
+    def detect_table(
+        self,
+        rules: Optional[Iterable[str]] = None,
+        skip_rules: Optional[Iterable[str]] = None
+    ) -> AnomalyTable:
         """
-        Run all anomaly detection methods.
+        Run the selected detectors (once per selection and detector).
+        
+        Light detectors run inline while heavy ones run in the thread pool;
+        results keep registry order. Time and hit count per detector are
+        recorded in ``rule_stats``.
+        
+        Args:
+            rules: Detector names to run (default: the default detectors)
+            skip_rules: Detector names to leave out
         
         Returns:
-            List of anomaly dictionaries
+            AnomalyTable sorted by severity, most severe first
         """
-        self.anomalies = []
+        names = select_detectors(rules, skip_rules)
+        if names in self._tables:
+            return self._tables[names]
+        
+        specs = [ANOMALY_DETECTORS[name] for name in names]
+        runnable = [
+            spec for spec in specs
+            if all(self._frame(dataset) is not None for dataset in spec.datasets)
+        ]
+        heavy = [spec for spec in runnable if spec.cost == 'heavy']
+        futures = {}
+        if len(heavy) > 1 or (heavy and len(runnable) > len(heavy)):
+            pool = _get_rule_pool()
+            futures = {spec.name: pool.submit(self._run_detector, spec) for spec in heavy}
+        results = {
+            spec.name: self._run_detector(spec)
+            for spec in runnable if spec.name not in futures
+        }
+        results.update({name: future.result() for name, future in futures.items()})
+        
+        for spec in specs:
+            if spec.name in results:
+                table, seconds = results[spec.name]
+                self.rule_stats[spec.name] = {
+                    'seconds': round(seconds, 6), 'hits': len(table), 'skipped': False,
+                }
+            else:
+                self.rule_stats[spec.name] = {'seconds': 0.0, 'hits': 0, 'skipped': True}
         
-        # Run detection methods
-        self._detect_volume_anomalies()
-        self._detect_age_distribution_anomalies()
-        self._detect_gender_anomalies()  # Synthetic
-        self._detect_temporal_anomalies()
+        table = AnomalyTable.concat([results[spec.name][0] for spec in runnable])
         
-        # Sort by severity
-        severity_order = {'Critical': 0, 'Warning': 1, 'Info': 2}
-        self.anomalies.sort(key=lambda x: severity_order.get(x['severity'], 3))
+        # Sort by severity (stable: detector order within a severity)
+        table = table.take(np.argsort(table.severity, kind='stable'))
+        self._tables[names] = table
+        if rules is None and skip_rules is None:
+            self.table = table
+        return table
+    
+    def detect_all_anomalies(self) -> List[Dict]:
+        """
+        Run all anomaly detection methods.
         
-        return self.anomalies
+        Returns:
+            List of anomaly dictionaries
+        """
+        return self.detect_table().records()
+    
+    @property
+    def anomalies(self) -> List[Dict]:
+        """All detected anomalies as dicts (formats every row)."""
+        return self.detect_all_anomalies()
     
-    def _detect_volume_anomalies(self):
+    @register_detector('volume', datasets=['enrolment'], rules=['volume_spike', 'volume_drop'])
+    def _detect_volume_anomalies(self) -> AnomalyTable:
         """Detect unusual enrolment volumes by district."""
-        # Calculate district-level statistics
-        district_stats = self.enrolment_df.groupby('district').agg({
-            'total_enrolments': ['sum', 'mean', 'std', 'count']
-        }).reset_index()
-        district_stats.columns = ['district', 'total', 'mean', 'std', 'count']
-        
-        # Overall statistics
-        overall_mean = district_stats['total'].mean()
-        overall_std = district_stats['total'].std()
+        district_totals, z_scores = self.volume_z_scores()
+        if z_scores is None:
+            return AnomalyTable.empty()
+        totals = district_totals.to_numpy(dtype=np.float64)
         
         # Flag districts with unusual volumes
-        for _, row in district_stats.iterrows():
-            z_score = (row['total'] - overall_mean) / overall_std if overall_std > 0 else 0
-            
-            if abs(z_score) > ANOMALY_STD_THRESHOLD:
-                if z_score > 0:
-                    self.anomalies.append({
-                        'type': 'Volume Spike',
-                        'district': row['district'],
-                        'severity': 'Warning',
-                        'description': f"Unusually high enrolments ({int(row['total']):,})",
-                        'z_score': round(z_score, 2),
-                        'recommendation': 'Verify data accuracy or investigate surge cause'
-                    })
-                else:
-                    self.anomalies.append({
-                        'type': 'Volume Drop',
-                        'district': row['district'],
-                        'severity': 'Warning',
-                        'description': f"Unusually low enrolments ({int(row['total']):,})",
-                        'z_score': round(z_score, 2),
-                        'recommendation': 'Check for data collection issues'
-                    })
-    
-    def _detect_age_distribution_anomalies(self):
+        flagged = np.abs(z_scores) > ANOMALY_STD_THRESHOLD
+        return AnomalyTable(
+            rule=np.where(z_scores[flagged] > 0, 'volume_spike', 'volume_drop'),
+            district=district_totals.index.to_numpy()[flagged],
+            value=np.trunc(totals[flagged]),
+            z_score=np.round(z_scores[flagged], 2),
+        )
+    
+    def volume_z_scores(self) -> Tuple[pd.Series, Optional[np.ndarray]]:
+        """
+        Z-score of every district's enrolment total against all districts.
+        
+        Returns:
+            Tuple of (district totals, z-scores; None without spread)
+        """
+        district_totals = self.enrolment_df.groupby('district')['total_enrolments'].sum()
+        totals = district_totals.to_numpy(dtype=np.float64)
+        overall_std = totals.std(ddof=1) if len(totals) > 1 else np.nan
+        if not overall_std > 0:
+            return district_totals, None
+        return district_totals, (totals - totals.mean()) / overall_std
+    
+    @register_detector('age_distribution', datasets=['enrolment'], rules=['age_children', 'age_adult'])
+    def _detect_age_distribution_anomalies(self) -> AnomalyTable:
         """Detect unusual age group distributions."""
         # Calculate age distribution per district
         district_age = self.enrolment_df.groupby('district').agg({
             'age_0_5': 'sum',
-            'age_5_17': 'sum',
             'age_18_greater': 'sum',
             'total_enrolments': 'sum'
-        }).reset_index()
+        })
+        totals = district_age['total_enrolments'].to_numpy(dtype=np.float64)
+        safe_totals = np.where(totals > 0, totals, 1)
+        pct = {
+            col: np.where(totals > 0, district_age[col].to_numpy(dtype=np.float64) / safe_totals * 100, 0)
+            for col in ['age_0_5', 'age_18_greater']
+        }
+        
+        # Skip small samples
+        large = totals >= 100
+        children = large & (np.abs(pct['age_0_5'] - EXPECTED_AGE_0_5_PCT) > AGE_DEVIATION_THRESHOLD)
+        adult = large & (pct['age_18_greater'] > ADULT_PCT_LIMIT)
+        
+        # Interleave per district: children check first, then adults
+        district = np.repeat(district_age.index.to_numpy(), 2)
+        rule = np.tile(np.array(['age_children', 'age_adult'], dtype=object), len(totals))
+        value = np.column_stack([pct['age_0_5'], pct['age_18_greater']]).ravel()
+        flagged = np.column_stack([children, adult]).ravel()
+        return AnomalyTable(rule[flagged], district[flagged], value[flagged])
+    
+    @register_detector('gender', datasets=['enrolment'], rules=['gender_low', 'gender_high'])
+    def _detect_gender_anomalies(self) -> AnomalyTable:
+        """
+        Detect gender ratio anomalies.
         
-        # Calculate percentages
-        for col in ['age_0_5', 'age_5_17', 'age_18_greater']:
-            district_age[f'{col}_pct'] = np.where(
-                district_age['total_enrolments'] > 0,
-                district_age[col] / district_age['total_enrolments'] * 100,
-                0
+        Uses the FEMALE_COLUMN / MALE_COLUMN counts when the enrolment data
+        has them. Otherwise the female share is synthesized per district
+        (synthetic_female_share), deterministically, so results can be
+        cached and shared across workers.
+        """
+        df = self.enrolment_df
+        codes, districts = pd.factorize(df['district'], sort=True)
+        totals = np.bincount(codes, weights=df['total_enrolments'].to_numpy(dtype=np.float64),
+                             minlength=len(districts))
+        
+        if FEMALE_COLUMN in df.columns and MALE_COLUMN in df.columns:
+            female = np.bincount(codes, weights=df[FEMALE_COLUMN].fillna(0).to_numpy(dtype=np.float64),
+                                 minlength=len(districts))
+            male = np.bincount(codes, weights=df[MALE_COLUMN].fillna(0).to_numpy(dtype=np.float64),
+                               minlength=len(districts))
+            reported = female + male
+            keep = (totals >= 100) & (reported > 0)
+            female_pct = female[keep] / reported[keep]
+        else:
+            keep = totals >= 100
+            female_pct = np.array(
+                [synthetic_female_share(d) for d in districts[keep]], dtype=np.float64
             )
+        district_names = np.asarray(districts)[keep]
+        
+        # Check for anomalies
+        low = female_pct < GENDER_RATIO_LOWER
+        high = ~low & (female_pct > GENDER_RATIO_UPPER)
+        flagged = low | high
+        return AnomalyTable(
+            rule=np.where(low[flagged], 'gender_low', 'gender_high'),
+            district=district_names[flagged],
+            value=female_pct[flagged] * 100,
+        )
+    
+    @register_detector('temporal', datasets=['enrolment'], rules=['temporal_drop'])
+    def _detect_temporal_anomalies(self) -> AnomalyTable:
+        """Detect unusual patterns in time-based data."""
+        daily, rolling_mean, z_scores, valid = self.temporal_z_scores()
+        if daily is None:
+            return AnomalyTable.empty()
+        values = daily.to_numpy(dtype=np.float64)
         
-        # Expected distributions (approximate)
-        expected_0_5 = 20  # ~20% for children 0-5
-        expected_5_17 = 30  # ~30% for 5-17
-        expected_18_plus = 50  # ~50% for adults
+        # Detect sudden drops (potential data issues)
+        flagged = valid & (z_scores < -ANOMALY_STD_THRESHOLD)
         
-        threshold = 15  # Flag if deviation > 15%
+        return AnomalyTable(
+            rule=np.full(int(flagged.sum()), 'temporal_drop', dtype=object),
+            district=np.full(int(flagged.sum()), 'State-wide', dtype=object),
+            value=np.trunc(values[flagged]),
+            reference=np.trunc(rolling_mean[flagged]),
+            date=daily.index.to_numpy()[flagged],
+        )
+    
+    def temporal_z_scores(self):
+        """
+        State-wide daily enrolments against a rolling window
+        (TEMPORAL_WINDOW dates, at least TEMPORAL_MIN_PERIODS).
         
-        for _, row in district_age.iterrows():
-            if row['total_enrolments'] < 100:
-                continue  # Skip small samples
-            
-            # Check age 0-5 distribution
-            if abs(row['age_0_5_pct'] - expected_0_5) > threshold:
-                self.anomalies.append({
-                    'type': 'Age Distribution',
-                    'district': row['district'],
-                    'severity': 'Info',
-                    'description': f"Unusual children (0-5) ratio: {row['age_0_5_pct']:.1f}%",
-                    'expected': f"{expected_0_5}%",
-                    'recommendation': 'Verify birth registration data'
-                })
-            
-            # Check adult distribution
-            if row['age_18_greater_pct'] > 70:
-                self.anomalies.append({
-                    'type': 'Age Distribution',
-                    'district': row['district'],
-                    'severity': 'Warning',
-                    'description': f"High adult ratio: {row['age_18_greater_pct']:.1f}%",
-                    'expected': f"~{expected_18_plus}%",
-                    'recommendation': 'Check for late enrolment campaigns'
-                })
-    
-    def _detect_gender_anomalies(self):
+        Returns:
+            Tuple of (daily totals, rolling mean, z-scores, valid mask);
+            all None with fewer than TEMPORAL_WINDOW dates
         """
-        Detect gender ratio anomalies.
+        daily = self.enrolment_df.groupby('date')['total_enrolments'].sum()
+        if len(daily) < TEMPORAL_WINDOW:
+            return None, None, None, None
         
-        Since gender data is not in the dataset, we synthesize 
-        realistic gender ratios based on district characteristics.
-        In production, this would use actual gender data.
+        rolling_mean = daily.rolling(TEMPORAL_WINDOW, min_periods=TEMPORAL_MIN_PERIODS).mean().to_numpy()
+        rolling_std = daily.rolling(TEMPORAL_WINDOW, min_periods=TEMPORAL_MIN_PERIODS).std().to_numpy()
+        values = daily.to_numpy(dtype=np.float64)
+        valid = ~np.isnan(rolling_mean) & ~np.isnan(rolling_std) & (rolling_std != 0)
+        z_scores = np.full(len(values), np.nan)
+        z_scores[valid] = (values[valid] - rolling_mean[valid]) / rolling_std[valid]
+        return daily, rolling_mean, z_scores, valid
+    
+    def detect_local_temporal_anomalies(self, level: str = 'district') -> AnomalyTable:
         """
-        # Get district totals
-        district_totals = self.enrolment_df.groupby('district').agg({
-            'total_enrolments': 'sum'
-        }).reset_index()
+        Detect sharp drops in every district's (or pincode's) enrolments.
+
+        Each unit's series runs over its own reporting dates, with the same
+        rolling z-score rule as the state-wide check, for all units in one
+        vectorized pass.
+
+        Args:
+            level: 'district' or 'pincode'
+
+        Returns:
+            AnomalyTable of drops in time order per unit
+        """
+        keys = ['district'] if level == 'district' else ['district', 'pincode']
+        daily = self.enrolment_df.groupby(keys + ['date'])['total_enrolments'].sum()
+        if daily.empty:
+            return AnomalyTable.empty()
+
+        groups = daily.groupby(level=keys).ngroup().to_numpy()
+        values = daily.to_numpy(dtype=np.float64)
+        rolling_mean, rolling_std, valid = grouped_rolling_stats(groups, values)
+
+        # Windows that are flat up to rounding error count as std == 0
+        valid &= rolling_std > 1e-9 * (np.abs(rolling_mean) + 1)
+        z_scores = np.full(len(values), np.nan)
+        z_scores[valid] = (values[valid] - rolling_mean[valid]) / rolling_std[valid]
+        flagged = np.flatnonzero(valid & (z_scores < -ANOMALY_STD_THRESHOLD))
+
+        index = daily.index[flagged]
+        return AnomalyTable(
+            rule=np.full(len(flagged), 'local_temporal_drop', dtype=object),
+            district=index.get_level_values('district').to_numpy(),
+            value=np.trunc(values[flagged]),
+            reference=np.trunc(rolling_mean[flagged]),
+            z_score=np.round(z_scores[flagged], 2),
+            date=index.get_level_values('date').to_numpy(),
+            pincode=(
+                index.get_level_values('pincode').astype(str).to_numpy()
+                if level == 'pincode' else None
+            ),
+        )
+    
+    def pincode_outlier_scores(self) -> pd.DataFrame:
+        """
+        Robust scores of every pincode x month enrolment volume against
+        the other pincode-months of its district.
+
+        Score = 0.6745 * (value - median) / MAD (modified z-score); where
+        the MAD is 0, the mean absolute deviation * 1.2533 is used instead.
+        Medians and MADs are grouped partial selections (grouped_median).
+
+        Returns:
+            DataFrame with district, pincode, month, value, median, score
+            (NaN where the district has no spread)
+        """
+        df = self.enrolment_df
+        month = df['date'].dt.to_period('M').dt.to_timestamp()
+        volumes = df.groupby(
+            [df['district'], df['pincode'].astype(str), month]
+        )['total_enrolments'].sum()
+        volumes.index = volumes.index.set_names(['district', 'pincode', 'month'])
+
+        groups, districts = pd.factorize(volumes.index.get_level_values('district'))
+        values = volumes.to_numpy(dtype=np.float64)
+        median = grouped_median(groups, values, len(districts))[groups]
+        deviation = np.abs(values - median)
+        mad = grouped_median(groups, deviation, len(districts))[groups]
+        mean_deviation = (
+            np.bincount(groups, weights=deviation, minlength=len(districts))
+            / np.maximum(np.bincount(groups, minlength=len(districts)), 1)
+        )[groups]
+
+        scale = _robust_scale(mad, mean_deviation)
+        score = np.full(len(values), np.nan)
+        spread = scale > 0
+        score[spread] = (values[spread] - median[spread]) / scale[spread]
+
+        scores = volumes.index.to_frame(index=False)
+        scores['value'] = values
+        scores['median'] = median
+        scores['score'] = score
+        return scores
+
+    def detect_pincode_outliers(
+        self,
+        threshold: float = ROBUST_Z_THRESHOLD,
+        min_observations: int = ROBUST_MIN_OBSERVATIONS,
+        scores: Optional[pd.DataFrame] = None
+    ) -> AnomalyTable:
+        """
+        Pincode-months whose robust score exceeds ``threshold``.
+
+        Args:
+            threshold: Minimum |score|
+            min_observations: Districts with fewer pincode-months are skipped
+            scores: Precomputed pincode_outlier_scores() (e.g. cached)
+
+        Returns:
+            AnomalyTable, largest |score| first
+        """
+        if scores is None:
+            scores = self.pincode_outlier_scores()
+        observations = scores.groupby('district')['value'].transform('size').to_numpy()
+        score = scores['score'].to_numpy()
+        flagged = np.flatnonzero(
+            (observations >= min_observations) & (np.abs(np.nan_to_num(score)) > threshold)
+        )
+        flagged = flagged[np.argsort(-np.abs(score[flagged]), kind='stable')]
+        return AnomalyTable(
+            rule=np.where(score[flagged] > 0, 'pincode_volume_spike', 'pincode_volume_drop'),
+            district=scores['district'].to_numpy()[flagged],
+            value=scores['value'].to_numpy()[flagged],
+            reference=scores['median'].to_numpy()[flagged],
+            z_score=np.round(score[flagged], 2),
+            date=scores['month'].to_numpy()[flagged],
+            pincode=scores['pincode'].to_numpy()[flagged],
+        )
+    
+    def fact_array(self) -> Tuple[pd.MultiIndex, np.ndarray, np.ndarray, np.ndarray]:
+        """Shared pincode x month fact array of all datasets (built once, see build_fact_array)."""
+        if self._facts is None:
+            frames = {'enrolment': self.enrolment_df}
+            for name in UPDATE_DATASETS:
+                if self._frame(name) is not None:
+                    frames[name] = self._frame(name)
+            self._facts = build_fact_array(frames)
+        return self._facts
+    
+    @register_detector(
+        'update_scan', datasets=['enrolment', 'biometric', 'demographic'],
+        rules=[
+            'biometric_update_spike', 'biometric_update_drop',
+            'demographic_update_spike', 'demographic_update_drop', 'update_ratio_high',
+        ],
+        cost='heavy'
+    )
+    def _detect_update_anomalies(self) -> AnomalyTable:
+        """
+        Fused scan of the fact array for update anomalies.
         
-        # Synthesize gender ratios (for demo)
-        # Use district name hash for consistent synthetic data
-        np.random.seed(42)
+        - Spikes/drops: each pincode's monthly biometric and demographic
+          updates against the median/MAD of its own series. A series runs
+          from its first to its last month with rows; months in between
+          without rows count as 0 (possible outage) if the pincode has rows
+          in another dataset and the dataset has rows at all that month.
+          The spread is at least the Poisson noise sqrt(median); series
+          with fewer than UPDATE_SCAN_MIN_MONTHS months are skipped
+        - Ratio: log (1 + updates) / (1 + enrolments) of every pincode-month
+          against the median/MAD of its district; only high ratios are flagged
         
-        for _, row in district_totals.iterrows():
-            if row['total_enrolments'] < 100:
-                continue
-            
-            # Generate realistic female ratio (centered around 48-49%)
-            # Some districts will be flagged as anomalies
-            district_hash = hash(row['district']) % 100
-            
-            if district_hash < 5:  # 5% of districts have low female ratio
-                female_pct = np.random.uniform(0.42, 0.46)
-            elif district_hash > 95:  # 5% have high ratio
-                female_pct = np.random.uniform(0.54, 0.56)
-            else:  # Normal distribution
-                female_pct = np.random.normal(0.485, 0.02)
-                female_pct = np.clip(female_pct, 0.44, 0.52)
-            
-            # Check for anomalies
-            if female_pct < GENDER_RATIO_LOWER:
-                self.anomalies.append({
-                    'type': 'Gender Anomaly',
-                    'district': row['district'],
-                    'severity': 'Critical',
-                    'description': f"Low female enrolment: {female_pct*100:.1f}%",
-                    'threshold': f"Expected: {GENDER_RATIO_LOWER*100}-{GENDER_RATIO_UPPER*100}%",
-                    'recommendation': 'Investigate potential exclusion or data entry fraud'
-                })
-            elif female_pct > GENDER_RATIO_UPPER:
-                self.anomalies.append({
-                    'type': 'Gender Anomaly',
-                    'district': row['district'],
-                    'severity': 'Warning',
-                    'description': f"High female enrolment: {female_pct*100:.1f}%",
-                    'threshold': f"Expected: {GENDER_RATIO_LOWER*100}-{GENDER_RATIO_UPPER*100}%",
-                    'recommendation': 'Verify data entry accuracy'
-                })
-    
-    def _detect_temporal_anomalies(self):
-        """Detect unusual patterns in time-based data."""
-        # Daily aggregation
-        daily = self.enrolment_df.groupby('date').agg({
-            'total_enrolments': 'sum'
-        }).reset_index()
+        Pincode-months where value and usual level are both below
+        UPDATE_SCAN_MIN_VOLUME are ignored.
+        """
+        units, months, facts, rows = self.fact_array()
+        U, T = facts.shape[1:]
+        if not U or not T:
+            return AnomalyTable.empty()
+        month_dates = pd.to_datetime(
+            pd.DataFrame({'year': (months - 1) // 12, 'month': (months - 1) % 12 + 1, 'day': 1})
+        ).to_numpy()
+        districts = units.get_level_values('district').to_numpy()
+        pincodes = units.get_level_values('pincode').to_numpy()
+        tables = []
         
-        if len(daily) < 7:
-            return
+        # Update series: all update layers as one (layers * U, T) matrix
+        values = facts[1:].reshape(-1, T)
+        present = rows[1:] > 0
+        t = np.arange(T)
+        started = np.where(present.any(axis=2), np.argmax(present, axis=2), T)
+        ended = np.where(present.any(axis=2), T - 1 - np.argmax(present[:, :, ::-1], axis=2), -1)
+        reported = present.any(axis=1)
+        active = (rows > 0).any(axis=0)
+        valid = (
+            reported[:, None, :] & active[None, :, :]
+            & (t >= started[:, :, None]) & (t <= ended[:, :, None])
+        ).reshape(-1, T)
         
-        # Calculate rolling statistics
-        daily['rolling_mean'] = daily['total_enrolments'].rolling(7, min_periods=3).mean()
-        daily['rolling_std'] = daily['total_enrolments'].rolling(7, min_periods=3).std()
+        series = np.where(valid, values, np.nan)
+        n_valid = valid.sum(axis=1)
+        scored = n_valid >= UPDATE_SCAN_MIN_MONTHS
+        if scored.any():
+            with np.errstate(all='ignore'):
+                median = np.nanmedian(series[scored], axis=1)[:, None]
+                deviation = np.abs(series[scored] - median)
+                mad = np.nanmedian(deviation, axis=1)[:, None]
+                # Monthly counts vary at least like Poisson counts
+                scale = np.maximum(
+                    _robust_scale(mad, np.nanmean(deviation, axis=1)[:, None]), np.sqrt(median)
+                )
+                z = np.where(scale > 0, (series[scored] - median) / scale, 0.0)
+            z = np.nan_to_num(z)
+            large = np.maximum(series[scored], median) >= UPDATE_SCAN_MIN_VOLUME
+            row, month = np.nonzero((np.abs(z) > ROBUST_Z_THRESHOLD) & large)
+            flat_row = np.flatnonzero(scored)[row]
+            layer, unit = np.divmod(flat_row, U)
+            names = np.asarray(UPDATE_DATASETS)[layer]
+            order = np.argsort(-np.abs(z[row, month]), kind='stable')
+            row, month, layer, unit, names = row[order], month[order], layer[order], unit[order], names[order]
+            spike = z[row, month] > 0
+            tables.append(AnomalyTable(
+                rule=np.char.add(names.astype(str), np.where(spike, '_update_spike', '_update_drop')),
+                district=districts[unit],
+                value=series[scored][row, month],
+                reference=median[row, 0],
+                z_score=np.round(z[row, month], 2),
+                date=month_dates[month],
+                pincode=pincodes[unit],
+            ))
         
-        # Detect sudden drops (potential data issues)
-        for idx, row in daily.iterrows():
-            if pd.isna(row['rolling_mean']) or pd.isna(row['rolling_std']):
-                continue
-            if row['rolling_std'] == 0:
-                continue
-            
-            z_score = (row['total_enrolments'] - row['rolling_mean']) / row['rolling_std']
-            
-            if z_score < -ANOMALY_STD_THRESHOLD:
-                self.anomalies.append({
-                    'type': 'Temporal Anomaly',
-                    'district': 'State-wide',
-                    'severity': 'Warning',
-                    'description': f"Sharp drop on {row['date'].strftime('%Y-%m-%d')}",
-                    'value': f"{int(row['total_enrolments']):,} vs avg {int(row['rolling_mean']):,}",
-                    'recommendation': 'Check for system outages or holidays'
-                })
+        # Update-to-enrolment ratio of pincode-months with rows in all datasets
+        cells = np.flatnonzero((rows > 0).all(axis=0).ravel())
+        if len(cells):
+            unit, month = np.divmod(cells, T)
+            updates = facts[1:].sum(axis=0).ravel()[cells]
+            log_ratio = np.log1p(updates) - np.log1p(facts[0].ravel()[cells])
+            groups, group_names = pd.factorize(districts[unit])
+            median = grouped_median(groups, log_ratio, len(group_names))[groups]
+            deviation = np.abs(log_ratio - median)
+            mad = grouped_median(groups, deviation, len(group_names))[groups]
+            counts = np.bincount(groups, minlength=len(group_names))
+            mean_deviation = (
+                np.bincount(groups, weights=deviation, minlength=len(group_names)) / np.maximum(counts, 1)
+            )[groups]
+            scale = _robust_scale(mad, mean_deviation)
+            z = np.zeros(len(cells))
+            np.divide(log_ratio - median, scale, out=z, where=scale > 0)
+            flagged = np.flatnonzero(
+                (counts[groups] >= ROBUST_MIN_OBSERVATIONS) & (z > ROBUST_Z_THRESHOLD)
+                & (updates >= UPDATE_SCAN_MIN_VOLUME)
+            )
+            flagged = flagged[np.argsort(-z[flagged], kind='stable')]
+            tables.append(AnomalyTable(
+                rule=np.full(len(flagged), 'update_ratio_high', dtype=object),
+                district=districts[unit[flagged]],
+                value=np.exp(log_ratio[flagged]),
+                reference=np.exp(median[flagged]),
+                z_score=np.round(z[flagged], 2),
+                date=month_dates[month[flagged]],
+                pincode=pincodes[unit[flagged]],
+            ))
+        
+        return AnomalyTable.concat(tables)
+    
+    @register_detector(
+        'district_temporal', datasets=['enrolment'], rules=['local_temporal_drop'],
+        cost='heavy', default=False
+    )
+    def _detect_district_temporal_anomalies(self) -> AnomalyTable:
+        """Sharp drops in individual district series."""
+        return self.detect_local_temporal_anomalies('district')
+    
+    @register_detector(
+        'pincode_temporal', datasets=['enrolment'], rules=['local_temporal_drop'],
+        cost='heavy', default=False
+    )
+    def _detect_pincode_temporal_anomalies(self) -> AnomalyTable:
+        """Sharp drops in individual pincode series."""
+        return self.detect_local_temporal_anomalies('pincode')
+    
+    @register_detector(
+        'pincode_outliers', datasets=['enrolment'],
+        rules=['pincode_volume_spike', 'pincode_volume_drop'],
+        cost='heavy', default=False
+    )
+    def _detect_pincode_volume_outliers(self) -> AnomalyTable:
+        """Pincode-month volumes that are outliers within their district."""
+        return self.detect_pincode_outliers()
     
     def get_critical_alerts(self) -> List[Dict]:
         """Get only critical severity anomalies."""
-        if not self.anomalies:
-            self.detect_all_anomalies()
-        return [a for a in self.anomalies if a['severity'] == 'Critical']
+        table = self.detect_table()
+        return table.records(np.flatnonzero(table.severity_mask('Critical')))
     
     def get_warning_alerts(self) -> List[Dict]:
         """Get only warning severity anomalies."""
-        if not self.anomalies:
-            self.detect_all_anomalies()
-        return [a for a in self.anomalies if a['severity'] == 'Warning']
+        table = self.detect_table()
+        return table.records(np.flatnonzero(table.severity_mask('Warning')))
     
     def get_anomaly_summary(self) -> Dict:
         """Get summary of all detected anomalies."""
-        if not self.anomalies:
-            self.detect_all_anomalies()
-        
-        critical = len([a for a in self.anomalies if a['severity'] == 'Critical'])
-        warning = len([a for a in self.anomalies if a['severity'] == 'Warning'])
-        info = len([a for a in self.anomalies if a['severity'] == 'Info'])
+        table = self.detect_table()
+        counts = table.severity_counts()
         
         # Group by type
-        by_type = {}
-        for a in self.anomalies:
-            t = a['type']
-            by_type[t] = by_type.get(t, 0) + 1
+        types, type_counts = np.unique(table.type.astype(str), return_counts=True)
         
         return {
-            'total_anomalies': len(self.anomalies),
-            'critical_count': critical,
-            'warning_count': warning,
-            'info_count': info,
-            'by_type': by_type,
-            'affected_districts': list(set(a['district'] for a in self.anomalies))
+            'total_anomalies': len(table),
+            'critical_count': counts['Critical'],
+            'warning_count': counts['Warning'],
+            'info_count': counts['Info'],
+            'by_type': dict(zip(types.tolist(), type_counts.tolist())),
+            'affected_districts': pd.unique(table.district).tolist()
         }
     
     def get_district_health_score(self) -> pd.DataFrame:
@@ -273,37 +1157,12 @@ class AnomalyDetector:
         Calculate a data quality health score for each district.
         Score from 0-100, where 100 is perfect data quality.
         """
-        if not self.anomalies:
-            self.detect_all_anomalies()
-        
-        # Count anomalies per district
-        district_anomalies = {}
-        for a in self.anomalies:
-            d = a['district']
-            if d not in district_anomalies:
-                district_anomalies[d] = {'critical': 0, 'warning': 0, 'info': 0}
-            
-            severity = a['severity'].lower()
-            if severity in district_anomalies[d]:
-                district_anomalies[d][severity] += 1
-        
-        # Calculate health scores
-        districts = self.enrolment_df['district'].unique()
-        scores = []
-        
-        for d in districts:
-            if d in district_anomalies:
-                counts = district_anomalies[d]
-                # Critical = -30, Warning = -15, Info = -5
-                penalty = counts['critical'] * 30 + counts['warning'] * 15 + counts['info'] * 5
-                score = max(0, 100 - penalty)
-            else:
-                score = 100
-            
-            scores.append({
-                'district': d,
-                'health_score': score,
-                'status': 'Good' if score >= 80 else ('Warning' if score >= 50 else 'Critical')
-            })
+        # Critical = -30, Warning = -15, Info = -5 per anomaly
+        districts = pd.Index(self.enrolment_df['district'].unique())
+        scores = health_scores(self.detect_table().district_severity_counts(districts))
         
-        return pd.DataFrame(scores).sort_values('health_score', ascending=False)
+        return pd.DataFrame({
+            'district': districts,
+            'health_score': scores,
+            'status': health_status(scores),
+        }).sort_values('health_score', ascending=False)
@@ -0,0 +1,228 @@
+"""
+Mandatory Update Backlog Tracker
+Reconciles projected mandatory biometric updates with actual ones.
+
+Logic:
+- Projected updates per district and month come from the cohort-aging
+  model (cohort_projection): updates due at age 5 and 15 from cohorts
+  enrolled earlier in the data
+- Actual updates are the 5-17 biometric updates (BACKLOG_ACTUAL_COLUMN)
+- Backlog = cumulative projected - cumulative actual; a positive running
+  gap means more updates fell due than were done
+- Everything is held as (month x district) arrays. On a data reload the
+  new monthly totals are compared with the stored ones and only months
+  from the first changed month onward are re-projected and re-accumulated,
+  so appending a month costs one month of work
+"""
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import BACKLOG_ACTUAL_COLUMN
+from src.analytics.cohort_projection import (
+    BUCKET_AGE_RANGES, MILESTONES, update_lags, _box_convolve
+)
+
+
+def _monthly_array(
+    df: pd.DataFrame,
+    column: str,
+    first_month: int,
+    T: int,
+    district_index: pd.Index
+) -> np.ndarray:
+    """Sum ``column`` into a (T, D) month x district array."""
+    D = len(district_index)
+    if df.empty:
+        return np.zeros((T, D))
+    month_idx = (df['date'].dt.year * 12 + df['date'].dt.month).to_numpy() - first_month
+    district_idx = district_index.get_indexer(df['district'])
+    return np.bincount(
+        month_idx * D + district_idx,
+        weights=df[column].fillna(0).to_numpy(dtype=np.float64),
+        minlength=T * D
+    ).reshape(T, D)
+
+
+class BacklogTracker:
+    """
+    Incrementally maintained month x district backlog arrays.
+
+    Arrays (all shape (months, districts)): projected, actual,
+    cumulative_projected, cumulative_actual, gap.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.version: Optional[int] = None
+        self.first_month: Optional[int] = None
+        self.months = pd.PeriodIndex([], freq='M')
+        self.districts = pd.Index([])
+        self.cohorts: Dict[str, np.ndarray] = {}
+        self.projected = np.zeros((0, 0))
+        self.actual = np.zeros((0, 0))
+        self.cumulative_projected = np.zeros((0, 0))
+        self.cumulative_actual = np.zeros((0, 0))
+        self.gap = np.zeros((0, 0))
+        self.last_recomputed_months = 0
+
+    def sync(self, version: int, enrolment_df: pd.DataFrame, biometric_df: pd.DataFrame):
+        """Update from a data snapshot unless it (or a newer one) is applied."""
+        with self._lock:
+            if self.version is not None and version <= self.version:
+                return
+            self._update(enrolment_df, biometric_df)
+            self.version = version
+
+    def _update(self, enrolment_df: pd.DataFrame, biometric_df: pd.DataFrame):
+        dates = pd.concat([enrolment_df['date'], biometric_df['date']])
+        if dates.empty:
+            self._reset()
+            return
+        month_number = dates.dt.year * 12 + dates.dt.month
+        first_month, last_month = int(month_number.min()), int(month_number.max())
+        T = last_month - first_month + 1
+
+        # Districts keep their column; new ones are appended
+        seen = pd.Index(pd.concat([enrolment_df['district'], biometric_df['district']]).unique())
+        districts = self.districts.append(seen.difference(self.districts))
+        D = len(districts)
+
+        cohorts = {
+            column: _monthly_array(enrolment_df, column, first_month, T, districts)
+            for column in BUCKET_AGE_RANGES
+        }
+        actual = _monthly_array(biometric_df, BACKLOG_ACTUAL_COLUMN, first_month, T, districts)
+
+        # First month whose inputs differ from what is stored
+        start = 0
+        if self.first_month == first_month and len(self.months):
+            old_T, old_D = self.actual.shape
+            n = min(old_T, T)
+            changed = np.zeros(n, dtype=bool)
+            for new, old in [(actual, self.actual)] + [
+                (cohorts[column], self.cohorts[column]) for column in BUCKET_AGE_RANGES
+            ]:
+                changed |= (new[:n, :old_D] != old[:n]).any(axis=1) | (new[:n, old_D:] != 0).any(axis=1)
+            start = int(np.argmax(changed)) if changed.any() else n
+
+        projected = np.zeros((T, D))
+        cumulative_projected = np.zeros((T, D))
+        cumulative_actual = np.zeros((T, D))
+        if start:
+            old_D = self.actual.shape[1]
+            projected[:start, :old_D] = self.projected[:start]
+            cumulative_projected[:start, :old_D] = self.cumulative_projected[:start]
+            cumulative_actual[:start, :old_D] = self.cumulative_actual[:start]
+
+        # Re-project changed months: box convolution over cohort cumulative sums
+        t = np.arange(start, T)
+        for column, array in cohorts.items():
+            cumulative = np.concatenate([np.zeros((1, D)), np.cumsum(array, axis=0)]).T
+            for milestone in MILESTONES.values():
+                lags = update_lags(BUCKET_AGE_RANGES[column], milestone)
+                if lags is None:
+                    continue
+                first, last, share = lags
+                projected[start:] += share * _box_convolve(cumulative, t, first, last).T
+
+        base_projected = cumulative_projected[start - 1] if start else 0.0
+        base_actual = cumulative_actual[start - 1] if start else 0.0
+        cumulative_projected[start:] = base_projected + np.cumsum(projected[start:], axis=0)
+        cumulative_actual[start:] = base_actual + np.cumsum(actual[start:], axis=0)
+
+        self.first_month = first_month
+        self.months = pd.period_range(
+            pd.Period(year=(first_month - 1) // 12, month=(first_month - 1) % 12 + 1, freq='M'),
+            periods=T, freq='M'
+        )
+        self.districts = districts
+        self.cohorts = cohorts
+        self.projected = projected
+        self.actual = actual
+        self.cumulative_projected = cumulative_projected
+        self.cumulative_actual = cumulative_actual
+        self.gap = cumulative_projected - cumulative_actual
+        self.last_recomputed_months = T - start
+
+    def select(
+        self,
+        districts: Optional[List[str]] = None,
+        start_month: Optional[str] = None,
+        end_month: Optional[str] = None
+    ) -> Tuple[pd.PeriodIndex, pd.Index, slice, np.ndarray]:
+        """
+        Month slice and district columns for a query (call with the lock held).
+
+        Returns:
+            Tuple of (months, districts, month slice, district column positions)
+        """
+        months, all_districts = self.months, self.districts
+        lo = 0 if not start_month else months.searchsorted(pd.Period(start_month, freq='M'))
+        hi = len(months) if not end_month else months.searchsorted(pd.Period(end_month, freq='M'), side='right')
+        if districts:
+            columns = all_districts.get_indexer(districts)
+            columns = columns[columns >= 0]
+        else:
+            columns = np.arange(len(all_districts))
+        return months[lo:hi], all_districts[columns], slice(lo, hi), columns
+
+    def trend(
+        self,
+        districts: Optional[List[str]] = None,
+        start_month: Optional[str] = None,
+        end_month: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Monthly backlog summed over the selected districts.
+
+        Returns:
+            DataFrame with month, projected, actual, cumulative_projected,
+            cumulative_actual, gap
+        """
+        with self._lock:
+            months, _, rows, columns = self.select(districts, start_month, end_month)
+            return pd.DataFrame({
+                'month': months.to_timestamp(),
+                'projected': self.projected[rows][:, columns].sum(axis=1),
+                'actual': self.actual[rows][:, columns].sum(axis=1),
+                'cumulative_projected': self.cumulative_projected[rows][:, columns].sum(axis=1),
+                'cumulative_actual': self.cumulative_actual[rows][:, columns].sum(axis=1),
+                'gap': self.gap[rows][:, columns].sum(axis=1),
+            })
+
+    def latest_gap(
+        self,
+        districts: Optional[List[str]] = None,
+        end_month: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Running gap per district at the last selected month.
+
+        Returns:
+            DataFrame with district, month, cumulative_projected,
+            cumulative_actual, gap
+        """
+        with self._lock:
+            months, names, rows, columns = self.select(districts, None, end_month)
+            if not len(months):
+                return pd.DataFrame(columns=[
+                    'district', 'month', 'cumulative_projected', 'cumulative_actual', 'gap'
+                ])
+            last = rows.stop - 1
+            return pd.DataFrame({
+                'district': names,
+                'month': months[-1].to_timestamp(),
+                'cumulative_projected': self.cumulative_projected[last, columns],
+                'cumulative_actual': self.cumulative_actual[last, columns],
+                'gap': self.gap[last, columns],
+            })
+
+
+# Shared by all requests; synced to the newest data snapshot
+tracker = BacklogTracker()
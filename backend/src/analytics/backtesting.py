@@ -0,0 +1,280 @@
+"""
+Forecast Backtesting
+Rolling-origin evaluation of the workload forecaster.
+
+Logic:
+- Series are the monthly enrolment matrix (district x month) plus a
+  'State-wide' row holding the column sums
+- For every cutoff month the models are fitted on the months before it
+  only and forecast the next ``horizon`` months, which are then compared
+  with the actual values
+- Holt linear trend (vectorized NumPy engine) is compared with the
+  moving-average fallback used when Holt cannot be fitted
+- Errors are MAPE (cells with a zero actual are skipped) and MASE (scaled
+  by the in-sample mean absolute one-step change of each training window)
+- Cutoffs are independent, so they run in the shared forecasting process
+  pool once there are enough series x cutoffs to pay for it
+- Reports carry the configuration and a hash of it, and compare_reports()
+  diffs two runs so a model change can be checked against a baseline
+
+Run from backend/:
+    python -m src.analytics.backtesting --output report.json
+    python -m src.analytics.backtesting --baseline report.json
+"""
+import argparse
+import hashlib
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.config import (
+    BACKTEST_HORIZON, BACKTEST_MIN_TRAIN, BACKTEST_PARALLEL_MIN_FITS,
+    HOLT_GRID_POINTS, HOLT_REFINE_ROUNDS, HOLT_REFINE_POINTS
+)
+from src.analytics.holt_smoothing import fit_holt_linear, forecast_holt_linear
+from src.analytics.workload_forecasting import (
+    moving_average_forecast, _get_process_pool, shutdown_process_pool
+)
+
+STATEWIDE_LABEL = 'State-wide'
+METHODS = ('holt', 'moving_average')
+
+
+def _backtest_cutoff(Y: np.ndarray, cutoff: int, horizon: int) -> Dict[str, np.ndarray]:
+    """
+    Fit on Y[:, :cutoff] and score forecasts of the following months.
+
+    Runs inline or in pool workers.
+
+    Returns:
+        Dict with per-method absolute percentage and scaled errors, each
+        (S, h) with NaN where undefined, plus the actuals
+    """
+    train = Y[:, :cutoff]
+    actual = Y[:, cutoff:cutoff + horizon]
+    h = actual.shape[1]
+
+    forecasts = {
+        'holt': forecast_holt_linear(fit_holt_linear(train), h),
+        'moving_average': moving_average_forecast(train, h),
+    }
+
+    # In-sample naive one-step error; flat training windows have no scale
+    scale = np.abs(np.diff(train, axis=1)).mean(axis=1, keepdims=True)
+    scale = np.where(scale > 0, scale, np.nan)
+    nonzero = actual != 0
+    safe_actual = np.where(nonzero, actual, 1.0)
+
+    result = {'actual': actual}
+    for method, forecast in forecasts.items():
+        abs_error = np.abs(forecast - actual)
+        result[f'{method}_ape'] = np.where(nonzero, abs_error / np.abs(safe_actual), np.nan)
+        result[f'{method}_scaled'] = abs_error / scale
+    return result
+
+
+def _nanmean(values: np.ndarray) -> Optional[float]:
+    """Mean ignoring NaN, None when nothing is defined."""
+    values = values[~np.isnan(values)]
+    return round(float(values.mean()), 6) if values.size else None
+
+
+def _metrics(ape: np.ndarray, scaled: np.ndarray) -> Dict[str, Optional[float]]:
+    mape = _nanmean(ape)
+    return {
+        'mape': round(mape * 100, 4) if mape is not None else None,
+        'mase': _nanmean(scaled),
+    }
+
+
+def backtest_config(horizon: int, min_train: int) -> Dict:
+    """Settings that affect backtest results (part of every report)."""
+    return {
+        'horizon': horizon,
+        'min_train': min_train,
+        'holt_grid_points': HOLT_GRID_POINTS,
+        'holt_refine_rounds': HOLT_REFINE_ROUNDS,
+        'holt_refine_points': HOLT_REFINE_POINTS,
+    }
+
+
+def run_backtest(
+    Y,
+    labels: Sequence[str],
+    horizon: int = BACKTEST_HORIZON,
+    min_train: int = BACKTEST_MIN_TRAIN,
+    data_version: Optional[int] = None,
+    parallel: Optional[bool] = None
+) -> Dict:
+    """
+    Rolling-origin backtest of every series in ``Y``.
+
+    Args:
+        Y: (S, T) array-like of monthly values, one row per series
+        labels: Series names, one per row
+        horizon: Months forecast from each cutoff
+        min_train: Months in the first training window (at least 4, as
+                   the live forecaster needs)
+        data_version: Data snapshot version, recorded in the report
+        parallel: Force pooled (True) or inline (False) execution;
+                  by default pooled from BACKTEST_PARALLEL_MIN_FITS fits
+
+    Returns:
+        Report dict with meta, summary (per method), per_horizon (per
+        method and step) and per_series (per series and method) metrics
+    """
+    started = time.perf_counter()
+    Y = np.atleast_2d(np.asarray(Y, dtype=np.float64))
+    S, T = Y.shape
+    min_train = max(int(min_train), 4)
+    cutoffs = list(range(min_train, T))
+    config = backtest_config(horizon, min_train)
+
+    if parallel is None:
+        parallel = len(cutoffs) > 1 and S * len(cutoffs) >= BACKTEST_PARALLEL_MIN_FITS
+
+    if not cutoffs or S == 0:
+        results = []
+    elif parallel:
+        pool = _get_process_pool()
+        results = list(pool.map(
+            _backtest_cutoff, [Y] * len(cutoffs), cutoffs, [horizon] * len(cutoffs)
+        ))
+    else:
+        results = [_backtest_cutoff(Y, cutoff, horizon) for cutoff in cutoffs]
+
+    # Stack to (cutoffs, S, horizon); short tails at the end are NaN-padded
+    def stack(key: str) -> np.ndarray:
+        out = np.full((len(results), S, horizon), np.nan)
+        for i, result in enumerate(results):
+            out[i, :, :result[key].shape[1]] = result[key]
+        return out
+
+    errors = {
+        method: (stack(f'{method}_ape'), stack(f'{method}_scaled'))
+        for method in METHODS
+    }
+
+    summary = {method: _metrics(ape, scaled) for method, (ape, scaled) in errors.items()}
+    per_horizon = {
+        method: [
+            {'step': step + 1, **_metrics(ape[:, :, step], scaled[:, :, step])}
+            for step in range(horizon)
+        ]
+        for method, (ape, scaled) in errors.items()
+    }
+    per_series = [
+        {
+            'series': label,
+            **{
+                method: _metrics(ape[:, row], scaled[:, row])
+                for method, (ape, scaled) in errors.items()
+            }
+        }
+        for row, label in enumerate(labels)
+    ]
+
+    config_hash = hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()[:12]
+    return {
+        'meta': {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'data_version': data_version,
+            'config': config,
+            'config_hash': config_hash,
+            'n_series': S,
+            'n_months': T,
+            'n_cutoffs': len(cutoffs),
+            'parallel': bool(parallel),
+            'seconds': round(time.perf_counter() - started, 3),
+        },
+        'summary': summary,
+        'per_horizon': per_horizon,
+        'per_series': per_series,
+    }
+
+
+def backtest_series(matrix) -> Tuple[np.ndarray, List[str]]:
+    """
+    Build backtest input from a district x month matrix.
+
+    Returns:
+        Tuple of (Y with the State-wide row first, labels)
+    """
+    values = matrix.to_numpy(dtype=np.float64)
+    Y = np.vstack([values.sum(axis=0, keepdims=True), values])
+    labels = [STATEWIDE_LABEL] + [str(district) for district in matrix.index]
+    return Y, labels
+
+
+def compare_reports(baseline: Dict, current: Dict) -> Dict:
+    """
+    Compare two backtest reports metric by metric.
+
+    Returns:
+        Dict with comparable (same configuration hash) and per-method
+        baseline/current/delta for MAPE and MASE (negative delta = better)
+    """
+    comparison = {
+        'comparable': baseline['meta']['config_hash'] == current['meta']['config_hash'],
+        'methods': {},
+    }
+    for method in METHODS:
+        rows = {}
+        for metric in ('mape', 'mase'):
+            before = baseline['summary'].get(method, {}).get(metric)
+            after = current['summary'].get(method, {}).get(metric)
+            delta = round(after - before, 6) if before is not None and after is not None else None
+            rows[metric] = {'baseline': before, 'current': after, 'delta': delta}
+        comparison['methods'][method] = rows
+    return comparison
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Backtest the workload forecaster")
+    parser.add_argument("--horizon", type=int, default=BACKTEST_HORIZON,
+                        help="Months forecast from each cutoff")
+    parser.add_argument("--min-train", type=int, default=BACKTEST_MIN_TRAIN,
+                        help="Months in the first training window")
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    parser.add_argument("--baseline", help="Compare with a previously written report")
+    args = parser.parse_args(argv)
+
+    from src.data_loader import load_enrolment_data
+    from src.analytics.workload_forecasting import WorkloadForecaster
+
+    matrix = WorkloadForecaster(load_enrolment_data(), None).calculate_district_monthly_matrix()
+    Y, labels = backtest_series(matrix)
+    report = run_backtest(Y, labels, horizon=args.horizon, min_train=args.min_train)
+
+    meta = report['meta']
+    print(f"📊 Backtested {meta['n_series']} series over {meta['n_cutoffs']} cutoffs "
+          f"in {meta['seconds']}s (config {meta['config_hash']})")
+    for method, metrics in report['summary'].items():
+        print(f"   {method:15s} MAPE {metrics['mape']}%  MASE {metrics['mase']}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+    if args.baseline:
+        comparison = compare_reports(json.loads(Path(args.baseline).read_text()), report)
+        if not comparison['comparable']:
+            print("⚠️ Baseline was run with a different configuration")
+        for method, metrics in comparison['methods'].items():
+            for metric, row in metrics.items():
+                print(f"   {method:15s} {metric.upper()} {row['baseline']} → {row['current']} (Δ {row['delta']})")
+
+    shutdown_process_pool()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+Batched Change-Point Detection
+Finds mean shifts in many monthly series at once by binary segmentation.
+
+Logic:
+- Series are the rows of an (S, T) array; months without data are filled
+  from the nearest earlier (or, at the start, later) month
+- Every candidate split k of every row is scored against the segment it
+  lies in, using cumulative sums: gain = n_left * n_right / n *
+  (mean_right - mean_left)^2 / sigma^2, where sigma is the row's noise
+  level (MAD of month-to-month changes)
+- Each round adds the best split of every row whose gain exceeds
+  penalty * log(T), so the loop runs over rounds (at most max_changes),
+  never over series
+- Each accepted split is an event: the month the new level starts, the
+  mean before and after (over the adjacent segments) and the shift
+"""
+from typing import Optional
+
+import numpy as np
+
+from src.config import (
+    CHANGE_POINT_PENALTY, CHANGE_POINT_MIN_SEGMENT, CHANGE_POINT_MAX_CHANGES
+)
+
+# MAD -> standard deviation of a difference of two normal values
+_MAD_TO_SIGMA = 1.4826 / np.sqrt(2)
+
+
+def _fill_missing(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Fill invalid cells from the previous valid month (next one at the start)."""
+    S, T = values.shape
+    positions = np.broadcast_to(np.arange(T), (S, T))
+    previous = np.maximum.accumulate(np.where(valid, positions, -1), axis=1)
+    following = np.minimum.accumulate(np.where(valid, positions, T)[:, ::-1], axis=1)[:, ::-1]
+    source = np.where(previous >= 0, previous, np.minimum(following, T - 1))
+    return np.take_along_axis(values, source, axis=1)
+
+
+def _segment_bounds(boundary: np.ndarray):
+    """
+    Start of the segment before and end of the segment after each split.
+
+    Args:
+        boundary: (S, T + 1) bool, True where a segment starts (0 and T always)
+
+    Returns:
+        (S, T + 1) arrays: last boundary <= k - 1 and first boundary >= k + 1
+        for each position k
+    """
+    S, width = boundary.shape
+    positions = np.broadcast_to(np.arange(width), (S, width))
+    last = np.maximum.accumulate(np.where(boundary, positions, 0), axis=1)
+    first = np.minimum.accumulate(
+        np.where(boundary, positions, width - 1)[:, ::-1], axis=1
+    )[:, ::-1]
+    start = np.empty_like(last)
+    start[:, 1:] = last[:, :-1]
+    start[:, 0] = 0
+    end = np.empty_like(first)
+    end[:, :-1] = first[:, 1:]
+    end[:, -1] = width - 1
+    return start, end
+
+
+def _split_gain(cumulative: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """Gain of splitting [start, end) at every position k (unnormalized)."""
+    k = np.arange(cumulative.shape[1])
+    n_left = k - start
+    n_right = end - k
+    safe_left = np.maximum(n_left, 1)
+    safe_right = np.maximum(n_right, 1)
+    at = lambda index: np.take_along_axis(cumulative, index, axis=1)
+    mean_left = (cumulative - at(start)) / safe_left
+    mean_right = (at(end) - cumulative) / safe_right
+    return n_left * n_right / np.maximum(n_left + n_right, 1) * (mean_right - mean_left) ** 2
+
+
+def detect_change_points(
+    values: np.ndarray,
+    valid: Optional[np.ndarray] = None,
+    penalty: float = CHANGE_POINT_PENALTY,
+    min_segment: int = CHANGE_POINT_MIN_SEGMENT,
+    max_changes: int = CHANGE_POINT_MAX_CHANGES
+) -> dict:
+    """
+    Binary segmentation of every row of ``values``.
+
+    Args:
+        values: (S, T) series, one per row
+        valid: (S, T) bool, months that have data (default: all);
+               rows without any valid month get no events
+        penalty: Minimum gain per change, in units of sigma^2 * log(T)
+        min_segment: Minimum months on each side of a change
+        max_changes: Maximum changes per series
+
+    Returns:
+        Dict of (N,) event arrays: series (row), position (first month of
+        the new level), before, after, magnitude (after - before), score
+        (gain over the noise level)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    S, T = values.shape
+    empty = {
+        'series': np.empty(0, dtype=np.intp), 'position': np.empty(0, dtype=np.intp),
+        'before': np.empty(0), 'after': np.empty(0),
+        'magnitude': np.empty(0), 'score': np.empty(0),
+    }
+    if S == 0 or T < 2 * min_segment:
+        return empty
+
+    if valid is None:
+        valid = np.ones((S, T), dtype=bool)
+    has_data = valid.any(axis=1)
+    values = _fill_missing(values, valid)
+
+    # Robust noise level per series; flat series get a small floor
+    changes = np.diff(values, axis=1)
+    mad = np.median(np.abs(changes - np.median(changes, axis=1, keepdims=True)), axis=1)
+    scale = np.maximum(np.abs(values).mean(axis=1), 1e-9)
+    sigma2 = np.maximum(mad * _MAD_TO_SIGMA, 1e-3 * scale) ** 2
+
+    cumulative = np.concatenate([np.zeros((S, 1)), np.cumsum(values, axis=1)], axis=1)
+    boundary = np.zeros((S, T + 1), dtype=bool)
+    boundary[:, [0, T]] = True
+    threshold = penalty * np.log(T)
+    active = has_data.copy()
+
+    for _ in range(max_changes):
+        if not active.any():
+            break
+        start, end = _segment_bounds(boundary)
+        gain = _split_gain(cumulative, start, end) / sigma2[:, None]
+        k = np.arange(T + 1)
+        allowed = (k - start >= min_segment) & (end - k >= min_segment) & ~boundary
+        gain = np.where(allowed, gain, -np.inf)
+        best = np.argmax(gain, axis=1)
+        best_gain = gain[np.arange(S), best]
+        accept = active & (best_gain > threshold)
+        if not accept.any():
+            break
+        boundary[np.flatnonzero(accept), best[accept]] = True
+        active = accept
+
+    # Events from the final segmentation
+    series, position = np.nonzero(boundary[:, 1:T])
+    position += 1
+    if not len(series):
+        return empty
+    start, end = _segment_bounds(boundary)
+    s, e = start[series, position], end[series, position]
+    before = (cumulative[series, position] - cumulative[series, s]) / (position - s)
+    after = (cumulative[series, e] - cumulative[series, position]) / (e - position)
+    n_left, n_right = position - s, e - position
+    score = n_left * n_right / (n_left + n_right) * (after - before) ** 2 / sigma2[series]
+    return {
+        'series': series, 'position': position,
+        'before': before, 'after': after,
+        'magnitude': after - before, 'score': score,
+    }
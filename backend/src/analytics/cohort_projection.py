@@ -0,0 +1,191 @@
+"""
+Cohort-Aging Projection of Mandatory Biometric Updates
+Tracks monthly enrolment cohorts and projects when they reach the
+mandatory update ages (AGE_MANDATORY_UPDATE_5 / AGE_MANDATORY_UPDATE_15).
+
+Logic:
+- Each month's enrolments per age bucket (0-5, 5-17) form a cohort
+- Ages within a bucket are assumed uniform (in months), so a cohort's
+  members reach a milestone age spread evenly over a window of future
+  months: e.g. 0-5 enrolments turn 5 over the next 1..60 months and
+  turn 15 over months 121..180; 5-17 enrolments under 15 turn 15 over
+  months 1..120
+- Projection is a convolution of the (unit x month) cohort array with
+  these box kernels, computed from cumulative sums as two shifted
+  lookups per kernel, for all units at once
+- Units are districts or (district, pincode) pairs
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    AGE_MANDATORY_UPDATE_5, AGE_MANDATORY_UPDATE_15, COHORT_HORIZON_MONTHS
+)
+
+# Enrolment age buckets: column -> [min age, max age) in years
+BUCKET_AGE_RANGES = {
+    'age_0_5': (0, AGE_MANDATORY_UPDATE_5),
+    'age_5_17': (AGE_MANDATORY_UPDATE_5, 18),
+}
+
+# Projected series -> milestone age in years
+MILESTONES = {
+    'age_5_updates': AGE_MANDATORY_UPDATE_5,
+    'age_15_updates': AGE_MANDATORY_UPDATE_15,
+}
+
+LEVEL_KEYS = {
+    'district': ['district'],
+    'pincode': ['district', 'pincode'],
+}
+
+
+def update_lags(age_range: Tuple[int, int], milestone: int) -> Optional[Tuple[int, int, float]]:
+    """
+    Months after enrolment in which a bucket's members reach a milestone.
+
+    Returns:
+        (first lag, last lag, share of the cohort per lag month), or None
+        if nobody in the bucket is below the milestone age
+    """
+    low, high = age_range[0] * 12, age_range[1] * 12
+    target = milestone * 12
+    if low >= target:
+        return None
+    # Members aged a (months) reach the milestone target - a months later
+    return target - min(high, target) + 1, target - low, 1.0 / (high - low)
+
+
+def _box_convolve(cumulative: np.ndarray, t: np.ndarray, first: int, last: int) -> np.ndarray:
+    """
+    Sum of cohorts enrolled between months t - last and t - first.
+
+    Args:
+        cumulative: (U, T + 1) cumulative cohort sizes, starting at 0
+        t: Output month positions
+    """
+    T = cumulative.shape[1] - 1
+    upper = np.clip(t - first + 1, 0, T)
+    lower = np.clip(t - last, 0, T)
+    return cumulative[:, upper] - cumulative[:, lower]
+
+
+class CohortProjector:
+    """
+    Projects month-by-month mandatory biometric updates from enrolment
+    cohorts at district or pincode level.
+    """
+
+    def __init__(self, enrolment_df: pd.DataFrame):
+        self.enrolment_df = enrolment_df
+
+    def build_cohort_array(
+        self,
+        level: str = 'district'
+    ) -> Tuple[pd.DataFrame, pd.PeriodIndex, Dict[str, np.ndarray]]:
+        """
+        Enrolments per unit and calendar month, one array per age bucket.
+
+        Months are contiguous from the first to the last month in the data
+        (months without enrolments are 0).
+
+        Returns:
+            Tuple of (units DataFrame with the level's key columns,
+            months, dict of bucket column -> (U, T) array)
+        """
+        keys = LEVEL_KEYS[level]
+        df = self.enrolment_df
+        if df.empty:
+            return pd.DataFrame(columns=keys), pd.PeriodIndex([], freq='M'), {
+                column: np.zeros((0, 0)) for column in BUCKET_AGE_RANGES
+            }
+
+        month_number = (df['date'].dt.year * 12 + df['date'].dt.month).to_numpy()
+        first_month = month_number.min()
+        month_idx = month_number - first_month
+        T = int(month_idx.max()) + 1
+
+        unit_codes, units = pd.MultiIndex.from_frame(df[keys]).factorize()
+        U = len(units)
+        flat = unit_codes * T + month_idx
+
+        cohorts = {
+            column: np.bincount(
+                flat, weights=df[column].fillna(0).to_numpy(dtype=np.float64),
+                minlength=U * T
+            ).reshape(U, T)
+            for column in BUCKET_AGE_RANGES
+        }
+        start = pd.Period(year=(first_month - 1) // 12, month=(first_month - 1) % 12 + 1, freq='M')
+        months = pd.period_range(start, periods=T, freq='M')
+        return units.set_names(keys).to_frame(index=False), months, cohorts
+
+    def project(
+        self,
+        level: str = 'district',
+        horizon_months: int = COHORT_HORIZON_MONTHS
+    ) -> Tuple[pd.DataFrame, pd.PeriodIndex, Dict[str, np.ndarray], int]:
+        """
+        Project mandatory updates per unit and month.
+
+        The timeline covers the months in the data (updates due from
+        cohorts enrolled earlier in the window) followed by
+        ``horizon_months`` future months.
+
+        Returns:
+            Tuple of (units DataFrame, timeline months, dict of milestone
+            series name -> (U, T + horizon) array, index of the first
+            future month)
+        """
+        units, months, cohorts = self.build_cohort_array(level)
+        U, T = len(units), len(months)
+        timeline = (
+            pd.period_range(months[0], periods=T + horizon_months, freq='M')
+            if T else pd.PeriodIndex([], freq='M')
+        )
+        t = np.arange(len(timeline))
+
+        cumulative = {
+            column: np.concatenate([np.zeros((U, 1)), np.cumsum(array, axis=1)], axis=1)
+            for column, array in cohorts.items()
+        }
+
+        projected = {}
+        for name, milestone in MILESTONES.items():
+            total = np.zeros((U, len(timeline)))
+            for column, age_range in BUCKET_AGE_RANGES.items():
+                lags = update_lags(age_range, milestone)
+                if lags is None:
+                    continue
+                first, last, share = lags
+                total += share * _box_convolve(cumulative[column], t, first, last)
+            projected[name] = total
+
+        return units, timeline, projected, T
+
+    def project_frame(
+        self,
+        level: str = 'district',
+        horizon_months: int = COHORT_HORIZON_MONTHS,
+        future_only: bool = True
+    ) -> pd.DataFrame:
+        """
+        Long DataFrame of projected updates: one row per unit and month.
+
+        Returns:
+            DataFrame with the level's key columns, month, age_5_updates,
+            age_15_updates, total_updates, is_forecast
+        """
+        units, timeline, projected, first_future = self.project(level, horizon_months)
+        start = first_future if future_only else 0
+        n_months = len(timeline) - start
+
+        frame = units.loc[units.index.repeat(n_months)].reset_index(drop=True)
+        frame['month'] = np.tile(timeline[start:].to_timestamp(), len(units))
+        for name, values in projected.items():
+            frame[name] = values[:, start:].ravel()
+        frame['total_updates'] = sum(projected[name][:, start:].ravel() for name in MILESTONES)
+        frame['is_forecast'] = np.tile(np.arange(start, len(timeline)) >= first_future, len(units))
+        return frame
@@ -0,0 +1,202 @@
+"""
+District Health History
+Monthly data quality health scores per district, maintained incrementally.
+
+Logic:
+- Each month's enrolment, demographic and biometric rows are run through
+  the default anomaly detectors on their own; the month's health score of
+  a district is 100 minus the severity penalties of its anomalies
+  (see anomaly_detection.health_scores)
+- Detectors that score a month against a pincode's whole series
+  (SERIES_DETECTORS) run once over all data on every sync instead, and
+  their anomalies count in the month of their date; they are skipped
+  when no month changed
+- Scores are held as a (months x districts) array, NaN where a district
+  has no enrolments in a month
+- Every month keeps a fingerprint of its rows (row hashes of all three
+  datasets). On a data reload only months whose fingerprint changed (or
+  that are new) are re-detected, so appending a month costs one month of
+  detection
+"""
+import hashlib
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.anomaly_detection import (
+    ANOMALY_DETECTORS, AnomalyDetector, SEVERITIES, health_scores, health_status
+)
+
+DATASETS = ('enrolment', 'biometric', 'demographic')
+
+# Default detectors that need every month of the data (see module docstring)
+SERIES_DETECTORS = ('update_scan',)
+
+
+def _month_slices(df: pd.DataFrame) -> Dict[int, np.ndarray]:
+    """Row positions of every month (year * 12 + month) of a frame."""
+    numbers = (df['date'].dt.year * 12 + df['date'].dt.month).to_numpy()
+    order = np.argsort(numbers, kind='stable')
+    months, starts = np.unique(numbers[order], return_index=True)
+    return dict(zip(months.tolist(), np.split(order, starts[1:])))
+
+
+class HealthHistory:
+    """
+    Incrementally maintained month x district health scores.
+
+    Arrays (shape (months, districts)): scores, present (district has
+    enrolments), and counts with a trailing severity axis (months,
+    districts, len(SEVERITIES)); local_counts are the month-local part of
+    counts that is kept for unchanged months.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.version: Optional[int] = None
+        self.months: List[int] = []
+        self.districts = pd.Index([])
+        self.fingerprints: Dict[int, str] = {}
+        self.local_counts = np.zeros((0, 0, len(SEVERITIES)), dtype=np.int64)
+        self.counts = np.zeros((0, 0, len(SEVERITIES)), dtype=np.int64)
+        self.present = np.zeros((0, 0), dtype=bool)
+        self.scores = np.zeros((0, 0))
+        self.last_recomputed_months = 0
+
+    def sync(self, version: int, frames: Dict[str, pd.DataFrame]):
+        """Update from a data snapshot unless it (or a newer one) is applied."""
+        with self._lock:
+            if self.version is not None and version <= self.version:
+                return
+            self._update(frames)
+            self.version = version
+
+    def _update(self, frames: Dict[str, pd.DataFrame]):
+        slices = {dataset: _month_slices(frames[dataset]) for dataset in DATASETS}
+        row_hashes = {
+            dataset: pd.util.hash_pandas_object(frames[dataset], index=False).to_numpy()
+            for dataset in DATASETS
+        }
+        months = sorted(set().union(*(slices[dataset] for dataset in DATASETS)))
+
+        # Districts keep their column; new ones are appended
+        seen = pd.Index(frames['enrolment']['district'].unique())
+        districts = self.districts.append(seen.difference(self.districts))
+        M, D = len(months), len(districts)
+
+        local_counts = np.zeros((M, D, len(SEVERITIES)), dtype=np.int64)
+        present = np.zeros((M, D), dtype=bool)
+        local_detectors = [
+            name for name, spec in ANOMALY_DETECTORS.items()
+            if spec.default and name not in SERIES_DETECTORS
+        ]
+        old_position = {month: t for t, month in enumerate(self.months)}
+        old_D = len(self.districts)
+        empty = np.empty(0, dtype=np.intp)
+        fingerprints = {}
+        recomputed = 0
+        for t, month in enumerate(months):
+            rows = {dataset: slices[dataset].get(month, empty) for dataset in DATASETS}
+            fingerprint = hashlib.sha1(b''.join(
+                row_hashes[dataset][rows[dataset]].tobytes() for dataset in DATASETS
+            )).hexdigest()
+            fingerprints[month] = fingerprint
+
+            if self.fingerprints.get(month) == fingerprint:
+                old = old_position[month]
+                local_counts[t, :old_D] = self.local_counts[old]
+                present[t, :old_D] = self.present[old]
+                continue
+
+            month_frames = {dataset: frames[dataset].iloc[rows[dataset]] for dataset in DATASETS}
+            detector = AnomalyDetector(
+                month_frames['enrolment'], month_frames['biometric'], month_frames['demographic']
+            )
+            local_counts[t] = detector.detect_table(rules=local_detectors).district_severity_counts(districts)
+            present[t] = districts.isin(month_frames['enrolment']['district'].unique())
+            recomputed += 1
+
+        if fingerprints == self.fingerprints:
+            series_counts = self.counts - self.local_counts
+        else:
+            series_counts = self._series_counts(frames, months, districts)
+        counts = local_counts + series_counts
+        scores = np.full((M, D), np.nan)
+        scores[present] = health_scores(counts[present])
+
+        self.months = months
+        self.districts = districts
+        self.fingerprints = fingerprints
+        self.local_counts = local_counts
+        self.counts = counts
+        self.present = present
+        self.scores = scores
+        self.last_recomputed_months = recomputed
+
+    @staticmethod
+    def _series_counts(frames: Dict[str, pd.DataFrame], months: List[int], districts: pd.Index) -> np.ndarray:
+        """(months, districts, severities) counts of SERIES_DETECTORS anomalies by their month."""
+        counts = np.zeros((len(months), len(districts), len(SEVERITIES)), dtype=np.int64)
+        detectors = [name for name in SERIES_DETECTORS if ANOMALY_DETECTORS[name].default]
+        if not detectors or not months:
+            return counts
+        table = AnomalyDetector(
+            frames['enrolment'], frames['biometric'], frames['demographic']
+        ).detect_table(rules=detectors)
+        dates = pd.DatetimeIndex(table.date)
+        t = pd.Index(months).get_indexer(dates.year * 12 + dates.month)
+        d = districts.get_indexer(table.district)
+        known = (t >= 0) & (d >= 0)
+        np.add.at(counts, (t[known], d[known], table.severity[known]), 1)
+        return counts
+
+    def history(
+        self,
+        districts: Optional[List[str]] = None,
+        start_month: Optional[str] = None,
+        end_month: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Monthly health of the selected districts.
+
+        Returns:
+            DataFrame with district, month (Timestamp), health_score, status,
+            critical, warning and info counts; months in which a district
+            has no enrolments are left out
+        """
+        with self._lock:
+            months = np.asarray(self.months, dtype=np.int64)
+            rows = np.ones(len(months), dtype=bool)
+            if start_month:
+                period = pd.Period(start_month, freq='M')
+                rows &= months >= period.year * 12 + period.month
+            if end_month:
+                period = pd.Period(end_month, freq='M')
+                rows &= months <= period.year * 12 + period.month
+            if districts:
+                columns = self.districts.get_indexer(districts)
+                columns = columns[columns >= 0]
+            else:
+                columns = np.arange(len(self.districts))
+            rows = np.flatnonzero(rows)
+            scores = self.scores[np.ix_(rows, columns)]
+            counts = self.counts[np.ix_(rows, columns)]
+            names = self.districts[columns]
+
+        t, d = np.nonzero(~np.isnan(scores))
+        numbers = months[rows][t]
+        return pd.DataFrame({
+            'district': names[d],
+            'month': pd.to_datetime({'year': (numbers - 1) // 12, 'month': (numbers - 1) % 12 + 1, 'day': 1}),
+            'health_score': scores[t, d],
+            'status': health_status(scores[t, d]),
+            'critical': counts[t, d, 0],
+            'warning': counts[t, d, 1],
+            'info': counts[t, d, 2],
+        }).sort_values(['district', 'month'], kind='stable').reset_index(drop=True)
+
+
+# Shared by all requests; synced to the newest data snapshot
+health_history = HealthHistory()
@@ -0,0 +1,287 @@
+"""
+Vectorized Holt Linear-Trend Smoothing
+Fits additive-trend exponential smoothing to many series at once in NumPy.
+
+Logic:
+- Series are rows of a 2-D array (series x time), all the same length
+- For fixed smoothing parameters the one-step errors are affine in the
+  initial level and trend, so the best initial state (statsmodels'
+  'estimated' initialization) is a 2x2 least-squares solve per series
+- Smoothing parameters are chosen by a coarse grid search followed by a
+  few zoomed-in grid refinements, minimizing the sum of squared errors
+  under the same objective and constraint (trend <= level smoothing) as
+  statsmodels' ExponentialSmoothing.fit
+- The time loop is in Python, everything per step is array arithmetic
+  over series x parameter candidates
+- Prediction intervals come from residual-bootstrap simulation, again
+  array arithmetic over series x paths per forecast step
+"""
+from typing import Dict, Tuple
+
+import numpy as np
+
+from src.config import (
+    HOLT_GRID_POINTS, HOLT_REFINE_ROUNDS, HOLT_REFINE_POINTS,
+    HOLT_SIMULATION_PATHS, HOLT_SIMULATION_SEED, HOLT_SIMULATION_CHUNK_CELLS
+)
+
+
+def _error_sums(
+    Y: np.ndarray,
+    alpha: np.ndarray,
+    beta: np.ndarray
+) -> Tuple[np.ndarray, ...]:
+    """
+    Run the Holt error recursion for every series x candidate pair.
+
+    The errors are split as e = c + l0 * p + b0 * q, where c comes from
+    the data with a zero initial state and p/q are the responses to a unit
+    initial level/trend. Only the sums needed for least squares are kept.
+
+    Args:
+        Y: (S, T) series
+        alpha, beta: (S, G) or (1, G) smoothing parameter candidates
+
+    Returns:
+        Tuple of (S, G) arrays: sum(cc), sum(pc), sum(qc), sum(pp), sum(pq), sum(qq)
+    """
+    S, T = Y.shape
+    shape = np.broadcast_shapes((S, 1), alpha.shape)
+    ab = alpha * beta
+
+    # States for the data (c), unit initial level (p) and unit initial trend (q)
+    lc = np.zeros(shape)
+    bc = np.zeros(shape)
+    lp = np.ones(alpha.shape)
+    bp = np.zeros(alpha.shape)
+    lq = np.zeros(alpha.shape)
+    bq = np.ones(alpha.shape)
+
+    scc = np.zeros(shape)
+    spc = np.zeros(shape)
+    sqc = np.zeros(shape)
+    spp = np.zeros(alpha.shape)
+    spq = np.zeros(alpha.shape)
+    sqq = np.zeros(alpha.shape)
+
+    for t in range(T):
+        y = Y[:, t:t + 1]
+
+        pred_c = lc + bc
+        ec = y - pred_c
+        lc = pred_c + alpha * ec
+        bc = bc + ab * ec
+
+        # Unit responses carry no data, their error is minus the prediction
+        pred_p = lp + bp
+        ep = -pred_p
+        lp = pred_p + alpha * ep
+        bp = bp + ab * ep
+
+        pred_q = lq + bq
+        eq = -pred_q
+        lq = pred_q + alpha * eq
+        bq = bq + ab * eq
+
+        scc += ec * ec
+        spc += ep * ec
+        sqc += eq * ec
+        spp += ep * ep
+        spq += ep * eq
+        sqq += eq * eq
+
+    return scc, spc, sqc, spp, spq, sqq
+
+
+def _best_initial_state(
+    Y: np.ndarray,
+    alpha: np.ndarray,
+    beta: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Least-squares initial level/trend and resulting SSE for each candidate.
+
+    Returns:
+        Tuple of (S, G) arrays: (initial_level, initial_trend, sse)
+    """
+    scc, spc, sqc, spp, spq, sqq = _error_sums(Y, alpha, beta)
+
+    # Solve [spp spq; spq sqq] [l0 b0]' = -[spc sqc]'
+    det = spp * sqq - spq * spq
+    scale = np.maximum(spp * sqq, 1e-12)
+    solvable = np.abs(det) > 1e-10 * scale
+    safe_det = np.where(solvable, det, 1.0)
+    l0 = np.where(solvable, (-spc * sqq + sqc * spq) / safe_det, 0.0)
+    b0 = np.where(solvable, (-sqc * spp + spc * spq) / safe_det, 0.0)
+
+    # Degenerate system: fall back to the first observation and first difference
+    if not solvable.all():
+        first = np.broadcast_to(Y[:, :1], l0.shape)
+        slope = np.broadcast_to(Y[:, 1:2] - Y[:, :1], b0.shape)
+        l0 = np.where(solvable, l0, first)
+        b0 = np.where(solvable, b0, slope)
+
+    sse = (
+        scc + 2 * l0 * spc + 2 * b0 * sqc
+        + l0 * l0 * spp + 2 * l0 * b0 * spq + b0 * b0 * sqq
+    )
+    return l0, b0, np.maximum(sse, 0.0)
+
+
+def _run_recursion(
+    Y: np.ndarray,
+    alpha: np.ndarray,
+    beta: np.ndarray,
+    l0: np.ndarray,
+    b0: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Run Holt smoothing with one parameter set per series.
+
+    Returns:
+        Tuple of (fitted (S, T), final level (S,), final trend (S,))
+    """
+    level, trend = l0.copy(), b0.copy()
+    fitted = np.empty_like(Y)
+    for t in range(Y.shape[1]):
+        pred = level + trend
+        fitted[:, t] = pred
+        error = Y[:, t] - pred
+        level = pred + alpha * error
+        trend = trend + alpha * beta * error
+    return fitted, level, trend
+
+
+def fit_holt_linear(Y) -> Dict[str, np.ndarray]:
+    """
+    Fit additive-trend exponential smoothing to every row of ``Y``.
+
+    Args:
+        Y: (S, T) array-like of complete series (no NaN), T >= 2
+
+    Returns:
+        Dict of arrays: smoothing_level, smoothing_trend, initial_level,
+        initial_trend, level, trend, sse (all shape (S,)) and fitted (S, T)
+    """
+    Y = np.atleast_2d(np.asarray(Y, dtype=np.float64))
+    S = Y.shape[0]
+    rows = np.arange(S)
+
+    # Coarse grid over 0 <= beta <= alpha <= 1 (shared by all series)
+    grid = np.linspace(0.0, 1.0, HOLT_GRID_POINTS)
+    alpha = np.repeat(grid, HOLT_GRID_POINTS)
+    beta = np.tile(grid, HOLT_GRID_POINTS)
+    valid = beta <= alpha
+    alpha, beta = alpha[valid][None, :], beta[valid][None, :]
+    _, _, sse = _best_initial_state(Y, alpha, beta)
+    best = np.argmin(sse, axis=1)
+    best_alpha, best_beta = alpha[0, best], beta[0, best]
+
+    # Zoom in around each series' best point
+    step = grid[1] - grid[0]
+    offsets = np.linspace(-1.0, 1.0, HOLT_REFINE_POINTS)
+    d_alpha = np.repeat(offsets, HOLT_REFINE_POINTS)[None, :]
+    d_beta = np.tile(offsets, HOLT_REFINE_POINTS)[None, :]
+    for _ in range(HOLT_REFINE_ROUNDS):
+        cand_alpha = np.clip(best_alpha[:, None] + step * d_alpha, 0.0, 1.0)
+        cand_beta = np.clip(best_beta[:, None] + step * d_beta, 0.0, cand_alpha)
+        _, _, sse = _best_initial_state(Y, cand_alpha, cand_beta)
+        best = np.argmin(sse, axis=1)
+        best_alpha = cand_alpha[rows, best]
+        best_beta = cand_beta[rows, best]
+        step /= (HOLT_REFINE_POINTS - 1) / 2
+
+    l0, b0, sse = _best_initial_state(Y, best_alpha[:, None], best_beta[:, None])
+    l0, b0, sse = l0[:, 0], b0[:, 0], sse[:, 0]
+    fitted, level, trend = _run_recursion(Y, best_alpha, best_beta, l0, b0)
+
+    return {
+        'smoothing_level': best_alpha,
+        'smoothing_trend': best_beta,
+        'initial_level': l0,
+        'initial_trend': b0,
+        'level': level,
+        'trend': trend,
+        'sse': sse,
+        'fitted': fitted,
+    }
+
+
+def forecast_holt_linear(fit: Dict[str, np.ndarray], periods: int) -> np.ndarray:
+    """
+    Forecast ``periods`` steps ahead from a fit: level + h * trend.
+
+    Returns:
+        (S, periods) array of forecasts
+    """
+    horizon = np.arange(1, periods + 1)
+    return fit['level'][:, None] + fit['trend'][:, None] * horizon[None, :]
+
+
+def simulate_holt_quantiles(
+    Y,
+    fit: Dict[str, np.ndarray],
+    periods: int,
+    quantiles,
+    n_paths: int = HOLT_SIMULATION_PATHS,
+    seed: int = HOLT_SIMULATION_SEED
+) -> np.ndarray:
+    """
+    Prediction quantiles from residual-bootstrap simulation.
+
+    Every series gets ``n_paths`` future paths: each step adds a one-step
+    residual drawn (with replacement) from that series' own fit and
+    updates level and trend with it, as the model would. Draws for all
+    series x paths are made at once; only the horizon is looped over.
+    Series are processed in chunks of HOLT_SIMULATION_CHUNK_CELLS / n_paths
+    to bound memory. A fixed seed keeps bands stable between requests.
+
+    Args:
+        Y: (S, T) series the fit was made on
+        fit: fit_holt_linear() result, or arrays with the same keys for
+             smoothing_level, smoothing_trend, initial_level, initial_trend
+        periods: Steps to simulate
+        quantiles: Sequence of quantiles in [0, 1]
+        n_paths: Simulated paths per series
+        seed: Random seed
+
+    Returns:
+        (S, len(quantiles), periods) array of simulated quantiles
+    """
+    Y = np.atleast_2d(np.asarray(Y, dtype=np.float64))
+    S, T = Y.shape
+    quantiles = np.asarray(quantiles, dtype=np.float64)
+    alpha = np.asarray(fit['smoothing_level'], dtype=np.float64)
+    beta = np.asarray(fit['smoothing_trend'], dtype=np.float64)
+    fitted, level, trend = _run_recursion(
+        Y, alpha, beta,
+        np.asarray(fit['initial_level'], dtype=np.float64),
+        np.asarray(fit['initial_trend'], dtype=np.float64)
+    )
+    residuals = Y - fitted
+
+    rng = np.random.default_rng(seed)
+    out = np.empty((S, len(quantiles), periods))
+    chunk = max(1, HOLT_SIMULATION_CHUNK_CELLS // max(n_paths, 1))
+    for start in range(0, S, chunk):
+        rows = slice(start, start + chunk)
+        n = residuals[rows].shape[0]
+        draws = residuals[rows][
+            np.arange(n)[:, None, None],
+            rng.integers(0, T, size=(n, n_paths, periods))
+        ]
+        a = alpha[rows, None]
+        ab = a * beta[rows, None]
+        lvl = np.repeat(level[rows, None], n_paths, axis=1)
+        trd = np.repeat(trend[rows, None], n_paths, axis=1)
+
+        paths = np.empty((n, n_paths, periods))
+        for h in range(periods):
+            pred = lvl + trd
+            error = draws[:, :, h]
+            paths[:, :, h] = pred + error
+            lvl = pred + a * error
+            trd = trd + ab * error
+
+        out[rows] = np.moveaxis(np.quantile(paths, quantiles, axis=1), 0, 1)
+    return out
@@ -7,16 +7,24 @@ Logic:
 - High Ratio (> 0.7) = High Inward Migration (Urban Hub)
 - Medium Ratio (0.4 - 0.7) = Moderate Migration
 - Low Ratio (< 0.4) = Stable Rural Area
+
+The district intensity table is computed once per analyzer and cached;
+summary, choropleth and ranking views are projections of it. Monthly
+enrolments and demographic updates are likewise kept as cumulative
+(district x month) arrays, so any trailing-window ratio is two
+subtractions per cell, and change points are detected on all districts'
+monthly ratio series in one batched pass.
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from src.config import (
     MIGRATION_THRESHOLD_HIGH, 
     MIGRATION_THRESHOLD_MEDIUM,
     TELANGANA_DISTRICTS
 )
+from src.analytics.ranking import top_k_indices
 
 
 class MigrationAnalyzer:
@@ -32,14 +40,32 @@ class MigrationAnalyzer:
     ):
         self.enrolment_df = enrolment_df
         self.demographic_df = demographic_df
+        self._intensity = None
+        self._monthly = None
     
-    def calculate_migration_intensity(self) -> pd.DataFrame:
+    def calculate_migration_intensity(self, sort: bool = True) -> pd.DataFrame:
         """
         Calculate migration intensity score for each district.
         
+        The table is computed on first use and cached; callers must not
+        modify the returned DataFrame.
+        
+        Args:
+            sort: Sort by migration ratio (highest first). Ranked queries
+                  pass False and select the rows they need instead.
+        
         Returns:
             DataFrame with district-level migration metrics
         """
+        if self._intensity is None:
+            self._intensity = self._build_intensity_table()
+        
+        if sort:
+            return self._intensity.sort_values('migration_ratio', ascending=False)
+        return self._intensity
+    
+    def _build_intensity_table(self) -> pd.DataFrame:
+        """Aggregate, merge and classify the district intensity table (unsorted)."""
         # Aggregate enrolments by district
         enrol_by_district = self.enrolment_df.groupby('district').agg({
             'total_enrolments': 'sum'
@@ -65,9 +91,7 @@ class MigrationAnalyzer:
         )
         
         # Classify migration intensity
-        result['migration_category'] = result['migration_ratio'].apply(
-            self._classify_migration
-        )
+        result['migration_category'] = self._classify_migration(result['migration_ratio'].to_numpy())
         
         # Normalize to 0-100 scale for visualization using percentile rank
         # This ensures better distribution across the color spectrum
@@ -79,16 +103,72 @@ class MigrationAnalyzer:
         else:
             result['migration_intensity'] = 0
         
-        return result.sort_values('migration_ratio', ascending=False)
+        return result
     
-    def _classify_migration(self, ratio: float) -> str:
-        """Classify migration intensity based on ratio."""
-        if ratio >= MIGRATION_THRESHOLD_HIGH:
-            return "High Migration (Urban Hub)"
-        elif ratio >= MIGRATION_THRESHOLD_MEDIUM:
-            return "Moderate Migration"
-        else:
-            return "Stable (Rural)"
+    def _classify_migration(self, ratio: np.ndarray) -> np.ndarray:
+        """Classify migration intensity based on ratio (vectorized)."""
+        return np.select(
+            [ratio >= MIGRATION_THRESHOLD_HIGH, ratio >= MIGRATION_THRESHOLD_MEDIUM],
+            ["High Migration (Urban Hub)", "Moderate Migration"],
+            default="Stable (Rural)"
+        )
+    
+    def _monthly_cumulative(self) -> Dict:
+        """
+        Cumulative monthly enrolments and demographic updates per district.
+        
+        Months are contiguous from the first to the last month in either
+        dataset, indexed by year * 12 + month (no Period conversion).
+        
+        Returns:
+            Dict with districts (Index), first_month (int), enrolments and
+            demo_updates ((D, T + 1) cumulative sums starting at 0) and
+            present ((T,) months that have rows in either dataset)
+        """
+        if self._monthly is not None:
+            return self._monthly
+        
+        frames = [
+            (self.enrolment_df, 'total_enrolments'),
+            (self.demographic_df, 'total_demo_updates'),
+        ]
+        month_numbers = [
+            (df['date'].dt.year * 12 + df['date'].dt.month).to_numpy() for df, _ in frames
+        ]
+        all_months = np.concatenate(month_numbers)
+        districts = pd.Index(
+            pd.concat([df['district'] for df, _ in frames]).unique()
+        ).sort_values()
+        D = len(districts)
+        first_month = int(all_months.min()) if len(all_months) else 0
+        T = int(all_months.max()) - first_month + 1 if len(all_months) else 0
+        
+        sums = []
+        for (df, column), months in zip(frames, month_numbers):
+            flat = districts.get_indexer(df['district']) * T + (months - first_month)
+            monthly = np.bincount(
+                flat, weights=df[column].fillna(0).to_numpy(dtype=np.float64),
+                minlength=D * T
+            ).reshape(D, T)
+            sums.append(np.concatenate([np.zeros((D, 1)), np.cumsum(monthly, axis=1)], axis=1))
+        
+        present = np.zeros(T, dtype=bool)
+        present[all_months - first_month] = True
+        
+        self._monthly = {
+            'districts': districts,
+            'first_month': first_month,
+            'enrolments': sums[0],
+            'demo_updates': sums[1],
+            'present': present,
+        }
+        return self._monthly
+    
+    @staticmethod
+    def _month_periods(first_month: int, positions: np.ndarray) -> pd.PeriodIndex:
+        """Monthly periods for month positions counted from first_month."""
+        numbers = first_month + positions - 1
+        return pd.PeriodIndex.from_fields(year=numbers // 12, month=numbers % 12 + 1, freq='M')
     
     def get_migration_trends(self) -> pd.DataFrame:
         """
@@ -97,66 +177,131 @@ class MigrationAnalyzer:
         Returns:
             DataFrame with monthly migration metrics
         """
-        # Monthly enrolments
-        monthly_enrol = self.enrolment_df.groupby(
-            self.enrolment_df['date'].dt.to_period('M')
-        ).agg({'total_enrolments': 'sum'}).reset_index()
-        monthly_enrol.columns = ['month', 'enrolments']
-        
-        # Monthly demographic updates
-        monthly_demo = self.demographic_df.groupby(
-            self.demographic_df['date'].dt.to_period('M')
-        ).agg({'total_demo_updates': 'sum'}).reset_index()
-        monthly_demo.columns = ['month', 'demo_updates']
+        monthly = self._monthly_cumulative()
+        positions = np.flatnonzero(monthly['present'])
         
-        # Merge
-        trends = monthly_enrol.merge(monthly_demo, on='month', how='outer').fillna(0)
+        # State-wide monthly totals from the cumulative arrays
+        enrolments = np.diff(monthly['enrolments'].sum(axis=0))[positions]
+        demo_updates = np.diff(monthly['demo_updates'].sum(axis=0))[positions]
+        month = self._month_periods(monthly['first_month'], positions)
         
-        # Calculate monthly ratio
-        trends['migration_ratio'] = np.where(
-            trends['enrolments'] > 0,
-            trends['demo_updates'] / trends['enrolments'],
-            0
+        return pd.DataFrame({
+            'month': month,
+            'enrolments': enrolments,
+            'demo_updates': demo_updates,
+            'migration_ratio': np.where(
+                enrolments > 0, demo_updates / np.where(enrolments > 0, enrolments, 1), 0
+            ),
+            'date': month.to_timestamp(),
+        })
+    
+    def rolling_migration_ratio(
+        self,
+        window: int,
+        districts: Optional[List[str]] = None
+    ) -> Tuple[pd.Index, pd.PeriodIndex, np.ndarray]:
+        """
+        Per-district migration ratio over a trailing window of months.
+        
+        Each month's ratio is demographic updates / enrolments summed over
+        that month and the ``window - 1`` before it (fewer at the start of
+        the data); 0 where there were no enrolments.
+        
+        Args:
+            window: Trailing window length in months
+            districts: Districts to include (default: all)
+        
+        Returns:
+            Tuple of (districts, months, (D, T) ratio array)
+        """
+        monthly = self._monthly_cumulative()
+        rows = np.arange(len(monthly['districts']))
+        if districts:
+            rows = monthly['districts'].get_indexer(districts)
+            rows = rows[rows >= 0]
+        
+        T = len(monthly['present'])
+        end = np.arange(1, T + 1)
+        start = np.maximum(end - window, 0)
+        enrolments = monthly['enrolments'][rows][:, end] - monthly['enrolments'][rows][:, start]
+        demo_updates = monthly['demo_updates'][rows][:, end] - monthly['demo_updates'][rows][:, start]
+        ratio = np.where(
+            enrolments > 0, demo_updates / np.where(enrolments > 0, enrolments, 1), 0.0
         )
         
-        trends['date'] = trends['month'].dt.to_timestamp()
+        months = self._month_periods(monthly['first_month'], np.arange(T))
+        return monthly['districts'][rows], months, ratio
+    
+    def detect_change_points(self) -> pd.DataFrame:
+        """
+        Shifts in each district's monthly migration ratio.
         
-        return trends.sort_values('date')
+        All districts are segmented together (see change_points); months
+        without enrolments carry the previous month's ratio.
+        
+        Returns:
+            DataFrame with district, month (first month of the new level),
+            ratio_before, ratio_after, magnitude, direction and score,
+            largest shift first
+        """
+        from src.analytics.change_points import detect_change_points
+        
+        monthly = self._monthly_cumulative()
+        enrolments = np.diff(monthly['enrolments'], axis=1)
+        demo_updates = np.diff(monthly['demo_updates'], axis=1)
+        valid = enrolments > 0
+        ratio = np.where(valid, demo_updates / np.where(valid, enrolments, 1), 0.0)
+        
+        events = detect_change_points(ratio, valid)
+        magnitude = events['magnitude']
+        changes = pd.DataFrame({
+            'district': monthly['districts'][events['series']],
+            'month': self._month_periods(monthly['first_month'], events['position']).to_timestamp(),
+            'ratio_before': events['before'].round(4),
+            'ratio_after': events['after'].round(4),
+            'magnitude': magnitude.round(4),
+            'direction': np.where(magnitude > 0, 'increase', 'decrease'),
+            'score': events['score'].round(2),
+        })
+        order = np.argsort(-np.abs(magnitude), kind='stable')
+        return changes.iloc[order].reset_index(drop=True)
     
     def get_high_migration_districts(self, top_n: int = 10) -> pd.DataFrame:
         """Get districts with highest migration intensity."""
-        intensity = self.calculate_migration_intensity()
-        return intensity.head(top_n)
+        intensity = self.calculate_migration_intensity(sort=False)
+        return intensity.iloc[top_k_indices(intensity['migration_ratio'].to_numpy(), top_n)]
     
     def get_low_migration_districts(self, top_n: int = 10) -> pd.DataFrame:
         """Get districts with lowest migration (most stable)."""
-        intensity = self.calculate_migration_intensity()
-        return intensity.tail(top_n).sort_values('migration_ratio')
+        intensity = self.calculate_migration_intensity(sort=False)
+        return intensity.iloc[
+            top_k_indices(intensity['migration_ratio'].to_numpy(), top_n, largest=False)
+        ]
     
     def get_migration_summary(self) -> Dict:
         """Get summary statistics for migration analysis."""
-        intensity = self.calculate_migration_intensity()
+        intensity = self.calculate_migration_intensity(sort=False)
+        ratio = intensity['migration_ratio'].to_numpy()
         
-        high_migration = intensity[
-            intensity['migration_ratio'] >= MIGRATION_THRESHOLD_HIGH
-        ]
-        moderate_migration = intensity[
-            (intensity['migration_ratio'] >= MIGRATION_THRESHOLD_MEDIUM) &
-            (intensity['migration_ratio'] < MIGRATION_THRESHOLD_HIGH)
-        ]
-        low_migration = intensity[
-            intensity['migration_ratio'] < MIGRATION_THRESHOLD_MEDIUM
-        ]
+        high_count = int(np.count_nonzero(ratio >= MIGRATION_THRESHOLD_HIGH))
+        moderate_count = int(np.count_nonzero(
+            (ratio >= MIGRATION_THRESHOLD_MEDIUM) & (ratio < MIGRATION_THRESHOLD_HIGH)
+        ))
+        low_count = int(np.count_nonzero(ratio < MIGRATION_THRESHOLD_MEDIUM))
+        
+        # High-migration districts are the top of the ranking, highest first
+        high_migration = intensity['district'].to_numpy()[top_k_indices(ratio, high_count)]
+        top = top_k_indices(ratio, 1)
         
         return {
             'total_districts': len(intensity),
-            'high_migration_count': len(high_migration),
-            'moderate_migration_count': len(moderate_migration),
-            'low_migration_count': len(low_migration),
+            'high_migration_count': high_count,
+            'moderate_migration_count': moderate_count,
+            'low_migration_count': low_count,
             'avg_migration_ratio': round(intensity['migration_ratio'].mean(), 2),
-            'max_migration_district': intensity.iloc[0]['district'] if len(intensity) > 0 else 'N/A',
-            'max_migration_ratio': round(intensity.iloc[0]['migration_ratio'], 2) if len(intensity) > 0 else 0,
-            'high_migration_districts': high_migration['district'].tolist(),
+            'max_migration_district': intensity['district'].iloc[top[0]] if len(top) else 'N/A',
+            'max_migration_ratio': round(ratio[top[0]], 2) if len(top) else 0,
+            'high_migration_districts': high_migration.tolist(),
         }
     
     def prepare_choropleth_data(self) -> pd.DataFrame:
@@ -166,7 +311,7 @@ class MigrationAnalyzer:
         Returns:
             DataFrame with district names and migration intensity scores
         """
-        intensity = self.calculate_migration_intensity()
+        intensity = self.calculate_migration_intensity(sort=False)
         
         # Ensure all districts are present
         all_districts = pd.DataFrame({'district': TELANGANA_DISTRICTS})
@@ -0,0 +1,279 @@
+"""
+Inter-District Migration Flow Estimation
+Estimates origin -> destination address-change flows as sparse matrices.
+
+The data has no origin for an address change, so flows are estimated per
+month from demographic update and enrolment deltas:
+- Expected updates of a unit = enrolments x the state-wide update ratio
+  of that month
+- Units with more updates than expected receive the excess (inflow),
+  units with fewer send the shortfall (outflow); both sum to the same total
+- Each destination's inflow is split over the top MIGRATION_FLOW_TOP_K
+  origins by outflow, with origins in the destination's own district
+  weighted by MIGRATION_FLOW_LOCAL_AFFINITY (moves are mostly local)
+
+Storage and queries:
+- One scipy CSR matrix per month (at most TOP_K x destinations non-zeros)
+  plus a running total, so memory is proportional to the non-zero flows
+- Rows are origins, columns destinations: outflows are a CSR row slice,
+  inflows a column slice of a cached CSC copy
+- On a data reload only months whose monthly totals changed are
+  re-estimated; the total is patched with (new - old)
+"""
+import hashlib
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from src.config import MIGRATION_FLOW_TOP_K, MIGRATION_FLOW_LOCAL_AFFINITY
+from src.analytics.ranking import top_k_indices
+
+LEVEL_KEYS = {
+    'district': ['district'],
+    'pincode': ['district', 'pincode'],
+}
+
+
+def estimate_month_flows(
+    enrolments: np.ndarray,
+    demo_updates: np.ndarray,
+    groups: np.ndarray,
+    top_k: int = MIGRATION_FLOW_TOP_K,
+    affinity: float = MIGRATION_FLOW_LOCAL_AFFINITY
+) -> sparse.csr_matrix:
+    """
+    Estimate one month's origin x destination flows.
+
+    Args:
+        enrolments, demo_updates: (U,) monthly totals per unit
+        groups: (U,) district code of each unit (for local affinity)
+
+    Returns:
+        (U, U) CSR matrix, rows = origins, columns = destinations
+    """
+    U = len(enrolments)
+    total_enrolments = enrolments.sum()
+    if total_enrolments <= 0:
+        return sparse.csr_matrix((U, U))
+
+    expected = enrolments * (demo_updates.sum() / total_enrolments)
+    inflow = np.maximum(demo_updates - expected, 0.0)
+    outflow = np.maximum(expected - demo_updates, 0.0)
+    origins = np.flatnonzero(outflow > 0)
+    destinations = np.flatnonzero(inflow > 0)
+    if not len(origins) or not len(destinations):
+        return sparse.csr_matrix((U, U))
+
+    global_top = origins[top_k_indices(outflow[origins], top_k)]
+
+    # Origins and destinations grouped by district
+    origin_groups = pd.Series(origins).groupby(groups[origins]).apply(np.asarray)
+    dest_groups = pd.Series(destinations).groupby(groups[destinations]).apply(np.asarray)
+
+    rows, cols, values = [], [], []
+    for group, dests in dest_groups.items():
+        local = origin_groups.get(group, np.empty(0, dtype=np.intp))
+        # The best origins under affinity weighting are among these
+        candidates = np.union1d(local[top_k_indices(outflow[local], top_k)], global_top)
+        weights = outflow[candidates] * np.where(groups[candidates] == group, affinity, 1.0)
+        best = top_k_indices(weights, top_k)
+        candidates, weights = candidates[best], weights[best]
+        share = weights / weights.sum()
+
+        rows.append(np.repeat(candidates, len(dests)))
+        cols.append(np.tile(dests, len(candidates)))
+        values.append(np.outer(share, inflow[dests]).ravel())
+
+    return sparse.csr_matrix(
+        (np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(U, U)
+    )
+
+
+def _resized(matrix: sparse.csr_matrix, size: int) -> sparse.csr_matrix:
+    """Pad a matrix to (size, size) for units added since it was built."""
+    if matrix.shape == (size, size):
+        return matrix
+    matrix = matrix.copy()
+    matrix.resize((size, size))
+    return matrix
+
+
+class MigrationFlowMatrix:
+    """
+    Monthly sparse flow matrices for one level (district or pincode),
+    maintained incrementally across data reloads.
+    """
+
+    def __init__(self, level: str = 'district'):
+        self.level = level
+        self.version: Optional[int] = None
+        self.units = pd.DataFrame(columns=LEVEL_KEYS[level])
+        self._unit_index = pd.MultiIndex.from_arrays(
+            [[]] * len(LEVEL_KEYS[level]), names=LEVEL_KEYS[level]
+        )
+        self.months: Dict[int, Tuple[str, sparse.csr_matrix]] = {}
+        self.total = sparse.csr_matrix((0, 0))
+        self._total_csc: Optional[sparse.csc_matrix] = None
+        self.last_recomputed_months = 0
+        self._lock = threading.RLock()
+
+    def sync(self, version: int, enrolment_df: pd.DataFrame, demographic_df: pd.DataFrame):
+        """Update from a data snapshot unless it (or a newer one) is applied."""
+        with self._lock:
+            if self.version is not None and version <= self.version:
+                return
+            self._update(enrolment_df, demographic_df)
+            self.version = version
+
+    def _update(self, enrolment_df: pd.DataFrame, demographic_df: pd.DataFrame):
+        keys = LEVEL_KEYS[self.level]
+        frames = [(enrolment_df, 'total_enrolments'), (demographic_df, 'total_demo_updates')]
+        unit_keys = [_unit_keys(df, keys) for df, _ in frames]
+
+        # Units keep their row/column; new ones are appended
+        seen = pd.MultiIndex.from_frame(pd.concat(unit_keys).drop_duplicates())
+        unit_index = self._unit_index.append(seen.difference(self._unit_index)).set_names(keys)
+        U = len(unit_index)
+        groups = pd.factorize(unit_index.get_level_values('district'))[0]
+
+        # Monthly totals per unit as (months, U) arrays
+        month_numbers = [
+            (df['date'].dt.year * 12 + df['date'].dt.month).to_numpy() for df, _ in frames
+        ]
+        all_months = np.unique(np.concatenate(month_numbers))
+        monthly = []
+        for (df, column), numbers, df_keys in zip(frames, month_numbers, unit_keys):
+            flat = np.searchsorted(all_months, numbers) * U + unit_index.get_indexer(
+                pd.MultiIndex.from_frame(df_keys)
+            )
+            monthly.append(np.bincount(
+                flat, weights=df[column].fillna(0).to_numpy(dtype=np.float64),
+                minlength=len(all_months) * U
+            ).reshape(len(all_months), U))
+
+        total = _resized(self.total, U)
+        months = {}
+        recomputed = 0
+        for t, month in enumerate(all_months):
+            enrolments, demo_updates = monthly[0][t], monthly[1][t]
+            fingerprint = _month_fingerprint(enrolments, demo_updates)
+            previous = self.months.get(int(month))
+            if previous is not None and previous[0] == fingerprint:
+                months[int(month)] = (fingerprint, _resized(previous[1], U))
+                continue
+            flows = estimate_month_flows(enrolments, demo_updates, groups)
+            if previous is not None:
+                total = total - _resized(previous[1], U)
+            total = total + flows
+            months[int(month)] = (fingerprint, flows)
+            recomputed += 1
+
+        # Months no longer in the data
+        for month in set(self.months) - set(months):
+            total = total - _resized(self.months[month][1], U)
+
+        total.eliminate_zeros()
+        self._unit_index = unit_index
+        self.units = unit_index.to_frame(index=False)
+        self.months = months
+        self.total = total.tocsr()
+        self._total_csc = None
+        self.last_recomputed_months = recomputed
+
+    def matrix(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> sparse.csr_matrix:
+        """Flows summed over the months in a date range (default: all)."""
+        with self._lock:
+            if not start_date and not end_date:
+                return self.total
+            lo = _month_number(start_date) if start_date else -np.inf
+            hi = _month_number(end_date) if end_date else np.inf
+            U = len(self.units)
+            result = sparse.csr_matrix((U, U))
+            for month, (_, flows) in self.months.items():
+                if lo <= month <= hi:
+                    result = result + _resized(flows, U)
+            return result
+
+    def unit_position(self, district: str, pincode: Optional[str] = None) -> int:
+        """Row/column of a unit, -1 if unknown."""
+        key = (district,) if self.level == 'district' else (district, str(pincode))
+        return int(self._unit_index.get_indexer([key])[0])
+
+    def neighbours(
+        self,
+        position: int,
+        direction: str,
+        k: int,
+        matrix: Optional[sparse.csr_matrix] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k origins (direction='in') or destinations ('out') of one unit.
+
+        Returns:
+            Tuple of (unit positions, flows), largest flow first
+        """
+        if matrix is None:
+            with self._lock:
+                matrix = self.total
+                if direction == 'in':
+                    if self._total_csc is None:
+                        self._total_csc = matrix.tocsc()
+                    matrix = self._total_csc
+        elif direction == 'in':
+            matrix = matrix.tocsc()
+
+        # Row of a CSR (outflows) or column of a CSC (inflows)
+        lo, hi = matrix.indptr[position], matrix.indptr[position + 1]
+        others, flows = matrix.indices[lo:hi], matrix.data[lo:hi]
+        best = top_k_indices(flows, k)
+        return others[best], flows[best]
+
+    def top_flows(
+        self,
+        k: int,
+        matrix: Optional[sparse.csr_matrix] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Largest flows overall.
+
+        Returns:
+            Tuple of (origin positions, destination positions, flows)
+        """
+        matrix = self.total if matrix is None else matrix
+        best = top_k_indices(matrix.data, k)
+        origins = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+        return origins[best], matrix.indices[best], matrix.data[best]
+
+
+def _unit_keys(df: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    """Unit key columns of a frame; pincodes as strings."""
+    frame = df[keys]
+    if 'pincode' in keys:
+        frame = frame.astype({'pincode': str})
+    return frame
+
+
+def _month_fingerprint(enrolments: np.ndarray, demo_updates: np.ndarray) -> str:
+    """
+    Hash of a month's inputs. Trailing zeros are dropped so that units
+    appended later (zero in older months) do not change the hash.
+    """
+    size = max(len(np.trim_zeros(enrolments, 'b')), len(np.trim_zeros(demo_updates, 'b')))
+    return hashlib.sha1(enrolments[:size].tobytes() + demo_updates[:size].tobytes()).hexdigest()
+
+
+def _month_number(date: str) -> int:
+    timestamp = pd.Timestamp(date)
+    return timestamp.year * 12 + timestamp.month
+
+
+# Shared by all requests; synced to the newest data snapshot
+flow_matrices = {level: MigrationFlowMatrix(level) for level in LEVEL_KEYS}
@@ -0,0 +1,237 @@
+"""
+Multivariate Anomaly Scoring
+Robust Mahalanobis distance over a (unit x month) feature matrix.
+
+Logic:
+- One row per district (or pincode) and month with FEATURES: enrolment
+  volume, age mix, demographic and biometric update volumes and the
+  migration ratio; volumes and the ratio are log-scaled
+- Features are standardized by their median and MAD, then location and
+  covariance are estimated robustly: a few concentration steps keep the
+  MAHALANOBIS_SUPPORT_FRACTION of rows with the smallest distances
+  (partial selection), followed by one reweighting step
+- Every covariance is a Ledoit-Wolf shrinkage estimate, so it stays well
+  conditioned when features are strongly correlated or rows are few
+- Rows are scored in chunks of matrix products; a row is flagged when its
+  squared distance exceeds the chi-square quantile of
+  1 - MAHALANOBIS_P_VALUE, and the feature contributing most to the
+  distance is reported
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from src.config import (
+    MAHALANOBIS_SUPPORT_FRACTION, MAHALANOBIS_P_VALUE, MAHALANOBIS_CHUNK_ROWS
+)
+
+FEATURES = (
+    'log_enrolments',
+    'share_age_0_5',
+    'share_age_5_17',
+    'log_demo_updates',
+    'log_bio_updates',
+    'log_migration_ratio',
+)
+
+LEVEL_KEYS = {
+    'district': ['district'],
+    'pincode': ['district', 'pincode'],
+}
+
+
+def build_feature_matrix(
+    enrolment_df: pd.DataFrame,
+    demographic_df: pd.DataFrame,
+    biometric_df: pd.DataFrame,
+    level: str = 'district'
+) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Monthly features per unit.
+
+    Returns:
+        Tuple of (DataFrame with the level's key columns and month,
+        (rows, len(FEATURES)) feature array)
+    """
+    keys = LEVEL_KEYS[level]
+
+    def monthly(df: pd.DataFrame, columns: Dict[str, str]) -> pd.DataFrame:
+        frame = df[keys + list(columns)].copy()
+        if 'pincode' in keys:
+            frame['pincode'] = frame['pincode'].astype(str)
+        frame['month'] = df['date'].dt.to_period('M').dt.to_timestamp()
+        return frame.groupby(keys + ['month'])[list(columns)].sum().rename(columns=columns)
+
+    totals = pd.concat([
+        monthly(enrolment_df, {
+            'total_enrolments': 'enrolments', 'age_0_5': 'age_0_5', 'age_5_17': 'age_5_17',
+        }),
+        monthly(demographic_df, {'total_demo_updates': 'demo_updates'}),
+        monthly(biometric_df, {'total_bio_updates': 'bio_updates'}),
+    ], axis=1).fillna(0)
+
+    enrolments = totals['enrolments'].to_numpy(dtype=np.float64)
+    demo_updates = totals['demo_updates'].to_numpy(dtype=np.float64)
+    has_enrolments = enrolments > 0
+    safe = np.where(has_enrolments, enrolments, 1)
+
+    X = np.column_stack([
+        np.log1p(enrolments),
+        np.where(has_enrolments, totals['age_0_5'].to_numpy(dtype=np.float64) / safe, 0.0),
+        np.where(has_enrolments, totals['age_5_17'].to_numpy(dtype=np.float64) / safe, 0.0),
+        np.log1p(demo_updates),
+        np.log1p(totals['bio_updates'].to_numpy(dtype=np.float64)),
+        np.log1p(np.where(has_enrolments, demo_updates / safe, 0.0)),
+    ])
+    return totals.index.to_frame(index=False), X
+
+
+def ledoit_wolf(X: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Ledoit-Wolf shrinkage covariance of centred rows.
+
+    Returns:
+        Tuple of (covariance, shrinkage intensity in [0, 1])
+    """
+    n, p = X.shape
+    X2 = X ** 2
+    sample = X.T @ X / n
+    variances = X2.sum(axis=0) / n
+    mu = variances.sum() / p
+
+    delta_ = (sample ** 2).sum()
+    beta_ = (X2.T @ X2).sum() / n
+    beta = (beta_ - delta_) / (p * n)
+    delta = (delta_ - 2 * mu * variances.sum() + p * mu ** 2) / p
+    beta = min(beta, delta)
+    shrinkage = 0.0 if beta <= 0 else beta / delta
+
+    covariance = (1 - shrinkage) * sample
+    covariance.flat[::p + 1] += shrinkage * mu
+    return covariance, shrinkage
+
+
+class RobustMahalanobis:
+    """
+    Robust location and shrinkage covariance of a feature matrix, and
+    batched Mahalanobis distances against them.
+    """
+
+    def __init__(
+        self,
+        support_fraction: float = MAHALANOBIS_SUPPORT_FRACTION,
+        steps: int = 3
+    ):
+        self.support_fraction = support_fraction
+        self.steps = steps
+
+    def _estimate(self, Z: np.ndarray, rows: np.ndarray):
+        location = Z[rows].mean(axis=0)
+        covariance, shrinkage = ledoit_wolf(Z[rows] - location)
+        return location, covariance, shrinkage
+
+    def fit(self, X: np.ndarray) -> 'RobustMahalanobis':
+        """Estimate location and covariance from the rows of ``X``."""
+        X = np.asarray(X, dtype=np.float64)
+        n, p = X.shape
+
+        # Median/MAD standardization (unit scale where a feature is constant)
+        self.center = np.median(X, axis=0)
+        mad = np.median(np.abs(X - self.center), axis=0) * 1.4826
+        std = X.std(axis=0)
+        self.scale = np.where(mad > 0, mad, np.where(std > 0, std, 1.0))
+        Z = (X - self.center) / self.scale
+
+        # Concentration steps on the rows with the smallest distances
+        h = min(n, max(int(self.support_fraction * n), p + 1))
+        rows = np.arange(n)
+        for _ in range(self.steps):
+            location, covariance, _ = self._estimate(Z, rows)
+            distances = self._squared_distances(Z, location, np.linalg.pinv(covariance))
+            rows = np.argpartition(distances, h - 1)[:h] if h < n else rows
+
+        # Consistency correction, then one reweighting step
+        location, covariance, shrinkage = self._estimate(Z, rows)
+        distances = self._squared_distances(Z, location, np.linalg.pinv(covariance))
+        correction = np.median(distances) / stats.chi2.ppf(0.5, p)
+        if correction > 0:
+            covariance = covariance * correction
+            distances = distances / correction
+        inliers = np.flatnonzero(distances <= stats.chi2.ppf(0.975, p))
+        if len(inliers) > p:
+            location, covariance, shrinkage = self._estimate(Z, inliers)
+
+        self.location = location
+        self.covariance = covariance
+        self.precision = np.linalg.pinv(covariance)
+        self.shrinkage = shrinkage
+        self.n_features = p
+        return self
+
+    @staticmethod
+    def _squared_distances(Z: np.ndarray, location: np.ndarray, precision: np.ndarray) -> np.ndarray:
+        diff = Z - location
+        return np.einsum('ij,ij->i', diff @ precision, diff)
+
+    def score(
+        self,
+        X: np.ndarray,
+        chunk_rows: int = MAHALANOBIS_CHUNK_ROWS
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Squared robust Mahalanobis distance of every row, in chunks.
+
+        Returns:
+            Tuple of ((n,) squared distances, (n, p) per-feature
+            contributions, which sum to the squared distance)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        distances = np.empty(len(X))
+        contributions = np.empty(X.shape)
+        for start in range(0, len(X), chunk_rows):
+            diff = (X[start:start + chunk_rows] - self.center) / self.scale - self.location
+            weighted = diff @ self.precision
+            contributions[start:start + chunk_rows] = diff * weighted
+            distances[start:start + chunk_rows] = contributions[start:start + chunk_rows].sum(axis=1)
+        return distances, contributions
+
+
+def score_units(
+    enrolment_df: pd.DataFrame,
+    demographic_df: pd.DataFrame,
+    biometric_df: pd.DataFrame,
+    level: str = 'district'
+) -> Tuple[pd.DataFrame, Optional[RobustMahalanobis]]:
+    """
+    Fit the robust model and score every unit-month.
+
+    Returns:
+        Tuple of (DataFrame with the level's keys, month, FEATURES,
+        distance, p_value and top_feature, largest distance first;
+        fitted model, None with too few rows to fit)
+    """
+    units, X = build_feature_matrix(enrolment_df, demographic_df, biometric_df, level)
+    scored = units.copy()
+    for i, name in enumerate(FEATURES):
+        scored[name] = X[:, i]
+    if len(X) <= len(FEATURES):
+        scored['distance'] = np.zeros(len(X))
+        scored['p_value'] = np.ones(len(X))
+        scored['top_feature'] = ''
+        return scored, None
+
+    model = RobustMahalanobis().fit(X)
+    distances, contributions = model.score(X)
+    distances = np.maximum(distances, 0)
+    scored['distance'] = np.sqrt(distances)
+    scored['p_value'] = stats.chi2.sf(distances, len(FEATURES))
+    scored['top_feature'] = np.asarray(FEATURES)[np.argmax(contributions, axis=1)]
+    order = np.argsort(-distances, kind='stable')
+    return scored.iloc[order].reset_index(drop=True), model
+
+
+def flagged(scored: pd.DataFrame, p_value: float = MAHALANOBIS_P_VALUE) -> pd.DataFrame:
+    """Rows whose p-value is below ``p_value``."""
+    return scored[scored['p_value'] < p_value]
@@ -0,0 +1,94 @@
+"""
+Ranking Helpers
+Top-k / bottom-k selection and cursor pagination over metric arrays.
+
+Logic:
+- np.argpartition finds the k best rows in O(n), only those k are sorted
+- Ties are broken by row position so pages are stable across requests
+- Cursors are opaque tokens holding the next offset and the data version,
+  so a cursor issued before a data reload is rejected instead of skipping
+  or repeating rows
+"""
+import base64
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def top_k_indices(values, k: int, largest: bool = True) -> np.ndarray:
+    """
+    Get the positions of the k largest (or smallest) values, in rank order.
+
+    Args:
+        values: 1-D array-like of numbers (NaN ranks last)
+        k: Number of positions to return
+        largest: True for top-k, False for bottom-k
+
+    Returns:
+        Integer array of at most k positions into ``values``
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    k = min(max(int(k), 0), n)
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+
+    # Rank ascending on keys; NaN goes to the end either way
+    keys = -values if largest else values.copy()
+    keys[np.isnan(keys)] = np.inf
+
+    if k < n:
+        kth = keys[np.argpartition(keys, k - 1)[k - 1]]
+        # Everything up to the k-th value (including ties) is a candidate
+        candidates = np.flatnonzero(keys <= kth)
+    else:
+        candidates = np.arange(n)
+
+    order = np.lexsort((candidates, keys[candidates]))[:k]
+    return candidates[order]
+
+
+def page_indices(
+    values,
+    limit: int,
+    offset: int = 0,
+    largest: bool = True
+) -> Tuple[np.ndarray, Optional[int]]:
+    """
+    Get one page of ranked positions.
+
+    Returns:
+        Tuple of (positions for this page, next offset or None if last page)
+    """
+    end = offset + limit
+    positions = top_k_indices(values, end, largest=largest)[offset:]
+    next_offset = end if end < len(values) else None
+    return positions, next_offset
+
+
+def encode_cursor(offset: int, version: int) -> str:
+    """Encode a page offset and data version as an opaque cursor."""
+    raw = f"{version}:{offset}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], version: int) -> int:
+    """
+    Decode a cursor back into an offset.
+
+    Raises:
+        ValueError: if the cursor is malformed or from another data version
+    """
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_version, offset = base64.urlsafe_b64decode(padded).decode().split(":")
+        cursor_version, offset = int(cursor_version), int(offset)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Malformed cursor")
+    if cursor_version != version:
+        raise ValueError("Cursor expired: data has been reloaded")
+    if offset < 0:
+        raise ValueError("Malformed cursor")
+    return offset
@@ -0,0 +1,189 @@
+"""
+What-If Scenario Engine
+Evaluates a grid of threshold / assumption settings in one vectorized pass.
+
+Logic:
+- ScenarioAggregates reduces the data once to per-district arrays
+  (migration ratio, volume z-score, age bucket totals), the state-wide
+  daily z-scores and the anomaly counts of rules that no scenario
+  parameter affects
+- Every scenario parameter becomes an (N, 1) column and every district
+  metric a (1, D) row, so each rule is one broadcast comparison over
+  scenarios x districts followed by a sum
+- The same rules as the live modules are applied: migration categories
+  (MigrationAnalyzer), volume and temporal z-score anomalies and the
+  health score penalties (AnomalyDetector), and the fraction-based
+  mandatory update projection (WorkloadForecaster)
+"""
+from itertools import product
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    MIGRATION_THRESHOLD_HIGH, MIGRATION_THRESHOLD_MEDIUM,
+    ANOMALY_STD_THRESHOLD, AGE_5_UPDATE_FRACTION, AGE_15_UPDATE_FRACTION,
+    SCENARIO_MAX_GRID
+)
+
+# Scenario parameter -> current setting
+SCENARIO_PARAMETERS = {
+    'migration_threshold_high': MIGRATION_THRESHOLD_HIGH,
+    'migration_threshold_medium': MIGRATION_THRESHOLD_MEDIUM,
+    'anomaly_std_threshold': ANOMALY_STD_THRESHOLD,
+    'age_5_update_fraction': AGE_5_UPDATE_FRACTION,
+    'age_15_update_fraction': AGE_15_UPDATE_FRACTION,
+}
+
+
+class ScenarioAggregates:
+    """
+    Per-district arrays that scenarios are evaluated against.
+    Built once per data snapshot and filter.
+    """
+
+    def __init__(
+        self,
+        enrolment_df: pd.DataFrame,
+        demographic_df: pd.DataFrame,
+        biometric_df: pd.DataFrame
+    ):
+        # Imported here: the detector module is only needed for the
+        # scenario-independent rules
+        from src.analytics.anomaly_detection import AnomalyDetector, SEVERITY_ORDER
+
+        district_enrol = enrolment_df.groupby('district').agg({
+            'total_enrolments': 'sum',
+            'age_0_5': 'sum',
+            'age_5_17': 'sum',
+        })
+        self.districts = district_enrol.index.to_numpy()
+        totals = district_enrol['total_enrolments'].to_numpy(dtype=np.float64)
+        self.age_0_5 = district_enrol['age_0_5'].to_numpy(dtype=np.float64)
+        self.age_5_17 = district_enrol['age_5_17'].to_numpy(dtype=np.float64)
+
+        # Migration ratio for districts with enrolments or demographic updates
+        demo = demographic_df.groupby('district')['total_demo_updates'].sum()
+        migration = pd.concat([district_enrol['total_enrolments'], demo], axis=1).fillna(0)
+        enrolments = migration['total_enrolments'].to_numpy(dtype=np.float64)
+        self.migration_ratio = np.where(
+            enrolments > 0,
+            migration['total_demo_updates'].to_numpy(dtype=np.float64) / np.where(enrolments > 0, enrolments, 1),
+            0.0
+        )
+
+        detector = AnomalyDetector(enrolment_df, biometric_df, demographic_df)
+
+        # Volume and state-wide daily z-scores, as computed by the live rules
+        _, volume_z = detector.volume_z_scores()
+        self.volume_z = volume_z if volume_z is not None else np.zeros_like(totals)
+        _, _, temporal_z, valid = detector.temporal_z_scores()
+        self.temporal_z = temporal_z[valid] if temporal_z is not None else np.empty(0)
+
+        # Default rules that no scenario parameter affects
+        table = detector.detect_table(skip_rules=['volume', 'temporal'])
+        position = pd.Index(self.districts).get_indexer(table.district)
+        known = position >= 0
+        self.base_counts = {}
+        self.base_total = {}
+        for severity, code in SEVERITY_ORDER.items():
+            rows = table.severity == code
+            self.base_total[severity.lower()] = int(rows.sum())
+            self.base_counts[severity.lower()] = np.bincount(
+                position[rows & known], minlength=len(self.districts)
+            ).astype(np.float64)
+
+
+def build_grid(grid: Dict[str, Sequence[float]]) -> Dict[str, np.ndarray]:
+    """
+    Cartesian product of parameter values; missing parameters keep their
+    current setting.
+
+    Raises:
+        ValueError: on unknown parameters or a grid above SCENARIO_MAX_GRID
+    """
+    unknown = set(grid) - set(SCENARIO_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown scenario parameters: {', '.join(sorted(unknown))}")
+
+    axes = [
+        list(grid.get(name) or [default])
+        for name, default in SCENARIO_PARAMETERS.items()
+    ]
+    size = int(np.prod([len(values) for values in axes]))
+    if size > SCENARIO_MAX_GRID:
+        raise ValueError(f"Grid has {size} scenarios, the limit is {SCENARIO_MAX_GRID}")
+
+    columns = np.array(list(product(*axes)), dtype=np.float64).reshape(size, len(axes))
+    return {name: columns[:, i] for i, name in enumerate(SCENARIO_PARAMETERS)}
+
+
+def evaluate_scenarios(
+    aggregates: ScenarioAggregates,
+    grid: Dict[str, Sequence[float]]
+) -> List[Dict]:
+    """
+    Evaluate every scenario in the grid.
+
+    Returns:
+        Sensitivity table: one dict per scenario with its parameters and
+        migration counts, anomaly counts, health scores and projected
+        workload
+    """
+    from src.analytics.anomaly_detection import health_scores
+    
+    params = build_grid(grid)
+    col = {name: values[:, None] for name, values in params.items()}
+
+    # Migration classification (same precedence as _classify_migration)
+    ratio = aggregates.migration_ratio[None, :]
+    high = ratio >= col['migration_threshold_high']
+    moderate = ~high & (ratio >= col['migration_threshold_medium'])
+    high_count = high.sum(axis=1)
+    moderate_count = moderate.sum(axis=1)
+    stable_count = ratio.shape[1] - high_count - moderate_count
+
+    # Anomalies: volume flags per district, temporal flags state-wide
+    volume = np.abs(aggregates.volume_z)[None, :] > col['anomaly_std_threshold']
+    temporal_count = (aggregates.temporal_z[None, :] < -col['anomaly_std_threshold']).sum(axis=1)
+    counts = np.stack(np.broadcast_arrays(
+        aggregates.base_counts['critical'][None, :],
+        aggregates.base_counts['warning'][None, :] + volume,
+        aggregates.base_counts['info'][None, :],
+    ), axis=-1)
+    health = health_scores(counts)
+    volume_count = volume.sum(axis=1)
+
+    # Projected workload (district values rounded as in the forecaster)
+    age_5 = np.round(col['age_5_update_fraction'] * aggregates.age_0_5[None, :]).sum(axis=1)
+    age_15 = np.round(col['age_15_update_fraction'] * aggregates.age_5_17[None, :]).sum(axis=1)
+
+    has_districts = health.shape[1] > 0
+    metrics = {
+        'high_migration_count': high_count,
+        'moderate_migration_count': moderate_count,
+        'stable_count': stable_count,
+        'volume_anomalies': volume_count,
+        'temporal_anomalies': temporal_count,
+        'critical_count': np.full(len(health), aggregates.base_total['critical']),
+        'warning_count': aggregates.base_total['warning'] + volume_count + temporal_count,
+        'info_count': np.full(len(health), aggregates.base_total['info']),
+        'avg_health_score': health.mean(axis=1) if has_districts else np.full(len(health), 100.0),
+        'critical_health_districts': (health < 50).sum(axis=1),
+        'age_5_total': age_5,
+        'age_15_total': age_15,
+        'total_projected_updates': age_5 + age_15,
+    }
+    metrics['total_anomalies'] = (
+        metrics['critical_count'] + metrics['warning_count'] + metrics['info_count']
+    )
+
+    rows = []
+    for i in range(len(health)):
+        row = {name: float(values[i]) for name, values in params.items()}
+        for name, values in metrics.items():
+            value = values[i]
+            row[name] = round(float(value), 1) if name == 'avg_health_score' else int(value)
+        rows.append(row)
+    return rows
@@ -0,0 +1,323 @@
+"""
+Streaming Anomaly Detection
+Online EWMA detector over monthly district totals, persisted to disk.
+
+Logic:
+- One series per dataset and district: monthly enrolments, demographic
+  updates and biometric updates (STREAM_SERIES)
+- Each series keeps an exponentially weighted mean and variance
+  (STREAMING_EWMA_ALPHA). A month is flagged when it lies more than
+  STREAMING_Z_THRESHOLD EWMA standard deviations from the mean, once the
+  series has STREAMING_WARMUP_MONTHS months of history
+- Only closed months are ingested: the latest month in the data is still
+  being filled, so it waits until a later month appears. Finding the new
+  rows is one date comparison per row of each frame (the frames are not
+  sorted by date); month numbers, aggregation and the EWMA steps only
+  touch the new rows. Later corrections to already ingested months are
+  not replayed
+- State and alerts are saved to STREAMING_ANOMALY_STATE after every
+  ingest and loaded on first use, so a restart resumes from the watermark
+  instead of replaying the history. Names are stored as fixed-width
+  strings and loaded without pickle. Saved state from different settings
+  (or in another format) is discarded
+"""
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    STREAMING_ANOMALY_STATE, STREAMING_EWMA_ALPHA,
+    STREAMING_Z_THRESHOLD, STREAMING_WARMUP_MONTHS
+)
+
+# Snapshot dataset -> monthly total column
+STREAM_SERIES = {
+    'enrolment': 'total_enrolments',
+    'demographic': 'total_demo_updates',
+    'biometric': 'total_bio_updates',
+}
+
+ALERT_COLUMNS = ['dataset', 'district', 'month', 'value', 'expected', 'z_score']
+
+
+def _month_number(dates: pd.Series) -> np.ndarray:
+    return (dates.dt.year * 12 + dates.dt.month).to_numpy()
+
+
+def month_period(number: int) -> pd.Period:
+    """Monthly period for a year * 12 + month number."""
+    return pd.Period(year=(number - 1) // 12, month=(number - 1) % 12 + 1, freq='M')
+
+
+class StreamingAnomalyDetector:
+    """
+    Per-series EWMA state and the alerts raised so far.
+
+    Series arrays (one entry per dataset x district): dataset, district,
+    mean, variance, count. ``watermark`` is the last ingested month
+    (year * 12 + month, 0 before the first ingest).
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = STREAMING_ANOMALY_STATE,
+        alpha: float = STREAMING_EWMA_ALPHA,
+        threshold: float = STREAMING_Z_THRESHOLD,
+        warmup: int = STREAMING_WARMUP_MONTHS
+    ):
+        self.path = Path(path) if path else None
+        self.settings = np.array([alpha, threshold, warmup], dtype=np.float64)
+        self.version: Optional[int] = None
+        self._loaded = False
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.watermark = 0
+        self.series = pd.MultiIndex.from_arrays([[], []], names=['dataset', 'district'])
+        self.mean = np.zeros(0)
+        self.variance = np.zeros(0)
+        self.count = np.zeros(0, dtype=np.int64)
+        self.alerts = pd.DataFrame({
+            'dataset': pd.Series(dtype=object),
+            'district': pd.Series(dtype=object),
+            'month': pd.Series(dtype=np.int64),
+            'value': pd.Series(dtype=np.float64),
+            'expected': pd.Series(dtype=np.float64),
+            'z_score': pd.Series(dtype=np.float64),
+        })
+        self.last_ingested_rows = 0
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def load(self):
+        """Load saved state (once); missing or incompatible state starts empty."""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if self.path is None or not self.path.exists():
+                return
+            try:
+                with np.load(self.path, allow_pickle=False) as saved:
+                    if not np.array_equal(saved['settings'], self.settings):
+                        print("⚠️ Streaming anomaly settings changed, rebuilding state")
+                        return
+                    self.watermark = int(saved['watermark'])
+                    self.series = pd.MultiIndex.from_arrays(
+                        [saved['series_dataset'], saved['series_district']],
+                        names=['dataset', 'district']
+                    )
+                    self.mean = saved['mean']
+                    self.variance = saved['variance']
+                    self.count = saved['count']
+                    self.alerts = pd.DataFrame({
+                        column: saved[f'alert_{column}'] for column in ALERT_COLUMNS
+                    })
+            except Exception as e:
+                print(f"⚠️ Could not read streaming anomaly state: {e}")
+                self._reset()
+
+    def save(self):
+        """Write state atomically (temporary file, then rename)."""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix('.tmp.npz')
+        np.savez(
+            temporary,
+            settings=self.settings,
+            watermark=np.int64(self.watermark),
+            series_dataset=self.series.get_level_values('dataset').to_numpy().astype(str),
+            series_district=self.series.get_level_values('district').to_numpy().astype(str),
+            mean=self.mean,
+            variance=self.variance,
+            count=self.count,
+            **{
+                f'alert_{column}': (
+                    self.alerts[column].to_numpy().astype(str)
+                    if column in ('dataset', 'district') else self.alerts[column].to_numpy()
+                )
+                for column in ALERT_COLUMNS
+            }
+        )
+        os.replace(temporary, self.path)
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def sync(self, version: int, frames: Dict[str, pd.DataFrame]):
+        """Ingest a data snapshot unless it (or a newer one) is applied."""
+        with self._lock:
+            if self.version is not None and version <= self.version:
+                return
+            self.load()
+            if self.ingest(frames):
+                self.save()
+            self.version = version
+
+    def ingest(self, frames: Dict[str, pd.DataFrame]) -> int:
+        """
+        Ingest the closed months after the watermark.
+
+        Args:
+            frames: Snapshot dataset name -> DataFrame (see STREAM_SERIES)
+
+        Returns:
+            Number of months ingested
+        """
+        with self._lock:
+            dates = {
+                dataset: frames[dataset]['date'].to_numpy(dtype='datetime64[ns]')
+                for dataset in STREAM_SERIES if dataset in frames
+            }
+            ends = [pd.Timestamp(values.max()) for values in dates.values() if len(values)]
+            latest = max((end.year * 12 + end.month for end in ends if not pd.isna(end)), default=0)
+            first, last = self.watermark + 1, latest - 1
+            if last < first:
+                self.last_ingested_rows = 0
+                return 0
+
+            # New rows only: one date range comparison per dataset, month
+            # numbers and bincounts over the new rows alone
+            end = np.datetime64(month_period(latest).start_time, 'ns')
+            start = np.datetime64(month_period(first).start_time, 'ns') if self.watermark else None
+            new_rows, month_numbers = {}, {}
+            for dataset, values in dates.items():
+                in_range = values < end
+                if start is not None:
+                    in_range &= values >= start
+                rows = np.flatnonzero(in_range)
+                new_rows[dataset] = rows
+                month_numbers[dataset] = _month_number(frames[dataset]['date'].iloc[rows])
+            self.last_ingested_rows = int(sum(len(rows) for rows in new_rows.values()))
+
+            if not self.watermark:
+                first = min((int(m.min()) for m in month_numbers.values() if len(m)), default=first)
+            n_months = last - first + 1
+
+            # Series seen for the first time are appended
+            seen = pd.MultiIndex.from_frame(pd.concat([
+                pd.DataFrame({
+                    'dataset': dataset,
+                    'district': frames[dataset]['district'].to_numpy()[rows],
+                })
+                for dataset, rows in new_rows.items()
+            ]).drop_duplicates())
+            series = self.series.append(seen.difference(self.series)).set_names(['dataset', 'district'])
+            S, old_S = len(series), len(self.series)
+            mean = np.concatenate([self.mean, np.zeros(S - old_S)])
+            variance = np.concatenate([self.variance, np.zeros(S - old_S)])
+            count = np.concatenate([self.count, np.zeros(S - old_S, dtype=np.int64)])
+
+            # (months, series) totals and row counts of the new months
+            values = np.zeros(n_months * S)
+            rows_seen = np.zeros(n_months * S)
+            reported = np.zeros((n_months, S), dtype=bool)
+            series_dataset = series.get_level_values('dataset').to_numpy()
+            for dataset, rows in new_rows.items():
+                df = frames[dataset]
+                positions = series.get_indexer(pd.MultiIndex.from_arrays(
+                    [np.full(len(rows), dataset, dtype=object), df['district'].to_numpy()[rows]]
+                ))
+                flat = (month_numbers[dataset] - first) * S + positions
+                values += np.bincount(
+                    flat,
+                    weights=df[STREAM_SERIES[dataset]].fillna(0).to_numpy(dtype=np.float64)[rows],
+                    minlength=n_months * S
+                )
+                rows_seen += np.bincount(flat, minlength=n_months * S)
+                # Months in which the dataset has any rows at all
+                months_with_rows = np.unique(month_numbers[dataset]) - first
+                reported[np.ix_(months_with_rows, np.flatnonzero(series_dataset == dataset))] = True
+            values = values.reshape(n_months, S)
+            rows_seen = rows_seen.reshape(n_months, S) > 0
+
+            # One vectorized EWMA step per new month. A series starts at its
+            # first month with rows; after that a month without rows is a 0,
+            # unless its dataset has no rows that month (a gap in the data)
+            alpha, threshold, warmup = self.settings
+            alerts = []
+            for t in range(n_months):
+                x = values[t]
+                started = count > 0
+                observed = reported[t] & (started | rows_seen[t])
+                std = np.sqrt(variance)
+                scored = observed & (count >= warmup) & (std > 0)
+                z = np.zeros(S)
+                z[scored] = (x[scored] - mean[scored]) / std[scored]
+                hits = np.flatnonzero(scored & (np.abs(z) > threshold))
+                if len(hits):
+                    alerts.append(pd.DataFrame({
+                        'dataset': series_dataset[hits],
+                        'district': series.get_level_values('district').to_numpy()[hits],
+                        'month': np.full(len(hits), first + t, dtype=np.int64),
+                        'value': x[hits],
+                        'expected': mean[hits],
+                        'z_score': z[hits],
+                    }))
+
+                diff = x - mean
+                increment = alpha * diff
+                variance = np.where(
+                    observed, np.where(started, (1 - alpha) * (variance + diff * increment), 0.0), variance
+                )
+                mean = np.where(observed, np.where(started, mean + increment, x), mean)
+                count = count + observed
+
+            self.series, self.mean, self.variance, self.count = series, mean, variance, count
+            if alerts:
+                self.alerts = pd.concat([self.alerts] + alerts, ignore_index=True)
+            self.watermark = last
+            return n_months
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def watermark_period(self) -> Optional[pd.Period]:
+        """Last ingested month, None before the first ingest."""
+        return month_period(self.watermark) if self.watermark else None
+
+    def current_alerts(
+        self,
+        month: Optional[str] = None,
+        datasets: Optional[List[str]] = None,
+        districts: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Alerts raised for one month (default: the latest ingested month).
+
+        Returns:
+            DataFrame with dataset, district, month (Period), value,
+            expected, z_score and direction, largest |z| first
+        """
+        with self._lock:
+            if month:
+                period = pd.Period(month, freq='M')
+                number = period.year * 12 + period.month
+            else:
+                number = self.watermark
+            alerts = self.alerts[self.alerts['month'] == number]
+
+        if datasets:
+            alerts = alerts[alerts['dataset'].isin(datasets)]
+        if districts:
+            alerts = alerts[alerts['district'].isin(districts)]
+        alerts = alerts.iloc[np.argsort(-np.abs(alerts['z_score'].to_numpy()), kind='stable')]
+        return alerts.assign(
+            month=[month_period(int(m)) for m in alerts['month']],
+            direction=np.where(alerts['z_score'] > 0, 'spike', 'drop'),
+        ).reset_index(drop=True)
+
+
+# Shared by all requests; synced to the newest data snapshot
+streaming_detector = StreamingAnomalyDetector()
@@ -7,22 +7,331 @@ Logic:
 - Children enrolled at age 14 must update biometrics at age 15 (next year)
 - Use historical patterns to forecast workload
 """
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
 import pandas as pd
 import numpy as np
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
 
-try:
-    from statsmodels.tsa.holtwinters import ExponentialSmoothing
-    HAS_STATSMODELS = True
-except ImportError:
-    HAS_STATSMODELS = False
-
 from src.config import (
     AGE_MANDATORY_UPDATE_5, AGE_MANDATORY_UPDATE_15,
-    FORECAST_HORIZON_DAYS
+    AGE_5_UPDATE_FRACTION, AGE_15_UPDATE_FRACTION,
+    FORECAST_HORIZON_DAYS,
+    FORECAST_ENGINE, FORECAST_MATRIX_ENGINE, FORECAST_FIT_CACHE_SIZE,
+    FORECAST_POOL_MIN_SERIES, FORECAST_BATCH_SIZE
+)
+from src.analytics.ranking import top_k_indices
+from src.analytics.holt_smoothing import fit_holt_linear, simulate_holt_quantiles
+
+
+# ============================================================================
+# FITTED MODEL CACHE & PROCESS POOL
+# ============================================================================
+
+# Model configuration; part of the cache key so a config change refits
+HOLT_CONFIG = {
+    'trend': 'add',
+    'seasonal': None,
+    'initialization_method': 'estimated',
+}
+
+# Fitted values kept per series (plain floats, so they pickle cheaply)
+HOLT_PARAM_KEYS = (
+    'smoothing_level', 'smoothing_trend',
+    'initial_level', 'initial_trend',
+    'level', 'trend',
 )
 
+# Fitted parameters keyed by hash(series, HOLT_CONFIG, engine), shared by all requests
+_fit_cache: "OrderedDict[str, Optional[Dict]]" = OrderedDict()
+_fit_cache_lock = threading.Lock()
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _series_key(values: np.ndarray, engine: str) -> str:
+    """Stable hash of a series, the model configuration and the engine."""
+    digest = hashlib.sha1(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    digest.update(json.dumps({**HOLT_CONFIG, 'engine': engine}, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def _fit_holt_statsmodels(values: np.ndarray) -> Optional[Dict]:
+    """
+    Fit one series with statsmodels' ExponentialSmoothing (reference engine).
+    
+    Returns:
+        Dict with smoothing parameters and final level/trend, or None if
+        statsmodels is missing or the fit failed
+    """
+    try:
+        from statsmodels.tsa.holtwinters import ExponentialSmoothing
+    except ImportError:
+        return None
+    try:
+        fitted = ExponentialSmoothing(values, **HOLT_CONFIG).fit(optimized=True)
+    except Exception as e:
+        print(f"Forecasting error: {e}")
+        return None
+    
+    params = fitted.params
+    return {
+        'smoothing_level': float(params['smoothing_level']),
+        'smoothing_trend': float(params['smoothing_trend']),
+        'initial_level': float(params['initial_level']),
+        'initial_trend': float(params['initial_trend']),
+        'level': float(fitted.level[-1]),
+        'trend': float(fitted.trend[-1]),
+    }
+
+
+def _fit_holt_batch(batch: List[np.ndarray], engine: str) -> List[Optional[Dict]]:
+    """
+    Fit a batch of series; runs inline or in pool workers.
+    
+    The NumPy engine fits all series of the same length in one
+    vectorized call.
+    
+    Returns:
+        Fitted parameter dicts (None where fitting failed), in batch order
+    """
+    if engine == 'statsmodels':
+        return [_fit_holt_statsmodels(values) for values in batch]
+    
+    results: List[Optional[Dict]] = [None] * len(batch)
+    by_length: Dict[int, List[int]] = {}
+    for i, values in enumerate(batch):
+        by_length.setdefault(len(values), []).append(i)
+    
+    for length, positions in by_length.items():
+        if length < 2:
+            continue
+        fit = fit_holt_linear(np.vstack([batch[i] for i in positions]))
+        for row, i in enumerate(positions):
+            params = {key: float(fit[key][row]) for key in HOLT_PARAM_KEYS}
+            if np.isfinite(list(params.values())).all():
+                results[i] = params
+    
+    return results
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Create the shared forecasting process pool on first use."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            workers = int(os.getenv("FORECAST_WORKERS", "0")) or None
+            _process_pool = ProcessPoolExecutor(max_workers=workers)
+        return _process_pool
+
+
+def shutdown_process_pool():
+    """Stop the forecasting process pool (called on app shutdown)."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+
+
+def fit_series_cached(
+    series: List[np.ndarray],
+    engine: str = FORECAST_ENGINE
+) -> List[Optional[Dict]]:
+    """
+    Fit many series, reusing cached parameters for unchanged ones.
+    
+    Uncached series are fitted in batches. Batches run in the process pool
+    when there is more than one of them, otherwise inline:
+    - numpy: FORECAST_BATCH_SIZE series per vectorized batch
+    - statsmodels: one series per task, pooled from FORECAST_POOL_MIN_SERIES
+    
+    Returns:
+        Fitted parameter dicts (None where fitting failed), in input order
+    """
+    keys = [_series_key(values, engine) for values in series]
+    results: List[Optional[Dict]] = [None] * len(series)
+    missing = []
+    
+    with _fit_cache_lock:
+        for i, key in enumerate(keys):
+            if key in _fit_cache:
+                _fit_cache.move_to_end(key)
+                results[i] = _fit_cache[key]
+            else:
+                missing.append(i)
+    
+    if not missing:
+        return results
+    
+    to_fit = [np.asarray(series[i], dtype=np.float64) for i in missing]
+    if engine == 'statsmodels':
+        pooled = len(to_fit) >= FORECAST_POOL_MIN_SERIES
+        batches = [[values] for values in to_fit] if pooled else [to_fit]
+    else:
+        batches = [
+            to_fit[start:start + FORECAST_BATCH_SIZE]
+            for start in range(0, len(to_fit), FORECAST_BATCH_SIZE)
+        ]
+    
+    if len(batches) > 1:
+        fitted = [
+            params
+            for batch_result in _get_process_pool().map(_fit_holt_batch, batches, repeat(engine))
+            for params in batch_result
+        ]
+    else:
+        fitted = _fit_holt_batch(batches[0], engine)
+    
+    with _fit_cache_lock:
+        for i, params in zip(missing, fitted):
+            results[i] = params
+            _fit_cache[keys[i]] = params
+        while len(_fit_cache) > FORECAST_FIT_CACHE_SIZE:
+            _fit_cache.popitem(last=False)
+    
+    return results
+
+
+def _holt_forecast(params: Dict, periods: int) -> np.ndarray:
+    """Forecast from fitted parameters: level + h * trend."""
+    return params['level'] + params['trend'] * np.arange(1, periods + 1)
+
+
+def holt_prediction_bands(
+    values: np.ndarray,
+    fits: List[Optional[Dict]],
+    periods: int,
+    levels: Tuple[int, ...]
+) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Residual-bootstrap prediction intervals for Holt forecasts.
+    
+    Args:
+        values: (S, T) series the parameters were fitted on
+        fits: fit_series_cached() results for those series
+        periods: Number of periods forecast
+        levels: Interval coverages in percent, e.g. (80, 95)
+    
+    Returns:
+        Dict of level -> (lower, upper) arrays of shape (S, periods);
+        rows without a Holt fit are NaN
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    tails = [(100 - level) / 200 for level in levels]
+    quantiles = [q for tail in tails for q in (tail, 1 - tail)]
+    
+    bands = np.full((len(values), len(quantiles), periods), np.nan)
+    rows = [i for i, params in enumerate(fits) if params is not None]
+    if rows and levels:
+        params = {key: np.array([fits[i][key] for i in rows]) for key in HOLT_PARAM_KEYS}
+        # Enrolments cannot be negative
+        bands[rows] = np.maximum(
+            simulate_holt_quantiles(values[rows], params, periods, quantiles), 0.0
+        )
+    
+    return {
+        level: (bands[:, 2 * j], bands[:, 2 * j + 1])
+        for j, level in enumerate(levels)
+    }
+
+
+def moving_average_forecast(history: np.ndarray, periods: int) -> np.ndarray:
+    """
+    Fallback forecast: average of the last 3 periods, growing 2% per period.
+    
+    Args:
+        history: (S, T) array of series (or a single 1-D series)
+        periods: Number of periods to forecast
+    
+    Returns:
+        (S, periods) array (or 1-D for a 1-D input)
+    """
+    history = np.asarray(history, dtype=np.float64)
+    avg = history[..., -3:].mean(axis=-1)
+    return np.multiply.outer(avg, 1 + 0.02 * np.arange(periods))
+
+
+def forecast_district_matrix(
+    matrix: pd.DataFrame,
+    periods: int = 3,
+    interval_levels: Tuple[int, ...] = ()
+) -> pd.DataFrame:
+    """
+    Forecast every row of a district x month matrix.
+    
+    All district series are fitted together in one vectorized batch
+    (FORECAST_MATRIX_ENGINE), with cached parameters for unchanged series.
+    
+    Args:
+        matrix: WorkloadForecaster.calculate_district_monthly_matrix() result
+        periods: Number of months to forecast
+        interval_levels: Prediction interval coverages (%) to add
+    
+    Returns:
+        Long DataFrame with columns: district, date, total_enrolments,
+        is_forecast, method, plus lower_<level>/upper_<level> per interval
+        level (NaN for history and moving-average forecasts)
+    """
+    columns = ['district', 'date', 'total_enrolments', 'is_forecast', 'method']
+    for level in interval_levels:
+        columns += [f'lower_{level}', f'upper_{level}']
+    if matrix.empty:
+        return pd.DataFrame(columns=columns)
+    
+    history_dates = matrix.columns
+    forecast_dates = pd.date_range(
+        start=history_dates.max() + pd.DateOffset(months=1),
+        periods=periods,
+        freq='MS'
+    )
+    values = matrix.to_numpy(dtype=np.float64)
+    
+    # Not enough history to forecast with fewer than 4 months
+    can_forecast = len(history_dates) >= 4
+    fits = fit_series_cached(list(values), FORECAST_MATRIX_ENGINE) if can_forecast else [None] * len(values)
+    bands = holt_prediction_bands(values, fits, periods, interval_levels) if can_forecast else {}
+    
+    frames = []
+    for row, (district, series, params) in enumerate(zip(matrix.index, values, fits)):
+        frames.append(pd.DataFrame({
+            'district': district,
+            'date': history_dates,
+            'total_enrolments': series,
+            'is_forecast': False,
+            'method': None
+        }))
+        if not can_forecast:
+            continue
+        
+        if params is not None:
+            forecast_values, method = _holt_forecast(params, periods), 'holt'
+        else:
+            forecast_values = moving_average_forecast(series, periods)
+            method = 'moving_average'
+        
+        forecast = pd.DataFrame({
+            'district': district,
+            'date': forecast_dates,
+            'total_enrolments': forecast_values,
+            'is_forecast': True,
+            'method': method
+        })
+        for level, (lower, upper) in bands.items():
+            forecast[f'lower_{level}'] = lower[row]
+            forecast[f'upper_{level}'] = upper[row]
+        frames.append(forecast)
+    
+    return pd.concat(frames, ignore_index=True).reindex(columns=columns)
+
 
 class WorkloadForecaster:
     """
@@ -35,7 +344,7 @@ class WorkloadForecaster:
         self.enrolment_df = enrolment_df
         self.biometric_df = biometric_df
     
-    def calculate_mandatory_update_projection(self) -> pd.DataFrame:
+    def calculate_mandatory_update_projection(self, sort: bool = True) -> pd.DataFrame:
         """
         Project mandatory updates for next 12 months by district.
         
@@ -45,6 +354,10 @@ class WorkloadForecaster:
         - age_5_17 bucket includes ages 5-17
         - Approximately 1/13 of this bucket are age 14 (will turn 15 next year)
         
+        Args:
+            sort: Sort by projected updates (highest first). Ranked queries
+                  pass False and select the rows they need instead.
+        
         Returns:
             DataFrame with projected mandatory updates by district
         """
@@ -57,10 +370,10 @@ class WorkloadForecaster:
         
         # Estimate children who will need mandatory updates
         # Age 4 → turning 5 (mandatory biometric update)
-        district_enrol['projected_age_5_updates'] = (district_enrol['age_0_5'] / 6).round(0)
+        district_enrol['projected_age_5_updates'] = (district_enrol['age_0_5'] * AGE_5_UPDATE_FRACTION).round(0)
         
         # Age 14 → turning 15 (mandatory biometric update)
-        district_enrol['projected_age_15_updates'] = (district_enrol['age_5_17'] / 13).round(0)
+        district_enrol['projected_age_15_updates'] = (district_enrol['age_5_17'] * AGE_15_UPDATE_FRACTION).round(0)
         
         # Total projected mandatory updates
         district_enrol['total_projected_updates'] = (
@@ -68,10 +381,11 @@ class WorkloadForecaster:
             district_enrol['projected_age_15_updates']
         )
         
-        # Sort by projected updates (highest first)
-        district_enrol = district_enrol.sort_values(
-            'total_projected_updates', ascending=False
-        )
+        if sort:
+            # Sort by projected updates (highest first)
+            district_enrol = district_enrol.sort_values(
+                'total_projected_updates', ascending=False
+            )
         
         return district_enrol
     
@@ -94,14 +408,20 @@ class WorkloadForecaster:
     def forecast_workload(
         self, 
         periods: int = 3,
-        frequency: str = 'M'
+        frequency: str = 'M',
+        interval_levels: Tuple[int, ...] = ()
     ) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
-        Forecast future enrolment workload using Exponential Smoothing.
+        Forecast future enrolment workload using Holt's linear-trend
+        Exponential Smoothing (falls back to a moving average if the fit fails).
+        The series is fitted with FORECAST_ENGINE (statsmodels by default).
         
         Args:
             periods: Number of periods to forecast
             frequency: 'M' for monthly, 'W' for weekly
+            interval_levels: Prediction interval coverages (%); adds
+                             lower_<level>/upper_<level> columns to the
+                             Holt forecast
             
         Returns:
             Tuple of (historical_df, forecast_df)
@@ -118,44 +438,64 @@ class WorkloadForecaster:
             # Not enough data for forecasting
             return ts_data, pd.DataFrame()
         
-        if not HAS_STATSMODELS:
-            # Fallback: Simple moving average forecast
+        # Holt linear-trend Exponential Smoothing (parameters cached per series)
+        values = ts_data['total_enrolments'].to_numpy(dtype=np.float64)
+        params = fit_series_cached([values])[0]
+        if params is None:
             return self._simple_forecast(ts_data, periods)
         
-        try:
-            # Exponential Smoothing
-            model = ExponentialSmoothing(
-                ts_data['total_enrolments'].values,
-                trend='add',
-                seasonal=None,  # No seasonal component with limited data
-                initialization_method='estimated'
-            )
-            fitted = model.fit(optimized=True)
-            
-            # Generate forecast
-            forecast_values = fitted.forecast(periods)
-            
-            # Create forecast DataFrame
-            last_date = ts_data['date'].max()
-            forecast_dates = pd.date_range(
-                start=last_date + pd.DateOffset(months=1),
-                periods=periods,
-                freq='MS'
-            )
-            
-            forecast_df = pd.DataFrame({
-                'date': forecast_dates,
-                'total_enrolments': forecast_values,
-                'is_forecast': True
-            })
-            
-            ts_data['is_forecast'] = False
-            
-            return ts_data, forecast_df
-            
-        except Exception as e:
-            print(f"Forecasting error: {e}")
-            return self._simple_forecast(ts_data, periods)
+        # Generate forecast
+        forecast_values = _holt_forecast(params, periods)
+        
+        # Create forecast DataFrame
+        last_date = ts_data['date'].max()
+        forecast_dates = pd.date_range(
+            start=last_date + pd.DateOffset(months=1),
+            periods=periods,
+            freq='MS'
+        )
+        
+        forecast_df = pd.DataFrame({
+            'date': forecast_dates,
+            'total_enrolments': forecast_values,
+            'is_forecast': True
+        })
+        bands = holt_prediction_bands(values, [params], periods, interval_levels)
+        for level, (lower, upper) in bands.items():
+            forecast_df[f'lower_{level}'] = lower[0]
+            forecast_df[f'upper_{level}'] = upper[0]
+        
+        ts_data['is_forecast'] = False
+        
+        return ts_data, forecast_df
+    
+    def calculate_district_monthly_matrix(self) -> pd.DataFrame:
+        """
+        Monthly enrolments as a district x month matrix.
+        Months are those present in the data, missing cells are 0.
+        """
+        monthly = self.enrolment_df.groupby([
+            'district', self.enrolment_df['date'].dt.to_period('M')
+        ])['total_enrolments'].sum()
+        
+        matrix = monthly.unstack('date', fill_value=0).sort_index(axis=1)
+        matrix.columns = matrix.columns.to_timestamp()
+        return matrix
+    
+    def forecast_by_district(
+        self,
+        periods: int = 3,
+        interval_levels: Tuple[int, ...] = ()
+    ) -> pd.DataFrame:
+        """
+        Forecast monthly enrolments separately for every district.
+        
+        Returns:
+            Long DataFrame, see forecast_district_matrix()
+        """
+        return forecast_district_matrix(
+            self.calculate_district_monthly_matrix(), periods, interval_levels
+        )
     
     def _simple_forecast(
         self, 
@@ -163,9 +503,6 @@ class WorkloadForecaster:
         periods: int
     ) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Simple moving average fallback forecast."""
-        # Use last 3 periods average
-        avg = ts_data['total_enrolments'].tail(3).mean()
-        
         last_date = ts_data['date'].max()
         forecast_dates = pd.date_range(
             start=last_date + pd.DateOffset(months=1),
@@ -175,7 +512,7 @@ class WorkloadForecaster:
         
         forecast_df = pd.DataFrame({
             'date': forecast_dates,
-            'total_enrolments': [avg * (1 + 0.02 * i) for i in range(periods)],
+            'total_enrolments': moving_average_forecast(ts_data['total_enrolments'].values, periods),
             'is_forecast': True
         })
         
@@ -185,18 +522,20 @@ class WorkloadForecaster:
     
     def get_high_load_districts(self, top_n: int = 10) -> pd.DataFrame:
         """Get districts with highest projected workload."""
-        projections = self.calculate_mandatory_update_projection()
-        return projections.head(top_n)
+        projections = self.calculate_mandatory_update_projection(sort=False)
+        top = top_k_indices(projections['total_projected_updates'].to_numpy(), top_n)
+        return projections.iloc[top]
     
     def get_workload_summary(self) -> Dict:
         """Get summary statistics for workload forecasting."""
-        projections = self.calculate_mandatory_update_projection()
+        projections = self.calculate_mandatory_update_projection(sort=False)
+        top = projections.iloc[top_k_indices(projections['total_projected_updates'].to_numpy(), 1)]
         
         return {
             'total_projected_updates': int(projections['total_projected_updates'].sum()),
             'avg_per_district': int(projections['total_projected_updates'].mean()),
-            'max_district': projections.iloc[0]['district'] if len(projections) > 0 else 'N/A',
-            'max_district_load': int(projections.iloc[0]['total_projected_updates']) if len(projections) > 0 else 0,
+            'max_district': top.iloc[0]['district'] if len(top) > 0 else 'N/A',
+            'max_district_load': int(top.iloc[0]['total_projected_updates']) if len(top) > 0 else 0,
             'age_5_total': int(projections['projected_age_5_updates'].sum()),
             'age_15_total': int(projections['projected_age_15_updates'].sum()),
         }
@@ -1,13 +1,18 @@
 """
 Plotly Chart Components for UIDAI Ops-Intel Dashboard
+
+plotly is imported inside each chart function, so importing this module
+does not pay for it until the first chart is drawn.
 """
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+from __future__ import annotations
+
 import pandas as pd
 import numpy as np
 import json
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 from src.config import COLORS, GRADIENT_COLORS
 
@@ -27,6 +32,7 @@ def create_choropleth_map(
         value_column: Column to use for coloring
         title: Chart title
     """
+    import plotly.express as px
     fig = px.choropleth_mapbox(
         data,
         geojson=geojson,
@@ -93,6 +99,7 @@ def create_district_bar_chart(
     top_n: int = 15
 ) -> go.Figure:
     """Create a bar chart for district-level metrics."""
+    import plotly.graph_objects as go
     # Sort and limit
     df = data.nlargest(top_n, value_column).sort_values(value_column)
     
@@ -170,6 +177,7 @@ def create_forecast_chart(
     title: str = 'Enrolment Trend & Forecast'
 ) -> go.Figure:
     """Create a time series chart with historical data and forecast."""
+    import plotly.graph_objects as go
     fig = go.Figure()
     
     # Historical data
@@ -264,6 +272,7 @@ def create_workload_projection_chart(
     title: str = 'Projected Mandatory Updates (Next 12 Months)'
 ) -> go.Figure:
     """Create a stacked bar chart showing age 5 and age 15 update projections."""
+    import plotly.graph_objects as go
     # Sort by total
     df = data.nlargest(15, 'total_projected_updates').sort_values('total_projected_updates')
     
@@ -335,6 +344,7 @@ def create_workload_projection_chart(
 
 def create_age_distribution_pie(data: pd.DataFrame) -> go.Figure:
     """Create a donut chart showing age group distribution."""
+    import plotly.graph_objects as go
     age_totals = {
         'Children (0-5)': data['age_0_5'].sum(),
         'Youth (5-17)': data['age_5_17'].sum(),
@@ -383,6 +393,8 @@ def create_age_distribution_pie(data: pd.DataFrame) -> go.Figure:
 
 def create_migration_trend_chart(data: pd.DataFrame) -> go.Figure:
     """Create a dual-axis chart showing migration trends over time."""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
     fig = make_subplots(specs=[[{'secondary_y': True}]])
     
     # Enrolments
@@ -466,6 +478,7 @@ def create_migration_trend_chart(data: pd.DataFrame) -> go.Figure:
 
 def create_health_score_gauge(score: float, title: str = 'Data Quality') -> go.Figure:
     """Create a gauge chart for health/quality scores."""
+    import plotly.graph_objects as go
     fig = go.Figure(go.Indicator(
         mode='gauge+number',
         value=score,
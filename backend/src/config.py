@@ -17,6 +17,24 @@ BIOMETRIC_UPDATE_DATA = DATASETS_DIR / "Aadhaar Biometric Montly Update Data Tel
 DEMOGRAPHIC_UPDATE_DATA = DATASETS_DIR / "Aadhaar Demographic Montly Update Data Telangana.csv"
 GEOJSON_FILE = ASSETS_DIR / "telangana_districts.geojson"
 
+# Persistent analytics state (created on first use)
+STATE_DIR = BASE_DIR / "state"
+STREAMING_ANOMALY_STATE = STATE_DIR / "streaming_anomalies.npz"
+ALERT_STORE_PATH = STATE_DIR / "alerts.sqlite3"
+
+# ============================================================================
+# DATA SNAPSHOTS
+# ============================================================================
+SNAPSHOT_MEMO_SIZE = 128        # Max memoized results kept per data snapshot
+DATA_WATCH_INTERVAL_SECONDS = 0  # Poll dataset files for changes (0 = disabled)
+DATA_LOAD_TIMEOUT_SECONDS = 60   # Max time a request waits for the initial load
+
+# ============================================================================
+# STARTUP
+# ============================================================================
+STARTUP_HEALTHY_BUDGET_SECONDS = 2.5  # Regression budget: process start -> first /health 200
+STARTUP_READY_TIMEOUT_SECONDS = 120   # Give up waiting for /ready when profiling
+
 # ============================================================================
 # UIDAI BRANDING
 # ============================================================================
@@ -53,16 +71,55 @@ GRADIENT_COLORS = [
 AGE_MANDATORY_UPDATE_5 = 5   # Children must update biometrics at age 5
 AGE_MANDATORY_UPDATE_15 = 15  # Must update biometrics at age 15
 FORECAST_HORIZON_DAYS = 90    # Predict next 90 days
+AGE_5_UPDATE_FRACTION = 1 / 6    # Share of the 0-5 bucket turning 5 within a year
+AGE_15_UPDATE_FRACTION = 1 / 13  # Share of the 5-17 bucket turning 15 within a year
+FORECAST_ENGINE = "statsmodels"  # Single-series (state-wide) forecasts: "statsmodels" or "numpy" (vectorized Holt)
+FORECAST_MATRIX_ENGINE = "numpy"  # District matrix forecasts (many series at once)
+FORECAST_FIT_CACHE_SIZE = 4096  # Fitted series parameters kept in memory
+FORECAST_POOL_MIN_SERIES = 8    # statsmodels: fit in the process pool from this many series
+FORECAST_BATCH_SIZE = 5000      # numpy: series per vectorized batch (extra batches use the pool)
+HOLT_GRID_POINTS = 11           # Coarse grid points per smoothing parameter
+HOLT_REFINE_ROUNDS = 8          # Zoomed grid refinements after the coarse grid
+HOLT_REFINE_POINTS = 5          # Grid points per parameter in each refinement
+FORECAST_INTERVAL_LEVELS = (80, 95)  # Default prediction interval coverages (%)
+HOLT_SIMULATION_PATHS = 2000    # Bootstrap paths per series for prediction intervals
+HOLT_SIMULATION_SEED = 0        # Fixed seed so intervals are stable between requests
+HOLT_SIMULATION_CHUNK_CELLS = 500_000  # Series x paths simulated at once (bounds memory)
+COHORT_HORIZON_MONTHS = 36      # Months of cohort-aging update projections
+BACKLOG_ACTUAL_COLUMN = "bio_age_5_17"  # Biometric updates counted against the mandatory projection
+BACKTEST_HORIZON = 3            # Months forecast from each backtest cutoff
+BACKTEST_MIN_TRAIN = 4          # Months in the first backtest training window
+BACKTEST_PARALLEL_MIN_FITS = 2000  # Run cutoffs in the process pool from this many series x cutoffs
 
 # Module B: Migration Pattern Analysis
 MIGRATION_THRESHOLD_HIGH = 0.7   # High migration if update ratio > 0.7
 MIGRATION_THRESHOLD_MEDIUM = 0.4  # Medium if between 0.4 and 0.7
 # Low if < 0.4
+MIGRATION_ROLLING_WINDOWS = (3, 6, 12)  # Default trailing windows (months) for ratio series
+MIGRATION_FLOW_TOP_K = 5              # Origins each destination's estimated inflow is split over
+MIGRATION_FLOW_LOCAL_AFFINITY = 4.0   # Weight of origins in the destination's own district
+CHANGE_POINT_PENALTY = 3.0      # Min gain per change point, in noise variance x log(months)
+CHANGE_POINT_MIN_SEGMENT = 2    # Min months on each side of a change point
+CHANGE_POINT_MAX_CHANGES = 5    # Max change points per series
 
 # Module C: Anomaly Detection
 GENDER_RATIO_LOWER = 0.47  # Flag if female % < 47%
 GENDER_RATIO_UPPER = 0.53  # Flag if female % > 53%
 ANOMALY_STD_THRESHOLD = 2.0  # Flag if value > 2 std deviations
+ANOMALY_RULE_WORKERS = 4        # Threads running heavy anomaly detectors concurrently
+ROBUST_Z_THRESHOLD = 3.5        # Flag pincode-months with |modified z-score| > 3.5 (median/MAD)
+ROBUST_MIN_OBSERVATIONS = 10    # Min pincode-months in a district for robust scoring
+UPDATE_SCAN_MIN_MONTHS = 4      # Min months in a pincode's update series before spikes/drops are scored
+UPDATE_SCAN_MIN_VOLUME = 20     # Ignore pincode-months where both value and usual level are below this
+MAHALANOBIS_SUPPORT_FRACTION = 0.75  # Share of rows the robust covariance is estimated from
+MAHALANOBIS_P_VALUE = 0.001     # Flag unit-months with a chi-square p-value below this
+MAHALANOBIS_CHUNK_ROWS = 500_000  # Rows scored per matrix product
+STREAMING_EWMA_ALPHA = 0.3      # Weight of the newest month in the streaming EWMA mean/variance
+STREAMING_Z_THRESHOLD = 3.0     # Flag a month if |value - EWMA mean| > 3 EWMA std
+STREAMING_WARMUP_MONTHS = 3     # Months a series is observed before it can raise alerts
+
+# What-if scenarios
+SCENARIO_MAX_GRID = 10000  # Max scenarios evaluated per request
 
 # ============================================================================
 # DISTRICT NAME MAPPING (for standardization)
@@ -5,7 +5,6 @@ Handles all data ingestion for UIDAI Ops-Intel Dashboard
 import pandas as pd
 import numpy as np
 import json
-import requests
 from pathlib import Path
 from typing import Dict, Tuple, Optional
 from datetime import datetime
@@ -133,6 +132,9 @@ def load_geojson() -> dict:
     """
     GEOJSON_URL = "https://raw.githubusercontent.com/gggodhwani/telangana_boundaries/master/districts.json"
     
+    # Imported here so loading this module does not pay for requests
+    import requests
+    
     try:
         # Try to fetch from URL first (most accurate)
         response = requests.get(GEOJSON_URL, timeout=10)
@@ -0,0 +1,339 @@
+"""
+Dataset Snapshot Store
+Keeps the loaded datasets as immutable, versioned snapshots.
+
+Logic:
+- A request grabs the current snapshot once and uses it until it finishes
+- A reload builds a new snapshot in the background, then swaps it in
+  atomically and bumps the version
+- Results memoized on a snapshot live and die with that snapshot, so a
+  swap releases everything computed against the old data
+- Loads are staged (one stage per dataset) with progress and timings
+  reported for readiness probes
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from src.config import SNAPSHOT_MEMO_SIZE, DATA_LOAD_TIMEOUT_SECONDS
+
+# Lifecycle states
+LOAD_IDLE = "idle"        # Nothing loaded, no load started
+LOAD_LOADING = "loading"  # Initial load in progress
+LOAD_READY = "ready"      # A snapshot is being served
+LOAD_FAILED = "failed"    # Initial load failed, nothing to serve
+
+
+class DataSnapshot:
+    """
+    Read-only bundle of datasets tagged with a version number.
+
+    Supports ``snapshot['enrolment']`` style access so it can be used
+    wherever the old dict cache was used. DataFrames inside a snapshot are
+    shared between requests and must not be modified in place.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        datasets: Dict[str, Any],
+        memo_size: int = SNAPSHOT_MEMO_SIZE
+    ):
+        self.version = version
+        self.loaded_at = datetime.now()
+        self._datasets = dict(datasets)
+        self._memo: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._memo_size = memo_size
+        self._memo_lock = threading.Lock()
+        self._released = False
+
+    def __getitem__(self, key: str) -> Any:
+        return self._datasets[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._datasets
+
+    def keys(self):
+        return self._datasets.keys()
+
+    def memo(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the result cached under ``key`` for this snapshot,
+        computing and storing it on first use.
+
+        Once the snapshot has been swapped out, results are still computed
+        for in-flight requests but no longer stored.
+        """
+        with self._memo_lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+
+        value = compute()
+
+        with self._memo_lock:
+            if not self._released:
+                self._memo[key] = value
+                self._memo.move_to_end(key)
+                while len(self._memo) > self._memo_size:
+                    self._memo.popitem(last=False)
+        return value
+
+    def release(self):
+        """Drop all memoized results (called when the snapshot is replaced)."""
+        with self._memo_lock:
+            self._released = True
+            self._memo.clear()
+
+
+class DataLoadError(RuntimeError):
+    """Raised when data is requested but no snapshot can be served."""
+
+
+class DataStore:
+    """
+    Owns the current DataSnapshot and manages its load lifecycle.
+
+    - At most one load runs at a time; callers that need data while a load
+      is in progress wait for it instead of starting another one
+    - Each load runs a list of named stages and records their progress and
+      durations; the first failing stage aborts the load
+    - A failed initial load is reported to callers immediately instead of
+      being retried on every request
+    - The swap is a single reference assignment under a lock, so readers
+      always see either the old or the new snapshot, never a mix
+    """
+
+    def __init__(
+        self,
+        stages: Iterable[Tuple[str, Callable[[], Any]]],
+        watch_paths: Iterable[Path] = (),
+        load_timeout: float = DATA_LOAD_TIMEOUT_SECONDS
+    ):
+        self._stages = list(stages)
+        self._watch_paths = [Path(p) for p in watch_paths]
+        self._load_timeout = load_timeout
+        self._cond = threading.Condition()
+        self._snapshot: Optional[DataSnapshot] = None
+        self._version = 0
+        self._state = LOAD_IDLE
+        self._loading = False
+        self._error: Optional[str] = None
+        self._progress: List[Dict[str, Any]] = []
+        self._load_started_at: Optional[datetime] = None
+        self._load_seconds: Optional[float] = None
+        self._listeners: List[Callable[[Optional[DataSnapshot], DataSnapshot], None]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+
+    @property
+    def snapshot(self) -> Optional[DataSnapshot]:
+        """Current snapshot, or None if nothing has been loaded yet."""
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @property
+    def is_ready(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def is_reloading(self) -> bool:
+        return self._loading
+
+    def get(self, timeout: Optional[float] = None) -> DataSnapshot:
+        """
+        Return the current snapshot.
+
+        If nothing has been loaded yet, starts the load (unless one is
+        already running) and waits up to ``timeout`` seconds for it.
+
+        Raises:
+            DataLoadError: if the initial load failed or did not finish in time
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+
+        timeout = self._load_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            while self._snapshot is None:
+                if self._state == LOAD_FAILED:
+                    raise DataLoadError(f"Data load failed: {self._error}")
+                if not self._loading:
+                    self._start_load_locked()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise DataLoadError("Data is still loading")
+                self._cond.wait(remaining)
+            return self._snapshot
+
+    def add_swap_listener(
+        self,
+        listener: Callable[[Optional[DataSnapshot], DataSnapshot], None]
+    ):
+        """Register ``listener(old, new)`` to be called after every swap."""
+        self._listeners.append(listener)
+
+    def reload(self) -> DataSnapshot:
+        """
+        Build a new snapshot and swap it in, blocking until done.
+
+        Waits for any load already in progress first; the current snapshot
+        keeps serving requests until the new one is ready.
+        """
+        with self._cond:
+            while self._loading:
+                self._cond.wait()
+            self._begin_load_locked()
+        return self._run_load()
+
+    def reload_in_background(self) -> bool:
+        """
+        Start a reload on a background thread.
+
+        Returns:
+            False if a load is already running, True otherwise
+        """
+        with self._cond:
+            if self._loading:
+                return False
+            self._start_load_locked()
+        return True
+
+    def status(self) -> Dict[str, Any]:
+        """Lifecycle state and per-stage progress of the latest load."""
+        with self._cond:
+            stages = [dict(stage) for stage in self._progress]
+            snapshot = self._snapshot
+            return {
+                'state': self._state,
+                'ready': snapshot is not None,
+                'loading': self._loading,
+                'version': self._version,
+                'loaded_at': snapshot.loaded_at.isoformat() if snapshot else None,
+                'load_started_at': self._load_started_at.isoformat() if self._load_started_at else None,
+                'load_seconds': self._load_seconds,
+                'completed_stages': sum(1 for stage in stages if stage['status'] == 'done'),
+                'total_stages': len(stages),
+                'stages': stages,
+                'error': self._error,
+            }
+
+    def _begin_load_locked(self):
+        """Mark a load as running and reset progress (caller holds the lock)."""
+        self._loading = True
+        if self._snapshot is None:
+            self._state = LOAD_LOADING
+        self._load_started_at = datetime.now()
+        self._load_seconds = None
+        self._progress = [
+            {'stage': name, 'status': 'pending', 'duration_seconds': None}
+            for name, _ in self._stages
+        ]
+
+    def _start_load_locked(self):
+        """Begin a load on a background thread (caller holds the lock)."""
+        self._begin_load_locked()
+
+        def _run():
+            try:
+                self._run_load()
+            except Exception:
+                pass  # Already recorded in status() by _run_load
+
+        threading.Thread(target=_run, name="data-load", daemon=True).start()
+
+    def _run_load(self) -> DataSnapshot:
+        """Run every load stage, then swap the result in."""
+        load_start = time.perf_counter()
+        datasets = {}
+
+        for index, (name, load) in enumerate(self._stages):
+            stage = self._progress[index]
+            stage['status'] = 'running'
+            stage_start = time.perf_counter()
+            try:
+                datasets[name] = load()
+            except Exception as e:
+                stage['status'] = 'failed'
+                stage['duration_seconds'] = round(time.perf_counter() - stage_start, 3)
+                print(f"❌ Data load failed at stage '{name}': {e}")
+                with self._cond:
+                    self._loading = False
+                    self._error = f"{name}: {e}"
+                    self._load_seconds = round(time.perf_counter() - load_start, 3)
+                    # Keep serving the previous snapshot if there is one
+                    self._state = LOAD_READY if self._snapshot is not None else LOAD_FAILED
+                    self._cond.notify_all()
+                raise
+            stage['status'] = 'done'
+            stage['duration_seconds'] = round(time.perf_counter() - stage_start, 3)
+
+        with self._cond:
+            self._version += 1
+            previous = self._snapshot
+            snapshot = DataSnapshot(self._version, datasets)
+            self._snapshot = snapshot
+            self._state = LOAD_READY
+            self._loading = False
+            self._error = None
+            self._load_seconds = round(time.perf_counter() - load_start, 3)
+            self._cond.notify_all()
+
+        print(f"✅ Data snapshot v{snapshot.version} loaded in {self._load_seconds:.2f}s")
+
+        if previous is not None:
+            previous.release()
+        for listener in self._listeners:
+            listener(previous, snapshot)
+
+        return snapshot
+
+    def _file_signature(self) -> Tuple:
+        """Modification times of the watched files (None if missing)."""
+        signature = []
+        for path in self._watch_paths:
+            try:
+                signature.append(path.stat().st_mtime_ns)
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def start_watcher(self, interval: float):
+        """Poll the watched files and reload whenever one of them changes."""
+        if self._watcher is not None or not self._watch_paths:
+            return
+
+        self._stop_watching.clear()
+
+        def _watch():
+            last_seen = self._file_signature()
+            while not self._stop_watching.wait(interval):
+                current = self._file_signature()
+                if current != last_seen:
+                    print("🔄 Dataset change detected, reloading...")
+                    if self.reload_in_background():
+                        last_seen = current
+
+        self._watcher = threading.Thread(target=_watch, name="data-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        """Stop the file watcher if it is running."""
+        if self._watcher is None:
+            return
+        self._stop_watching.set()
+        self._watcher.join(timeout=5)
+        self._watcher = None
@@ -0,0 +1,232 @@
+"""
+Startup Profiling
+Keeps process start fast and measures where start-up time goes.
+
+- lazy_import() defers heavy modules (pandas, numpy, analytics) until
+  first attribute access
+- STARTUP_PROFILE=1 makes the API log its import time, which heavy modules
+  were loaded at start, and the data load stage durations
+- ``python -m src.startup_profile`` (run from backend/) profiles imports
+  with ``python -X importtime``, starts the API with uvicorn, measures the
+  time to the first healthy /health response and to /ready, and exits
+  non-zero if the time-to-healthy budget is exceeded
+"""
+import argparse
+import importlib.util
+import json
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, Optional
+
+from src.config import (
+    BASE_DIR, STARTUP_HEALTHY_BUDGET_SECONDS, STARTUP_READY_TIMEOUT_SECONDS
+)
+
+# Modules that dominate import time and should not load at process start
+HEAVY_MODULES = ('pandas', 'numpy', 'scipy', 'statsmodels', 'requests', 'plotly')
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Return a module that is only executed on first attribute access.
+
+    Parent packages are imported normally, so they must be cheap to import.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named {name!r}")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def loaded_heavy_modules() -> List[str]:
+    """Heavy modules that have actually been executed in this process."""
+    loaded = []
+    for name in HEAVY_MODULES:
+        module = sys.modules.get(name)
+        # A lazy module that was never touched still has the lazy subclass
+        if module is not None and type(module) is ModuleType:
+            loaded.append(name)
+    return loaded
+
+
+def log_import_profile(import_seconds: float):
+    """Print how long main took to import and which heavy modules it loaded."""
+    heavy = loaded_heavy_modules()
+    print(f"⏱️ main imported in {import_seconds:.3f}s")
+    print(f"⏱️ Heavy modules loaded at start: {', '.join(heavy) if heavy else 'none'}")
+
+
+def log_load_profile(stages: List[Dict]):
+    """Print the status and duration of each data load stage."""
+    for stage in stages:
+        duration = stage['duration_seconds']
+        print(f"⏱️ Load stage {stage['stage']}: {stage['status']}"
+              + (f" in {duration:.3f}s" if duration is not None else ""))
+
+
+# ============================================================================
+# OUT-OF-PROCESS PROFILE (CLI)
+# ============================================================================
+
+def parse_importtime(output: str) -> List[Dict]:
+    """
+    Parse ``python -X importtime`` output.
+
+    Returns:
+        List of dicts with module, self_ms, cumulative_ms, depth
+    """
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            rows.append({
+                'module': name.strip(),
+                'self_ms': int(self_us) / 1000,
+                'cumulative_ms': int(cumulative_us) / 1000,
+                # Nesting is encoded as two spaces per level
+                'depth': (len(name) - len(name.lstrip(" ")) - 1) // 2,
+            })
+        except ValueError:
+            continue
+    return rows
+
+
+def profile_imports(module: str = "main") -> List[Dict]:
+    """Import ``module`` in a fresh interpreter with -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BASE_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get_json(url: str):
+    """GET a URL and return (status, JSON body), or (None, None) if unreachable."""
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"null")
+    except (urllib.error.URLError, ConnectionError, OSError):
+        return None, None
+
+
+def measure_startup(ready_timeout: float = STARTUP_READY_TIMEOUT_SECONDS) -> Dict:
+    """
+    Start the API with uvicorn and time the first healthy and ready responses.
+
+    Returns:
+        Dict with seconds_to_healthy, seconds_to_ready (None on timeout)
+        and the load status reported by /ready
+    """
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    result = {'seconds_to_healthy': None, 'seconds_to_ready': None, 'load_status': None}
+    try:
+        deadline = started + ready_timeout
+        while time.perf_counter() < deadline and server.poll() is None:
+            if result['seconds_to_healthy'] is None:
+                status, _ = _get_json(f"{base_url}/health")
+                if status == 200:
+                    result['seconds_to_healthy'] = round(time.perf_counter() - started, 3)
+            else:
+                status, body = _get_json(f"{base_url}/ready")
+                result['load_status'] = body
+                if status == 200:
+                    result['seconds_to_ready'] = round(time.perf_counter() - started, 3)
+                    break
+                if body and body.get('state') == 'failed':
+                    break
+            time.sleep(0.05)
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            server.kill()
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Profile API start-up time")
+    parser.add_argument("--budget", type=float, default=STARTUP_HEALTHY_BUDGET_SECONDS,
+                        help="Max seconds to the first healthy /health response")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to show")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    imports = profile_imports("main")
+    top_level = sorted(
+        (row for row in imports if row['depth'] <= 1),
+        key=lambda row: row['cumulative_ms'], reverse=True
+    )
+    main_row = next((row for row in imports if row['module'] == 'main'), None)
+    eager_heavy = sorted({
+        row['module'].split('.')[0] for row in imports
+        if row['module'].split('.')[0] in HEAVY_MODULES
+    })
+    startup = measure_startup()
+
+    print("📦 Slowest imports (cumulative ms):")
+    for row in top_level[:args.top]:
+        print(f"   {row['cumulative_ms']:9.1f}  {row['module']}")
+    if main_row:
+        print(f"⏱️ import main: {main_row['cumulative_ms'] / 1000:.3f}s")
+    print(f"⏱️ Heavy modules imported by main: {', '.join(eager_heavy) if eager_heavy else 'none'}")
+
+    log_load_profile((startup['load_status'] or {}).get('stages', []))
+    def _seconds(value):
+        return f"{value}s" if value is not None else "not reached"
+
+    print(f"⏱️ Time to first healthy response: {_seconds(startup['seconds_to_healthy'])} (budget {args.budget}s)")
+    print(f"⏱️ Time to ready: {_seconds(startup['seconds_to_ready'])}")
+
+    report = {
+        'import_main_seconds': main_row['cumulative_ms'] / 1000 if main_row else None,
+        'eager_heavy_modules': eager_heavy,
+        'slowest_imports': top_level[:args.top],
+        'budget_seconds': args.budget,
+        **startup,
+    }
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2))
+
+    healthy = startup['seconds_to_healthy']
+    if healthy is None or healthy > args.budget:
+        print("❌ Start-up budget exceeded")
+        return 1
+    print("✅ Start-up within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""Batched binary segmentation on synthetic step series."""
+import numpy as np
+
+from src.analytics.change_points import detect_change_points
+
+
+def _noisy(levels, seed: int = 0, noise: float = 1.0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    values = np.concatenate([np.full(length, level, dtype=np.float64) for level, length in levels])
+    return values + rng.normal(0, noise, len(values))
+
+
+def test_single_step_is_found():
+    series = _noisy([(10, 12), (30, 12)])
+    events = detect_change_points(series[None, :])
+    assert events['position'].tolist() == [12]
+    assert events['series'].tolist() == [0]
+    np.testing.assert_allclose(events['before'], series[:12].mean())
+    np.testing.assert_allclose(events['after'], series[12:].mean())
+    np.testing.assert_allclose(events['magnitude'], events['after'] - events['before'])
+    assert events['magnitude'][0] > 15
+
+
+def test_two_steps_in_one_series():
+    series = _noisy([(10, 10), (40, 10), (20, 10)], seed=1)
+    events = detect_change_points(series[None, :])
+    assert sorted(events['position'].tolist()) == [10, 20]
+
+
+def test_flat_series_have_no_events():
+    series = np.vstack([_noisy([(50, 24)], seed=seed) for seed in range(5)])
+    events = detect_change_points(series)
+    assert len(events['position']) == 0
+
+
+def test_batch_matches_series_one_by_one():
+    series = np.vstack([
+        _noisy([(10, 12), (30, 12)], seed=2),
+        _noisy([(50, 24)], seed=3),
+        _noisy([(5, 8), (25, 8), (5, 8)], seed=4),
+        _noisy([(100, 18), (60, 6)], seed=5, noise=3.0),
+    ])
+    batch = detect_change_points(series)
+    for row, values in enumerate(series):
+        alone = detect_change_points(values[None, :])
+        mine = batch['series'] == row
+        assert sorted(batch['position'][mine].tolist()) == sorted(alone['position'].tolist())
+
+
+def test_missing_months_are_filled_and_empty_rows_skipped():
+    series = np.vstack([_noisy([(10, 12), (30, 12)], seed=6), np.zeros(24)])
+    valid = np.ones(series.shape, dtype=bool)
+    valid[0, 5] = False
+    series[0, 5] = 1e6  # Ignored: the cell is not valid
+    valid[1] = False
+    events = detect_change_points(series, valid)
+    assert events['series'].tolist() == [0]
+    assert events['position'].tolist() == [12]
+
+
+def test_short_series_have_no_events():
+    events = detect_change_points(np.arange(4, dtype=np.float64)[None, :], min_segment=3)
+    assert len(events['position']) == 0
@@ -0,0 +1,59 @@
+"""Grouped partial-selection medians and the robust pincode scores built on them."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.anomaly_detection import AnomalyDetector, grouped_median
+
+
+def _reference_median(groups: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    medians = pd.Series(values).groupby(groups).median()
+    return medians.reindex(range(n_groups)).to_numpy()
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_groupby_median(seed):
+    rng = np.random.default_rng(seed)
+    n_groups = 40
+    # Group sizes from 1 to ~70 cover odd/even counts and several block widths
+    sizes = rng.integers(1, 70, n_groups)
+    groups = rng.permutation(np.repeat(np.arange(n_groups), sizes))
+    values = rng.normal(100, 30, len(groups)).round(1)
+    np.testing.assert_allclose(
+        grouped_median(groups, values, n_groups), _reference_median(groups, values, n_groups)
+    )
+
+
+def test_ties_and_empty_groups():
+    groups = np.array([0, 0, 0, 2, 2, 2, 2, 4])
+    values = np.array([5.0, 5.0, 1.0, 3.0, 3.0, 3.0, 9.0, -2.0])
+    medians = grouped_median(groups, values, 6)
+    np.testing.assert_allclose(medians, [5.0, np.nan, 3.0, np.nan, -2.0, np.nan])
+
+
+def test_no_values():
+    medians = grouped_median(np.empty(0, dtype=np.intp), np.empty(0), 3)
+    assert medians.shape == (3,) and np.isnan(medians).all()
+
+
+def test_pincode_outlier_scores_match_pandas():
+    rng = np.random.default_rng(3)
+    rows = 600
+    enrolment = pd.DataFrame({
+        'date': pd.to_datetime('2025-01-01') + pd.to_timedelta(rng.integers(0, 180, rows), unit='D'),
+        'district': rng.choice(['A', 'B', 'C'], rows),
+        'pincode': rng.choice([500001, 500002, 500003, 500004], rows),
+        'total_enrolments': rng.poisson(20, rows),
+    })
+    scores = AnomalyDetector(enrolment).pincode_outlier_scores()
+
+    by_district = scores.groupby('district')['value']
+    median = by_district.transform('median')
+    deviation = (scores['value'] - median).abs()
+    mad = deviation.groupby(scores['district']).transform('median')
+    mean_deviation = deviation.groupby(scores['district']).transform('mean')
+    scale = np.where(mad > 0, mad / 0.6745, mean_deviation * 1.2533)
+
+    np.testing.assert_allclose(scores['median'], median)
+    np.testing.assert_allclose(scores['score'], (scores['value'] - median) / scale)
+    assert scores['value'].sum() == enrolment['total_enrolments'].sum()
@@ -0,0 +1,70 @@
+"""Ledoit-Wolf shrinkage and robust Mahalanobis scoring."""
+import numpy as np
+import pytest
+
+from src.analytics.multivariate_anomalies import RobustMahalanobis, ledoit_wolf
+
+
+def _correlated(n: int, p: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    mixing = rng.normal(size=(p, p)) + 2 * np.eye(p)
+    return rng.normal(size=(n, p)) @ mixing
+
+
+def _reference_ledoit_wolf(X: np.ndarray):
+    """Ledoit & Wolf (2004), written per observation."""
+    n, p = X.shape
+    sample = X.T @ X / n
+    mu = np.trace(sample) / p
+    d2 = ((sample - mu * np.eye(p)) ** 2).sum() / p
+    b2 = sum(((np.outer(x, x) - sample) ** 2).sum() for x in X) / n ** 2 / p
+    shrinkage = min(b2, d2) / d2
+    return shrinkage * mu * np.eye(p) + (1 - shrinkage) * sample, shrinkage
+
+
+@pytest.mark.parametrize('n, p', [(200, 6), (12, 6), (40, 3)])
+def test_ledoit_wolf_matches_sklearn(n, p):
+    sklearn_ledoit_wolf = pytest.importorskip('sklearn.covariance').ledoit_wolf
+    X = _correlated(n, p, seed=n + p)
+    X -= X.mean(axis=0)
+    covariance, shrinkage = ledoit_wolf(X)
+    expected, expected_shrinkage = sklearn_ledoit_wolf(X, assume_centered=True)
+    np.testing.assert_allclose(covariance, expected, rtol=1e-10, atol=1e-12)
+    assert shrinkage == pytest.approx(expected_shrinkage, rel=1e-10)
+
+
+@pytest.mark.parametrize('n, p', [(200, 6), (12, 6), (40, 3)])
+def test_ledoit_wolf_matches_formula(n, p):
+    X = _correlated(n, p, seed=n * p)
+    X -= X.mean(axis=0)
+    covariance, shrinkage = ledoit_wolf(X)
+    expected, expected_shrinkage = _reference_ledoit_wolf(X)
+    np.testing.assert_allclose(covariance, expected, rtol=1e-10, atol=1e-12)
+    assert shrinkage == pytest.approx(expected_shrinkage, rel=1e-10)
+    assert 0 <= shrinkage <= 1
+
+
+def test_few_rows_give_a_well_conditioned_covariance():
+    X = _correlated(5, 6, seed=1)
+    X -= X.mean(axis=0)
+    covariance, shrinkage = ledoit_wolf(X)
+    assert shrinkage > 0
+    assert np.linalg.eigvalsh(covariance).min() > 0
+
+
+def test_planted_outliers_score_highest():
+    X = _correlated(500, 4, seed=2)
+    outliers = [7, 123, 456]
+    X[outliers] += np.array([12.0, -12.0, 12.0, -12.0])
+    model = RobustMahalanobis().fit(X)
+    distances, contributions = model.score(X, chunk_rows=64)
+    assert set(np.argsort(-distances)[:3]) == set(outliers)
+    np.testing.assert_allclose(contributions.sum(axis=1), distances)
+
+
+def test_scores_do_not_depend_on_chunk_size():
+    X = _correlated(300, 5, seed=3)
+    model = RobustMahalanobis().fit(X)
+    whole, _ = model.score(X, chunk_rows=len(X))
+    chunked, _ = model.score(X, chunk_rows=7)
+    np.testing.assert_allclose(chunked, whole)